@@ -0,0 +1,67 @@
+"""
+Charset benchmark for pages served without a charset.
+
+Compares requests' response.text — which runs whole-body statistical
+detection when the Content-Type carries no charset (here: no Content-Type,
+as many CDNs and misconfigured servers send) — with charset.decode_html,
+which sniffs BOM/header/<meta> in the first KB and otherwise checks UTF-8.
+
+Usage (from backend/):
+    python benchmarks/bench_charset.py --sizes 100 500 2000
+(sizes in KB; each page is UTF-8 with some non-ASCII text, no <meta> charset)
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.charset import decode_html
+
+CARD = '<div class="card"><h3>Café {i}</h3><p>Crème brûlée, naïve façade — €{i}.99</p></div>'
+
+
+def page(kb, meta):
+    head = '<meta charset="utf-8">' if meta else ""
+    cards, i = [], 0
+    while sum(map(len, cards)) < kb * 1024:
+        cards.append(CARD.format(i=i))
+        i += 1
+    return f"<html><head>{head}<title>Shop</title></head><body>{''.join(cards)}</body></html>".encode("utf-8")
+
+
+def response(body):
+    resp = requests.Response()
+    resp._content = body
+    resp.status_code = 200
+    return resp
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1e3, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'KB':>6} {'meta':>5} {'response.text ms':>17} {'decode_html ms':>15}  same")
+    for kb in args.sizes:
+        for meta in (False, True):
+            body = page(kb, meta)
+            old_ms, old = timed(lambda: response(body).text, args.repeat)
+            new_ms, new = timed(lambda: decode_html(body), args.repeat)
+            print(f"{len(body) // 1024:6d} {str(meta):>5} {old_ms:17.1f} {new_ms:15.2f}  {old == new}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+ExtractedContent hand-off benchmark: allocations and time from a parsed page
+to its JSON log line.
+
+  before  asdict(content) (deep copy of every list/dict), then the log
+          formatter's json.dumps over the copy
+  after   the slotted content itself; the formatter's default hook encodes it
+          from a shallow to_dict() view
+
+Peak traced memory is the most memory held at once while producing one
+record, the finished JSON line included.
+
+Usage (from backend/):
+    python benchmarks/bench_content_alloc.py --cards 200 --repeat 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.bench_parser import synthetic_page
+from scraper.logger import _json_default
+from scraper.parser import parse_html
+
+BASE = "https://example.com/"
+
+
+def before(content):
+    data = asdict(content)
+    return json.dumps({"message": "Extracted content", "url": BASE, "data": data}, default=str)
+
+
+def after(content):
+    return json.dumps({"message": "Extracted content", "url": BASE, "data": content}, default=_json_default)
+
+
+def measure(fn, content, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(content)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    line = fn(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1e3, peak / 1024, len(line) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    content = parse_html(synthetic_page(args.cards), BASE)
+    assert json.loads(before(content)) == json.loads(after(content))
+    print(f"page with {len(content.links)} links, {len(content.paragraphs)} paragraphs")
+    for name, fn in (("before", before), ("after", after)):
+        ms, peak_kb, line_kb = measure(fn, content, args.repeat)
+        print(f"{name:>7}: {ms:6.2f} ms/record  peak {peak_kb:7.1f} KB  (line {line_kb:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
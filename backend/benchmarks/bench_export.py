@@ -0,0 +1,94 @@
+"""
+/download benchmark: time and peak memory to export a crawl's records from its
+job log.
+
+  before  read every line, clean every record into one list, then
+          json.dumps(indent=2) the whole list into a single body
+  after   export.stream_records over export.iter_records: one record at a
+          time, emitted in 64 KB chunks (optionally gzip-compressed)
+
+The log is synthetic: --pages "Extracted content" lines from parsing
+synthetic_page(--cards), plus a progress line before each.
+
+Usage (from backend/):
+    python benchmarks/bench_export.py --pages 2000 --cards 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.bench_parser import synthetic_page
+from scraper.export import FORMAT_JSON, FORMAT_NDJSON, clean_data, iter_records, stream_records
+from scraper.logger import _json_default
+from scraper.parser import parse_html
+
+BASE = "https://example.com/"
+
+
+def write_log(path, pages, cards):
+    content = parse_html(synthetic_page(cards), BASE)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(pages):
+            url = f"{BASE}p/{i}"
+            f.write(json.dumps({"message": f"Processing: {url} (Depth: 1)", "module": "crawler"}) + "\n")
+            f.write(json.dumps({"message": "Extracted content", "module": "crawler", "url": url,
+                                "depth": 1, "data": content}, default=_json_default) + "\n")
+
+
+def before(path):
+    cleaned = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry.get("message") == "Extracted content" and "data" in entry:
+                processed = clean_data(entry.get("data"))
+                if processed:
+                    cleaned.append(processed)
+    yield json.dumps(cleaned, indent=2).encode("utf-8")
+
+
+def after(path, fmt=FORMAT_JSON, gzip=False):
+    with open(path, "r", encoding="utf-8") as f:
+        yield from stream_records(iter_records(f), fmt, gzip=gzip)
+
+
+def measure(body):
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = sum(len(chunk) for chunk in body)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20, size / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--cards", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scrape.log")
+        write_log(path, args.pages, args.cards)
+        print(f"log: {os.path.getsize(path) / 2**20:.1f} MB, {args.pages} records")
+        runs = (
+            ("before", lambda: before(path)),
+            ("json", lambda: after(path)),
+            ("ndjson", lambda: after(path, FORMAT_NDJSON)),
+            ("json.gz", lambda: after(path, gzip=True)),
+        )
+        for name, body in runs:
+            seconds, peak_mb, size_mb = measure(body())
+            print(f"{name:>8}: {seconds:6.2f} s  peak {peak_mb:7.1f} MB  (body {size_mb:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
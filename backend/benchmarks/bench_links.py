@@ -0,0 +1,86 @@
+"""
+Link-handling microbenchmark.
+
+Measures links/second for the two URL stages of a crawl, on pages shaped like
+a large site: a few hundred shared navigation links (relative and absolute,
+repeated in header and footer) plus per-page content links.
+
+  resolve   href -> absolute URL (parse_html):   resolve_url vs LinkResolver
+  classify  internal check + normalize (Crawler): utils vs LinkClassifier
+
+Usage (from backend/):
+    python benchmarks/bench_links.py --pages 50 --nav 1500 --content 200
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.links import LinkClassifier, LinkResolver
+from scraper.utils import is_internal_url, normalize_url, resolve_url
+
+ROOT = "https://shop.example.com/"
+
+
+def site(pages, nav, content):
+    shared = []
+    for i in range(nav):
+        shared.append(f"/category/{i % 300}/" if i % 3 else f"https://shop.example.com/brand/{i % 200}")
+    shared += [f"https://social{i}.example.org/share" for i in range(20)]
+    for p in range(pages):
+        url = f"https://shop.example.com/category/{p}/page/{p % 7}"
+        hrefs = shared + [f"item-{p}-{i}.html" for i in range(content)] + shared[:200]
+        yield url, hrefs
+
+
+def timed(fn, pages):
+    start = time.perf_counter()
+    count = 0
+    for url, hrefs in pages:
+        count += fn(url, hrefs)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--nav", type=int, default=1500)
+    parser.add_argument("--content", type=int, default=200)
+    args = parser.parse_args()
+    pages = list(site(args.pages, args.nav, args.content))
+    resolved = [(url, [resolve_url(url, h) for h in hrefs]) for url, hrefs in pages]
+
+    def resolve_old(url, hrefs):
+        return len([resolve_url(url, h) for h in hrefs])
+
+    def resolve_new(url, hrefs):
+        resolve = LinkResolver(url).resolve
+        return len([resolve(h) for h in hrefs])
+
+    def classify_old(url, links):
+        for link in links:
+            if is_internal_url(ROOT, link):
+                normalize_url(link)
+        return len(links)
+
+    classifier = LinkClassifier(ROOT)
+
+    def classify_new(url, links):
+        for _ in classifier.internal(links):
+            pass
+        return len(links)
+
+    print(f"{args.pages} pages x {len(pages[0][1])} links")
+    for name, old, new, data in (
+        ("resolve", resolve_old, resolve_new, pages),
+        ("classify", classify_old, classify_new, resolved),
+    ):
+        before, after = timed(old, data), timed(new, data)
+        print(f"{name:>8}: {before / 1e3:8.0f}k -> {after / 1e3:8.0f}k links/s  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Multi-tab rendering benchmark.
+
+Serves a local fixture site (client-rendered pages that build their content
+after a short timer, like a small SPA) and renders the same URL list through
+
+  * the single-driver path: Scraper.scrape_dynamic, one page at a time
+  * the multi-tab path:     Scraper.scrape_dynamic_many with N tabs
+
+reporting pages/minute and the browser's resident memory (Chrome + children).
+
+Usage (from backend/):
+    python benchmarks/bench_multitab.py --pages 40 --tabs 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.config import Config
+from scraper.driver_manager import _browser_memory_mb, create_driver
+from scraper.scraper import Scraper
+
+PAGE = """<!doctype html>
+<html><head><title>Fixture {n}</title></head>
+<body><div id="root"></div>
+<script>
+setTimeout(function () {{
+  var root = document.getElementById("root");
+  var html = "<h1>Product {n}</h1>";
+  for (var i = 0; i < 40; i++) {{
+    html += "<p>Paragraph " + i + " of page {n}.</p>";
+  }}
+  for (var j = 0; j < 10; j++) {{
+    html += '<a href="/p/' + ({n} * 10 + j) + '">link</a>';
+  }}
+  root.innerHTML = html;
+}}, {delay});
+</script></body></html>
+"""
+
+
+def serve(delay_ms):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            n = self.path.rstrip("/").rsplit("/", 1)[-1]
+            body = PAGE.format(n=n if n.isdigit() else 0, delay=delay_ms).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(urls, tabs):
+    # --single-process is only used for the one-tab baseline, as in production
+    Config.RENDER_TABS = tabs
+    driver = create_driver(headless=True)
+    scraper = Scraper()
+    peak_mb = 0.0
+    try:
+        start = time.perf_counter()
+        if tabs == 1:
+            results = []
+            for url in urls:
+                results.append(scraper.scrape_dynamic(url, driver))
+                peak_mb = max(peak_mb, _browser_memory_mb(driver) or 0.0)
+        else:
+            results = []
+            for i in range(0, len(urls), tabs * 2):
+                results.extend(scraper.scrape_dynamic_many(urls[i:i + tabs * 2], driver, tabs=tabs))
+                peak_mb = max(peak_mb, _browser_memory_mb(driver) or 0.0)
+        elapsed = time.perf_counter() - start
+    finally:
+        driver.quit()
+    ok = sum(1 for content, _ in results if content)
+    return ok, elapsed, peak_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--tabs", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--delay-ms", type=int, default=300, help="client-side render delay per page")
+    args = parser.parse_args()
+
+    server = serve(args.delay_ms)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/p/{i}" for i in range(args.pages)]
+
+    print(f"{'tabs':>4}  {'pages':>5}  {'seconds':>8}  {'pages/min':>9}  {'peak RSS MB':>11}")
+    for tabs in args.tabs:
+        ok, elapsed, peak_mb = run(urls, tabs)
+        print(f"{tabs:>4}  {ok:>5}  {elapsed:>8.1f}  {ok / elapsed * 60:>9.0f}  {peak_mb:>11.0f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Parse-stage scaling benchmark.
+
+Simulates a crawl's parse load: FETCH_THREADS threads each take pages off a
+shared list and parse them, either in-thread (the default, GIL-bound) or via
+ParsePool at 1, 2, 4 and 8 worker processes.  Reports pages/second.
+
+Usage (from backend/):
+    python benchmarks/bench_parse_pool.py --pages 200 --cards 200 --threads 8
+
+Scaling is bounded by the machine's core count; on one core every
+configuration parses at roughly the in-thread rate minus IPC overhead.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.bench_parser import synthetic_page
+from scraper.parse_pool import ParsePool
+from scraper.parser import parse_html
+
+BASE = "https://example.com/"
+
+
+def run(bodies, threads, pool=None):
+    def parse(body):
+        if pool is None:
+            return parse_html(body.decode("utf-8"), BASE, profile="crawl")
+        return pool.parse(body, BASE, profile="crawl")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as fetchers:
+        list(fetchers.map(parse, bodies))
+    return len(bodies) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--cards", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    body = synthetic_page(args.cards).encode("utf-8")
+    bodies = [body] * args.pages
+    print(f"{args.pages} pages of {len(body) // 1024} KB, {args.threads} fetch threads, {os.cpu_count()} cores")
+
+    baseline = run(bodies, args.threads)
+    print(f"{'in-thread':>10}: {baseline:7.1f} pages/s")
+    for workers in args.workers:
+        with ParsePool(workers=workers) as pool:
+            run(bodies[:workers], workers, pool)  # start the worker processes
+            rate = run(bodies, args.threads, pool)
+        print(f"{workers:>2} workers: {rate:7.1f} pages/s  ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
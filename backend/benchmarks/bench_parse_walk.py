@@ -0,0 +1,115 @@
+"""
+Single-pass parse_html benchmark.
+
+Compares the current one-walk extractor with the previous multi-pass version
+(six find_all calls for h1-h6, then p, a, img, form/input, get_text twice per
+paragraph and a full get_text), kept below as multipass_extract().  Both run
+on the same BeautifulSoup tree builder, and tree construction is timed
+separately so the extraction cost is visible on its own.
+
+Usage (from backend/):
+    python benchmarks/bench_parse_walk.py [--corpus DIR] [--repeat N]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from dataclasses import asdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.bench_parser import synthetic_page
+from scraper.hydration import extract_structured_data, hydration_links
+from scraper.page_analysis import DEFAULT_ANALYZER
+from scraper.parser import TEXT_CONTENT_LIMIT, ExtractedContent, _parse_soup
+from scraper.parser_backends import make_soup
+from scraper.utils import resolve_url
+
+BASE = "https://example.com/"
+
+
+def multipass_extract(soup, base_url):
+    """parse_html's extraction before the single-pass walk (for comparison)."""
+    title = (soup.title.string or "").strip() if soup.title else ""
+    meta_desc = ""
+    meta_tag = soup.find("meta", attrs={"name": "description"})
+    if meta_tag:
+        meta_desc = meta_tag.get("content", "").strip()
+    headings = {}
+    for level in range(1, 7):
+        tag = f"h{level}"
+        headings[tag] = [h.get_text(strip=True) for h in soup.find_all(tag)]
+    paragraphs = [p.get_text(strip=True) for p in soup.find_all("p") if p.get_text(strip=True)]
+    links = [resolve_url(base_url, a["href"]) for a in soup.find_all("a", href=True)]
+    images = [
+        {"src": resolve_url(base_url, img["src"]), "alt": img.get("alt", "")}
+        for img in soup.find_all("img", src=True)
+    ]
+    forms = []
+    for form in soup.find_all("form"):
+        forms.append({
+            "action": form.get("action", ""),
+            "method": form.get("method", "get"),
+            "inputs": [
+                {"name": i.get("name"), "type": i.get("type"), "placeholder": i.get("placeholder")}
+                for i in form.find_all("input")
+            ],
+        })
+    main_content = soup.get_text(separator="\n", strip=True)
+    analysis = DEFAULT_ANALYZER.analyze(soup)
+    structured = extract_structured_data(soup)
+    if structured:
+        links.extend(hydration_links(structured, base_url))
+    return ExtractedContent(
+        title=title,
+        meta_description=meta_desc,
+        headings=headings,
+        paragraphs=paragraphs,
+        links=list(dict.fromkeys(links)),
+        images=images,
+        forms=forms,
+        text_content=main_content[:TEXT_CONTENT_LIMIT],
+        framework=analysis.framework,
+        rendering_mode=analysis.rendering_mode,
+        structured_data=structured,
+    )
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="directory of saved .html files")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.corpus:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(os.path.expanduser(args.corpus), "*.htm*"))):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append((os.path.basename(path), f.read()))
+    else:
+        pages = [(f"synthetic-{n}", synthetic_page(n)) for n in (20, 200, 2000, 10000)]
+
+    print(f"{'page':>16} {'KB':>7} {'tree ms':>9} {'multi-pass ms':>14} {'one-walk ms':>12} {'speedup':>8}  same")
+    for name, html in pages:
+        soup = make_soup(html)
+        same = asdict(multipass_extract(soup, BASE)) == asdict(_parse_soup(soup, BASE))
+        tree = timed(lambda: make_soup(html), args.repeat)
+        old = timed(lambda: multipass_extract(soup, BASE), args.repeat)
+        new = timed(lambda: _parse_soup(soup, BASE), args.repeat)
+        print(
+            f"{name:>16} {len(html) / 1024:7.0f} {tree * 1000:9.1f} {old * 1000:14.1f} "
+            f"{new * 1000:12.1f} {old / new:7.1f}x  {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+parse_html backend benchmark.
+
+Times parse_html on every installed backend over a corpus of HTML files and
+checks each backend's output against html.parser while doing so.
+
+Corpus sources (from backend/):
+    python benchmarks/bench_parser.py --corpus ~/pages        # saved *.html files
+    python benchmarks/bench_parser.py --fetch urls.txt --save ~/pages
+                                                              # download, then run
+    python benchmarks/bench_parser.py                         # synthetic pages
+
+Synthetic pages are shaped like a product listing (nav, cards, forms, footer)
+at a few sizes; real pages are the better measure.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from dataclasses import asdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.parser import parse_html
+from scraper.parser_backends import available_backends
+
+BASE = "https://example.com/"
+
+
+def synthetic_page(cards):
+    nav = "".join(f'<li><a href="/c/{i}">Category {i}</a></li>' for i in range(30))
+    grid = "".join(
+        f'<div class="card"><h3>Product {i}</h3><a href="/p/{i}"><img src="/i/{i}.jpg" alt="p{i}"></a>'
+        f"<p>Short description of product {i} with <b>bold</b> and <em>emphasis</em>.</p>"
+        f'<span class="price">${i}.99</span></div>'
+        for i in range(cards)
+    )
+    return (
+        "<!doctype html><html><head><title>Catalogue</title>"
+        '<meta name="description" content="All products">'
+        '<script type="application/ld+json">{"@type": "ItemList"}</script></head>'
+        f"<body><header><nav><ul>{nav}</ul></nav></header><main><h1>Catalogue</h1>{grid}</main>"
+        '<form action="/search"><input name="q" placeholder="Search"></form>'
+        "<footer><p>Footer text</p></footer></body></html>"
+    )
+
+
+def load_corpus(args):
+    if args.fetch:
+        import requests
+
+        os.makedirs(args.save, exist_ok=True)
+        with open(args.fetch) as f:
+            urls = [line.strip() for line in f if line.strip()]
+        for i, url in enumerate(urls):
+            try:
+                resp = requests.get(url, timeout=30, headers={"User-Agent": "Mozilla/5.0"})
+                with open(os.path.join(args.save, f"{i:04d}.html"), "w", encoding="utf-8") as out:
+                    out.write(resp.text)
+            except Exception as e:
+                print(f"skip {url}: {e}")
+        args.corpus = args.save
+    if args.corpus:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(os.path.expanduser(args.corpus), "*.htm*"))):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append((os.path.basename(path), f.read()))
+        return pages
+    return [(f"synthetic-{n}", synthetic_page(n)) for n in (20, 200, 2000)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="directory of saved .html files")
+    parser.add_argument("--fetch", help="file with one URL per line to download first")
+    parser.add_argument("--save", default="bench_corpus", help="where --fetch stores pages")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = load_corpus(args)
+    total_kb = sum(len(html) for _, html in pages) / 1024
+    print(f"{len(pages)} pages, {total_kb:.0f} KB; backends: {', '.join(available_backends())}")
+
+    reference = {name: asdict(parse_html(html, BASE, backend="html.parser")) for name, html in pages}
+    baseline = None
+    for backend in available_backends():
+        mismatches = [
+            name for name, html in pages
+            if asdict(parse_html(html, BASE, backend=backend)) != reference[name]
+        ]
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for _, html in pages:
+                parse_html(html, BASE, backend=backend)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        baseline = baseline or elapsed
+        print(
+            f"{backend:>12}: {elapsed * 1000:9.1f} ms/corpus  "
+            f"{len(pages) / elapsed:8.1f} pages/s  x{baseline / elapsed:4.1f}  "
+            f"mismatches: {len(mismatches)}{' ' + ', '.join(mismatches[:5]) if mismatches else ''}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Streaming extraction benchmark.
+
+Compares parse_html (full DOM) with stream_extract (incremental tokenizer,
+capped outputs) on synthetic listing pages of increasing size, reporting wall
+time and peak Python heap (tracemalloc) for each.  The streamed body is fed in
+64 KB chunks, as Scraper does with a live response.
+
+Usage (from backend/):
+    python benchmarks/bench_stream.py --sizes 500 2000 8000
+(sizes are product cards; ~210 bytes each)
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.bench_parser import synthetic_page
+from scraper.parser import parse_html
+from scraper.stream_parser import stream_extract
+
+BASE = "https://example.com/"
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 8000])
+    args = parser.parse_args()
+
+    print(f"{'MB':>6} {'DOM s':>7} {'DOM peak MB':>12} {'stream s':>9} {'stream peak MB':>15}")
+    for cards in args.sizes:
+        html = synthetic_page(cards)
+        body = html.encode("utf-8")
+        chunks = [body[i:i + 65536] for i in range(0, len(body), 65536)]
+        dom_s, dom_mb = measure(lambda: parse_html(html, BASE))
+        stream_s, stream_mb = measure(lambda: stream_extract(iter(chunks), BASE))
+        print(f"{len(body) / 1e6:6.1f} {dom_s:7.2f} {dom_mb:12.1f} {stream_s:9.2f} {stream_mb:15.1f}")
+
+
+if __name__ == "__main__":
+    main()
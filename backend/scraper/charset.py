@@ -0,0 +1,115 @@
+"""
+Charset detection on raw response bytes.
+
+response.text decodes with the Content-Type charset, and when there is none
+it runs statistical detection (charset_normalizer / chardet) over the whole
+body — slow on large pages — or, for text/* types, silently assumes
+ISO-8859-1 and garbles UTF-8 pages.  Fetchers here instead take the
+encoding, in the order browsers use:
+
+  1. a byte-order mark
+  2. the Content-Type header's charset parameter
+  3. <meta charset> / <meta http-equiv="Content-Type"> in the first 1024 bytes
+
+and only when none of those is present: the body is UTF-8 if it decodes as
+UTF-8 (ASCII included), otherwise statistical detection runs as a last resort.
+"""
+
+import codecs
+import re
+from typing import Optional, Union
+
+try:
+    from charset_normalizer import from_bytes
+except ImportError:  # requests may be installed with chardet instead
+    from_bytes = None
+
+# How far into the document a <meta> charset declaration is looked for (HTML spec prescan)
+PRESCAN_BYTES = 1024
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),  # before UTF-16 LE: it starts with the same bytes
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+_HEADER_CHARSET = re.compile(r"charset\s*=\s*[\"']?\s*([\w.:-]+)", re.I)
+_META_CHARSET = re.compile(rb"<meta[^>]+?charset\s*=\s*[\"']?\s*([\w.:-]+)", re.I)
+
+# Labels browsers decode differently from Python's codec of the same name
+_BROWSER_ALIASES = {"iso8859_1": "cp1252", "ascii": "cp1252"}
+
+_Bytes = Union[bytes, bytearray]
+
+
+def _codec(label, from_meta: bool = False) -> Optional[str]:
+    """Python codec name for a charset label, or None if unknown."""
+    if isinstance(label, bytes):
+        label = label.decode("ascii", errors="ignore")
+    try:
+        name = codecs.lookup(label.strip()).name
+    except LookupError:
+        return None
+    if from_meta and name.startswith("utf-16"):
+        return "utf-8"  # a readable <meta> means the bytes are not UTF-16
+    return _BROWSER_ALIASES.get(name.replace("-", "_"), name)
+
+
+def sniff_encoding(prefix: _Bytes, content_type: Optional[str] = None) -> Optional[str]:
+    """Encoding declared by BOM, header or <meta>; None when undeclared."""
+    for bom, name in _BOMS:
+        if prefix.startswith(bom):
+            return name
+    if content_type:
+        m = _HEADER_CHARSET.search(content_type)
+        if m:
+            name = _codec(m.group(1))
+            if name:
+                return name
+    m = _META_CHARSET.search(prefix, 0, PRESCAN_BYTES)
+    if m:
+        return _codec(m.group(1), from_meta=True)
+    return None
+
+
+def _is_utf8(data: _Bytes, final: bool) -> bool:
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(data, final=final)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def detect_encoding(body: _Bytes, content_type: Optional[str] = None, final: bool = True) -> str:
+    """
+    Encoding of an HTML body (or, with final=False, of a body's prefix that
+    may end inside a multi-byte character).
+    """
+    declared = sniff_encoding(body, content_type)
+    if declared:
+        return declared
+    if _is_utf8(body, final):
+        return "utf-8"
+    if from_bytes is not None:
+        best = from_bytes(bytes(body)).best()
+        if best is not None and best.encoding:
+            return best.encoding
+    return "cp1252"
+
+
+def decode_html(body: _Bytes, content_type: Optional[str] = None, final: bool = True) -> str:
+    """
+    Decode an HTML body with detect_encoding(); undecodable bytes are replaced.
+    An undeclared UTF-8 body is decoded once, the UTF-8 check being the decode.
+    """
+    if not body:
+        return ""
+    declared = sniff_encoding(body, content_type)
+    if declared is None and final:
+        try:
+            return codecs.decode(body, "utf-8")
+        except UnicodeDecodeError:
+            pass
+    return codecs.decode(body, declared or detect_encoding(body, content_type, final), "replace")
@@ -10,16 +10,104 @@ class Config:
     MAX_DEPTH = int(os.getenv("MAX_DEPTH", 2))
     
     HEADLESS_MODE = os.getenv("HEADLESS_MODE", "True").lower() in ("true", "1", "t")
+    # Pre-installed chromedriver; skips webdriver-manager's version lookup
+    CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH", "")
+    
+    # Resource blocking for rendered pages (image, font, stylesheet, media)
+    BLOCK_RESOURCE_TYPES = [t.strip() for t in os.getenv("BLOCK_RESOURCE_TYPES", "image,font,media").split(",") if t.strip()]
+    BLOCK_URL_PATTERNS = [p.strip() for p in os.getenv("BLOCK_URL_PATTERNS", "").split(",") if p.strip()]
+    BLOCK_TRACKERS = os.getenv("BLOCK_TRACKERS", "True").lower() in ("true", "1", "t")
     
     # Timeouts
     PAGE_LOAD_TIMEOUT = int(os.getenv("PAGE_LOAD_TIMEOUT", 60))
     SCRIPT_TIMEOUT = int(os.getenv("SCRIPT_TIMEOUT", 60))
     IMPLICIT_WAIT = int(os.getenv("IMPLICIT_WAIT", 15))
     
+    # Tabs rendered concurrently inside one browser (1 = one page at a time)
+    RENDER_TABS = int(os.getenv("RENDER_TABS", 1))
+    # --single-process keeps container memory low but serializes every tab;
+    # it is only applied when RENDER_TABS is 1
+    CHROME_SINGLE_PROCESS = os.getenv("CHROME_SINGLE_PROCESS", "True").lower() in ("true", "1", "t")
+    
+    # Rendered-page extraction: "browser" (in-page script, JSON only) or "html" (page_source + parse_html)
+    DYNAMIC_EXTRACTION = os.getenv("DYNAMIC_EXTRACTION", "browser").lower()
+    
+    # Structured-data capture: trust embedded hydration payloads (__NEXT_DATA__ etc.)
+    # instead of rendering, and optionally record JSON XHR responses during renders
+    PREFER_HYDRATION_DATA = os.getenv("PREFER_HYDRATION_DATA", "True").lower() in ("true", "1", "t")
+    CAPTURE_XHR = os.getenv("CAPTURE_XHR", "False").lower() in ("true", "1", "t")
+    
+    # Render cache: reuse a page's previous render while its static response
+    # (ETag or body hash) is unchanged. Empty RENDER_CACHE_DIR disables it.
+    RENDER_CACHE_DIR = os.getenv("RENDER_CACHE_DIR", "")
+    RENDER_CACHE_MAX_ENTRIES = int(os.getenv("RENDER_CACHE_MAX_ENTRIES", 5000))
+    RENDER_CACHE_MAX_MB = int(os.getenv("RENDER_CACHE_MAX_MB", 500))
+    RENDER_CACHE_MAX_AGE_HOURS = float(os.getenv("RENDER_CACHE_MAX_AGE_HOURS", 24))
+    
+    # HTML parser backend for parse_html: html.parser, lxml or selectolax
+    # (lxml / selectolax must be installed; otherwise html.parser is used).
+    # Output can differ between backends on malformed markup.
+    PARSER_BACKEND = os.getenv("PARSER_BACKEND", "html.parser").lower()
+    
+    # Streaming extraction: bodies larger than this are parsed incrementally as
+    # they download, with capped outputs (0 = always build the full DOM)
+    STREAM_THRESHOLD_BYTES = int(os.getenv("STREAM_THRESHOLD_BYTES", 2_000_000))
+    STREAM_MAX_LINKS = int(os.getenv("STREAM_MAX_LINKS", 5000))
+    STREAM_MAX_IMAGES = int(os.getenv("STREAM_MAX_IMAGES", 1000))
+    STREAM_MAX_ITEMS = int(os.getenv("STREAM_MAX_ITEMS", 2000))  # headings + paragraphs, forms, inputs
+    
+    # Parse stage: run parse_html in worker processes instead of the fetch
+    # threads, so parsing uses every core. PARSE_WORKERS 0 = one per CPU core;
+    # PARSE_MAX_PENDING bounds pages waiting to be parsed (0 = 2 per worker)
+    PARSE_POOL = os.getenv("PARSE_POOL", "False").lower() in ("true", "1", "t")
+    PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", 0))
+    PARSE_MAX_PENDING = int(os.getenv("PARSE_MAX_PENDING", 0))
+    
+    # Duplicate content: identical bodies reuse the first copy's parse and are
+    # logged as duplicates; pages whose text SimHash is within
+    # DEDUP_SIMHASH_DISTANCE bits of an earlier page are flagged near-duplicates.
+    # SKIP_DUPLICATE_OUTLINKS also stops following a near-duplicate's links.
+    DEDUP_CONTENT = os.getenv("DEDUP_CONTENT", "True").lower() in ("true", "1", "t")
+    DEDUP_SIMHASH_DISTANCE = int(os.getenv("DEDUP_SIMHASH_DISTANCE", 3))
+    DEDUP_CACHE_ENTRIES = int(os.getenv("DEDUP_CACHE_ENTRIES", 500))
+    SKIP_DUPLICATE_OUTLINKS = os.getenv("SKIP_DUPLICATE_OUTLINKS", "False").lower() in ("true", "1", "t")
+    
+    # Server jobs: crawls and audits run concurrently up to MAX_CONCURRENT_JOBS;
+    # further jobs wait in a queue of up to MAX_QUEUED_JOBS (then /start returns 429).
+    # JOB_HISTORY finished jobs are kept for /jobs/{id} status and downloads.
+    MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_JOBS", 2))
+    MAX_QUEUED_JOBS = int(os.getenv("MAX_QUEUED_JOBS", 20))
+    JOB_HISTORY = int(os.getenv("JOB_HISTORY", 50))
+    # Run each job in its own worker process (False = threads of the API process);
+    # a worker still running JOB_STOP_TIMEOUT seconds after /stop is terminated
+    JOB_PROCESSES = os.getenv("JOB_PROCESSES", "True").lower() in ("true", "1", "t")
+    JOB_STOP_TIMEOUT = float(os.getenv("JOB_STOP_TIMEOUT", 30))
+    
+    # Log streaming (/logs WebSockets): lines buffered per client before the
+    # oldest are dropped, and frames of up to LOG_STREAM_BATCH_LINES lines
+    # gathered over LOG_STREAM_BATCH_MS
+    LOG_STREAM_CLIENT_BUFFER = int(os.getenv("LOG_STREAM_CLIENT_BUFFER", 1000))
+    LOG_STREAM_BATCH_LINES = int(os.getenv("LOG_STREAM_BATCH_LINES", 200))
+    LOG_STREAM_BATCH_MS = int(os.getenv("LOG_STREAM_BATCH_MS", 100))
+    
+    # Auto-scroll: quiet period that ends a step, per-step timeout, and overall caps
+    SCROLL_IDLE_MS = int(os.getenv("SCROLL_IDLE_MS", 300))
+    SCROLL_STEP_TIMEOUT_MS = int(os.getenv("SCROLL_STEP_TIMEOUT_MS", 3000))
+    SCROLL_MAX_STEPS = int(os.getenv("SCROLL_MAX_STEPS", 20))
+    SCROLL_MAX_SECONDS = float(os.getenv("SCROLL_MAX_SECONDS", 15))
+    
     # Logging
     LOG_LEVEL = getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO)
     LOG_DIR = os.getenv("LOG_DIR", "logs")
     
+    # Concurrency
+    CRAWL_WORKERS = int(os.getenv("CRAWL_WORKERS", 1))
+    # Browsers in the WebDriver pool; 0 = min(CRAWL_WORKERS, CPU cores)
+    DRIVER_POOL_SIZE = int(os.getenv("DRIVER_POOL_SIZE", 0))
+    # Recycle a browser after this many pages or this much memory growth (MB)
+    DRIVER_MAX_PAGES = int(os.getenv("DRIVER_MAX_PAGES", 50))
+    DRIVER_MAX_MEMORY_MB = int(os.getenv("DRIVER_MAX_MEMORY_MB", 1024))
+    
     # Random Delays (min, max) in seconds
     MIN_DELAY = 1.0
     MAX_DELAY = 3.0
@@ -1,34 +1,49 @@
 import logging
 import time
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from .config import Config
 from .scraper import Scraper
-from .driver_manager import create_driver
-from .logger import get_logger
-from .utils import normalize_url, is_internal_url
+from .driver_manager import DriverPool
+from .dedup import DUPLICATE_EXACT, DUPLICATE_NEAR, DuplicateIndex
+from .hydration import has_hydration_payload
+from .parse_pool import ParsePool
+from .logger import bind_job, current_job, get_logger
+from .page_analysis import RENDER_CSR
+from .render_strategy import FETCH_RENDER, RenderStrategyCache
+from .links import LinkClassifier
 
 logger = get_logger("crawler")
 scraper_logger = get_logger("scraper")
 err_logger = get_logger("errors")
 
 class Crawler:
-    def __init__(self, base_url=None, max_depth=None):
+    def __init__(self, base_url=None, max_depth=None, workers=None, resource_policy=None, tabs=None, schema=None):
         self.base_url = base_url or Config.BASE_URL
         self.max_depth = max_depth if max_depth is not None else Config.MAX_DEPTH
         self.visited = set()
+        # Internal check + normalization of every discovered link, memoized per crawl
+        self.links = LinkClassifier(self.base_url)
         self.queue = deque([(self.base_url, 0)]) # (url, depth)
         self._stop_event = False
         
+        self.workers = max(1, workers if workers is not None else Config.CRAWL_WORKERS)
+        # Pages each worker renders concurrently as tabs of its browser
+        self.tabs = max(1, tabs if tabs is not None else Config.RENDER_TABS)
+        
         # Initialize components
-        # We share one driver instance for the lifecycle of the crawler if needed
-        # Or create it on demand. For efficiency in recursive crawls, keeping it open is better.
-        self.driver = None
-        try:
-            self.driver = create_driver()
-        except Exception as e:
-            err_logger.warning(f"Could not initialize Selenium driver — will use static-only scraping: {e}")
+        # Pool of browsers shared by the fetch workers; each rendered page checks
+        # one out, so dynamic rendering runs in parallel up to the pool size.
+        # Browsers start lazily, so static-only sites never launch Chrome.
+        # resource_policy overrides the configured resource blocking for this crawl.
+        self.drivers = DriverPool(resource_policy=resource_policy)
         
-        self.scraper = Scraper(driver_manager=None)
+        # Static pages are parsed in worker processes when PARSE_POOL is on,
+        # so parsing is not limited to one core by the fetch threads' GIL
+        self.parse_pool = ParsePool.from_config()
+        # schema: compiled site-specific fields (schema.compile_schema) for every page
+        self.scraper = Scraper(parse_pool=self.parse_pool, dedup=DuplicateIndex.from_config(), schema=schema)
+        self.strategy = RenderStrategyCache()
 
     def stop(self):
         """Signals the crawler to stop processing the queue."""
@@ -41,6 +56,15 @@ class Crawler:
         """
         if not content:
             return False
+
+        # The page's render data is already embedded (e.g. __NEXT_DATA__) — no browser needed
+        if Config.PREFER_HYDRATION_DATA and has_hydration_payload(content):
+            return False
+
+        # Framework app shell with an empty root (classified during parsing)
+        if content.get("rendering_mode") == RENDER_CSR:
+            logger.info(f"Detected client-rendered {content.get('framework')} app shell")
+            return True
         
         # Check text content for common JS-required indicators
         text_content = content.get("text_content", "").lower()
@@ -70,66 +94,171 @@ class Crawler:
         
         return False
 
-    def start(self):
-        logger.info(f"Starting crawl on {self.base_url} with max_depth={self.max_depth}")
-        
+    def _render(self, url):
+        """Scrape url with a browser checked out from the pool."""
+        return self._render_many([url])[0]
+
+    def _render_many(self, urls):
+        """Scrape urls as parallel tabs of one browser checked out from the pool."""
+        drivers = self.drivers
+        if not drivers:
+            return [(None, []) for _ in urls]
         try:
-            while self.queue:
-                if self._stop_event:
-                    logger.info("Crawl stopping due to stop signal.")
-                    break
+            pooled = drivers.checkout()
+        except Exception as e:
+            # Browser could not be started — stop trying for the rest of the crawl.
+            err_logger.warning(f"Could not initialize Selenium driver — will use static-only scraping: {e}")
+            self.drivers = None
+            drivers.close()
+            return [(None, []) for _ in urls]
 
-                current_url, depth = self.queue.popleft()
-                
-                normalized = normalize_url(current_url)
-                if not normalized:
-                    continue
-                    
-                if normalized in self.visited:
-                    continue
-                
-                if depth > self.max_depth:
-                    continue
-                
-                self.visited.add(normalized)
-                
-                logger.info(f"Processing: {current_url} (Depth: {depth})")
-                
-                # Choose strategy: Simple logic for now, standard scrape.
-                # If we had a way to detect dynamic requirement beforehand, we'd pass use_driver=True
-                # For now, let's assume we use the driver if the scraper falls back, 
-                # OR we just pass the driver always if we want to be safe (but slower).
-                # Optimization: Try static first (Scraper default), only use driver if needed.
-                # The Scraper class currently has methods `scrape_url` (static) and `scrape_dynamic`.
-                # Let's try static first.
+        # A failed render costs only these pages; the browser is recycled, the pool kept.
+        healthy = True
+        try:
+            if len(urls) == 1:
+                return [self.scraper.scrape_dynamic(urls[0], pooled.driver)]
+            return self.scraper.scrape_dynamic_many(urls, pooled.driver, tabs=self.tabs)
+        except Exception as e:
+            healthy = False
+            for url in urls:
+                err_logger.error(f"Dynamic render failed for {url}: {e}")
+            return [(None, []) for _ in urls]
+        finally:
+            drivers.checkin(pooled, healthy=healthy)
+
+    def _next_batch(self):
+        """Pop up to one batch of unvisited, in-depth URLs off the frontier."""
+        batch = []
+        while self.queue and len(batch) < self.workers * self.tabs:
+            current_url, depth = self.queue.popleft()
+            
+            normalized = self.links.normalize(current_url)
+            if not normalized:
+                continue
                 
+            if normalized in self.visited:
+                continue
+            
+            if depth > self.max_depth:
+                continue
+            
+            self.visited.add(normalized)
+            batch.append((current_url, depth))
+        return batch
+
+    def _process_url(self, current_url, depth, direct_render=None):
+        """Fetch, extract and log one page. Returns the links found on it."""
+        logger.info(f"Processing: {current_url} (Depth: {depth})")
+        
+        # Optimization: Try static first (Scraper default), only use driver if needed.
+        # Pages in a template already learned as JS-rendered skip the static attempt.
+        if direct_render is None:
+            direct_render = bool(self.drivers) and self.strategy.decide(current_url) == FETCH_RENDER
+        if direct_render:
+            logger.info(f"Rendering directly (learned strategy): {current_url}")
+            content, links = self._render(current_url)
+            if not content:
                 content, links = self.scraper.scrape_url(current_url)
-                
-                # If static failed, returned empty, or content indicates JS is required, try dynamic
-                needs_js = self._content_needs_javascript(content)
-                if (not content or needs_js) and self.driver:
-                    logger.info(f"Retrying with Selenium: {current_url}")
-                    content, links = self.scraper.scrape_dynamic(current_url, self.driver)
-
-                if content:
-                    # Log extracted content
-                    scraper_logger.info("Extracted content", extra={
-                        "url": current_url,
-                        "depth": depth,
-                        "title": content.get("title"),
-                        "data": content # Full structured data
-                    })
-                    
-                    # Queue links
-                    if depth < self.max_depth:
-                        for link in links:
-                            if is_internal_url(self.base_url, link):
-                                norm_link = normalize_url(link)
-                                if norm_link and norm_link not in self.visited:
-                                    self.queue.append((link, depth + 1))
-                else:
-                    scraper_logger.warning(f"No content extracted for {current_url}", extra={"url": current_url})
-                    err_logger.warning(f"No content extracted for {current_url}")
+        else:
+            content, links = self.scraper.scrape_url(current_url)
+
+            # If static failed, returned empty, or content indicates JS is required, try dynamic
+            needs_js = self._content_needs_javascript(content)
+            if content:
+                self.strategy.record(current_url, needs_js)
+                if depth == 0:
+                    self.strategy.seed(current_url, content.get("rendering_mode") == RENDER_CSR)
+            if (not content or needs_js) and self.drivers:
+                logger.info(f"Retrying with Selenium: {current_url}")
+                content, links = self._render(current_url)
+
+        return self._emit(current_url, depth, content, links)
+
+    def _process_rendered_batch(self, items):
+        """
+        Render (url, depth) items as tabs of one browser.
+        Returns a list of (depth, links) in item order.
+        """
+        urls = [url for url, _ in items]
+        for url, depth in items:
+            logger.info(f"Rendering directly (learned strategy): {url} (Depth: {depth})")
+        results = []
+        for (url, depth), (content, links) in zip(items, self._render_many(urls)):
+            if not content:
+                content, links = self.scraper.scrape_url(url)
+            results.append((depth, self._emit(url, depth, content, links)))
+        return results
+
+    def _emit(self, current_url, depth, content, links):
+        """Log one page's extracted content. Returns the links to follow."""
+        if content and content.get(DUPLICATE_EXACT):
+            # Same body as a page already logged; its links were queued from there
+            scraper_logger.info("Duplicate content", extra={
+                "url": current_url,
+                "depth": depth,
+                "duplicate_of": content[DUPLICATE_EXACT],
+            })
+            return []
+
+        if content:
+            # Log extracted content
+            scraper_logger.info("Extracted content", extra={
+                "url": current_url,
+                "depth": depth,
+                "title": content.get("title"),
+                "data": content # Full structured data
+            })
+            if content.get(DUPLICATE_NEAR) and Config.SKIP_DUPLICATE_OUTLINKS:
+                return []
+            return links
+
+        scraper_logger.warning(f"No content extracted for {current_url}", extra={"url": current_url})
+        err_logger.warning(f"No content extracted for {current_url}")
+        return []
+
+    def _process_static(self, current_url, depth):
+        """_process_url for a page not routed to the browsers; returns [(depth, links)]."""
+        return [(depth, self._process_url(current_url, depth, direct_render=False))]
+
+    def start(self):
+        logger.info(
+            f"Starting crawl on {self.base_url} with max_depth={self.max_depth}, workers={self.workers}"
+        )
+        
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.workers, initializer=bind_job, initargs=(current_job(),)
+            ) as pool:
+                while self.queue:
+                    if self._stop_event:
+                        logger.info("Crawl stopping due to stop signal.")
+                        break
+
+                    batch = self._next_batch()
+                    futures = []
+                    render_batch = []
+                    for url, depth in batch:
+                        if self.drivers and self.strategy.decide(url) == FETCH_RENDER:
+                            render_batch.append((url, depth))
+                        else:
+                            futures.append(pool.submit(self._process_static, url, depth))
+                    # Learned-JS pages go to the browsers a tab-group at a time
+                    for i in range(0, len(render_batch), self.tabs):
+                        futures.append(pool.submit(self._process_rendered_batch, render_batch[i:i + self.tabs]))
+
+                    for future in futures:
+                        try:
+                            results = future.result()
+                        except Exception as e:
+                            err_logger.error(f"Worker error: {e}")
+                            continue
+
+                        # Queue links
+                        for depth, links in results:
+                            if depth < self.max_depth:
+                                for link, norm_link in self.links.internal(links):
+                                    if norm_link not in self.visited:
+                                        self.queue.append((link, depth + 1))
 
         except KeyboardInterrupt:
             logger.info("Crawl interrupted by user.")
@@ -139,7 +268,9 @@ class Crawler:
             self.cleanup()
             
     def cleanup(self):
-        if self.driver:
-            logger.info("Closing WebDriver...")
-            self.driver.quit()
+        if self.drivers:
+            logger.info("Closing WebDriver pool...")
+            self.drivers.close()
+        if self.parse_pool:
+            self.parse_pool.close()
         logger.info("Crawl finished.")
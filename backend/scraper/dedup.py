@@ -0,0 +1,135 @@
+"""
+Duplicate-content detection for crawls.
+
+Many sites serve the same HTML under several URLs (tracking parameters,
+printer views, session ids) or near-identical HTML (pagination, sort orders).
+Every static response gets two fingerprints:
+
+  exact   sha256 of the response body.  A repeat body reuses the previously
+          parsed ExtractedContent instead of being parsed again.
+  simhash 64-bit SimHash of the extracted text (word 3-shingles).  Pages
+          within max_distance bits of an earlier page are near-duplicates.
+
+Parsed contents are kept per (body hash, URL directory, profile): links are
+resolved against the page URL, so the same HTML under another directory can
+resolve to different links and is parsed again.  Near-duplicate lookup uses
+the pigeonhole trick — the 64 bits are split into max_distance + 1 bands, and
+two hashes within max_distance bits agree exactly on at least one band — so a
+lookup only compares against pages sharing a band.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from .config import Config
+from .parser import ExtractedContent, get_profile
+
+DUPLICATE_EXACT = "duplicate_of"
+DUPLICATE_NEAR = "near_duplicate_of"
+
+SIMHASH_BITS = 64
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Pages with fewer words than this (app shells, error stubs) are never near-duplicates
+_MIN_WORDS = 20
+
+
+@dataclass(frozen=True)
+class DuplicateMatch:
+    """A page's earlier copy. kind is DUPLICATE_EXACT or DUPLICATE_NEAR."""
+    kind: str
+    of: str
+
+
+def simhash(text: str, shingle: int = 3) -> Optional[int]:
+    """64-bit SimHash of text's word shingles, or None for very short text."""
+    words = _WORD.findall(text.lower())
+    if len(words) < _MIN_WORDS:
+        return None
+    hashes = [
+        hashlib.blake2b(" ".join(words[i:i + shingle]).encode("utf-8"), digest_size=8).digest()
+        for i in range(len(words) - shingle + 1)
+    ]
+    # Per-bit vote: a bit is set when most shingle hashes have it set
+    # (column counts over bit strings are much faster than shifting per bit)
+    half = len(hashes) / 2
+    columns = zip(*(format(int.from_bytes(h, "big"), "064b") for h in hashes))
+    value = 0
+    for column in columns:
+        value = value << 1 | (column.count("1") > half)
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class DuplicateIndex:
+    """Thread-safe exact/near duplicate index for one crawl."""
+
+    def __init__(self, max_distance: int = 3, max_cached: int = 500):
+        self.max_distance = max_distance
+        self.max_cached = max_cached
+        self._bands = max_distance + 1
+        self._band_bits = -(-SIMHASH_BITS // self._bands)
+        self._contents: "OrderedDict[Tuple[str, str, str], Tuple[str, ExtractedContent]]" = OrderedDict()
+        self._band_index: List[Dict[int, List[Tuple[int, str]]]] = [{} for _ in range(self._bands)]
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls) -> Optional["DuplicateIndex"]:
+        """The configured index, or None when DEDUP_CONTENT is off."""
+        if not Config.DEDUP_CONTENT:
+            return None
+        return cls(max_distance=Config.DEDUP_SIMHASH_DISTANCE, max_cached=Config.DEDUP_CACHE_ENTRIES)
+
+    @staticmethod
+    def _key(body_hash: str, url: str, profile) -> Tuple[str, str, str]:
+        return body_hash, urljoin(url, "."), get_profile(profile).name
+
+    def cached(self, body_hash: str, url: str, profile=None) -> Optional[Tuple[str, ExtractedContent]]:
+        """(first url, content) of an identical body parsed earlier, or None."""
+        key = self._key(body_hash, url, profile)
+        with self._lock:
+            hit = self._contents.get(key)
+            if hit is not None:
+                self._contents.move_to_end(key)
+            return hit
+
+    def add(self, url: str, body_hash: Optional[str], content: ExtractedContent, profile=None) -> Optional[DuplicateMatch]:
+        """
+        Record a freshly parsed page. Returns the near-duplicate it matches,
+        if any; the page is indexed either way.
+        """
+        fingerprint = simhash(content.text_content)
+        with self._lock:
+            if body_hash is not None and self.max_cached > 0:
+                self._contents[self._key(body_hash, url, profile)] = (url, content)
+                while len(self._contents) > self.max_cached:
+                    self._contents.popitem(last=False)
+            if fingerprint is None:
+                return None
+            bands = self._split(fingerprint)
+            match = None
+            for band, table in zip(bands, self._band_index):
+                for other, other_url in table.get(band, ()):
+                    if other_url != url and hamming(fingerprint, other) <= self.max_distance:
+                        match = DuplicateMatch(DUPLICATE_NEAR, other_url)
+                        break
+                if match:
+                    break
+            for band, table in zip(bands, self._band_index):
+                table.setdefault(band, []).append((fingerprint, url))
+            return match
+
+    def _split(self, fingerprint: int) -> List[int]:
+        mask = (1 << self._band_bits) - 1
+        return [fingerprint >> (i * self._band_bits) & mask for i in range(self._bands)]
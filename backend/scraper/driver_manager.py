@@ -1,4 +1,11 @@
 import logging
+import os
+import queue
+import socket
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -6,9 +13,118 @@ from webdriver_manager.chrome import ChromeDriverManager
 from .config import Config
 from .utils import get_random_user_agent
 
+try:
+    import psutil
+except ImportError:  # optional — falls back to the JS heap size
+    psutil = None
+
 logger = logging.getLogger("crawler")
 
-def create_driver(headless=None):
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def resolve_driver_path():
+    """
+    Path to the chromedriver binary, resolved once per process.
+    Config.CHROMEDRIVER_PATH wins; otherwise webdriver-manager's version
+    lookup / download runs on first use and its result is reused.
+    """
+    global _driver_path
+    if Config.CHROMEDRIVER_PATH:
+        return Config.CHROMEDRIVER_PATH
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+            logger.info(f"Resolved chromedriver: {_driver_path}")
+        return _driver_path
+
+# Blockable resource types → URL patterns for DevTools Network.setBlockedURLs.
+# Images are additionally blocked by type through a Chrome content setting.
+RESOURCE_TYPE_PATTERNS = {
+    "image": ("*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico"),
+    "font": ("*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"),
+    "stylesheet": ("*.css",),
+    "media": ("*.mp4", "*.webm", "*.ogg", "*.mp3", "*.m4a", "*.mov", "*.m3u8"),
+}
+
+# Ad / analytics hosts that never contribute to the DOM we parse.
+TRACKER_PATTERNS = (
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*adservice.google.*", "*facebook.net*",
+    "*connect.facebook.com*", "*hotjar.com*", "*segment.io*", "*segment.com/analytics*",
+    "*mixpanel.com*", "*amplitude.com*", "*clarity.ms*", "*newrelic.com*", "*nr-data.net*",
+    "*criteo.com*", "*taboola.com*", "*outbrain.com*", "*scorecardresearch.com*",
+)
+
+
+@dataclass(frozen=True)
+class ResourcePolicy:
+    """What a rendering browser should not download."""
+    resource_types: Tuple[str, ...] = ()     # keys of RESOURCE_TYPE_PATTERNS
+    url_patterns: Tuple[str, ...] = ()       # extra wildcard URL patterns
+    block_trackers: bool = False
+
+    @classmethod
+    def from_config(cls):
+        return cls(
+            resource_types=tuple(Config.BLOCK_RESOURCE_TYPES),
+            url_patterns=tuple(Config.BLOCK_URL_PATTERNS),
+            block_trackers=Config.BLOCK_TRACKERS,
+        )
+
+    @classmethod
+    def from_request(cls, resource_types: Optional[Sequence[str]] = None,
+                     url_patterns: Optional[Sequence[str]] = None,
+                     block_trackers: Optional[bool] = None):
+        """Per-job override; any argument left as None keeps the configured default."""
+        default = cls.from_config()
+        return cls(
+            resource_types=tuple(resource_types) if resource_types is not None else default.resource_types,
+            url_patterns=tuple(url_patterns) if url_patterns is not None else default.url_patterns,
+            block_trackers=block_trackers if block_trackers is not None else default.block_trackers,
+        )
+
+    def blocked_urls(self):
+        patterns = []
+        for rtype in self.resource_types:
+            for ext in RESOURCE_TYPE_PATTERNS.get(rtype, ()):
+                patterns += [ext, f"{ext}?*"]
+        if self.block_trackers:
+            patterns += TRACKER_PATTERNS
+        patterns += self.url_patterns
+        return patterns
+
+    def chrome_prefs(self):
+        prefs = {}
+        if "image" in self.resource_types:
+            prefs["profile.managed_default_content_settings.images"] = 2
+        return prefs
+
+
+def _apply_resource_policy(driver, policy):
+    """Install URL blocking through DevTools; ignored on non-Chromium drivers."""
+    urls = policy.blocked_urls()
+    if not urls:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": urls})
+    except Exception as e:
+        logger.warning(f"Could not apply resource blocking: {e}")
+
+
+def apply_tab_resource_policy(driver):
+    """
+    Install the driver's URL blocking in its current tab. DevTools commands
+    reach only the tab they are sent to, so every tab opened with
+    window.open needs this before it navigates.
+    """
+    policy = getattr(driver, "resource_policy", None)
+    if policy is not None:
+        _apply_resource_policy(driver, policy)
+
+def create_driver(headless=None, debug_port=None, resource_policy=None):
     if headless is None:
         headless = Config.HEADLESS_MODE
         
@@ -27,9 +143,19 @@ def create_driver(headless=None):
     chrome_options.add_argument("--disable-translate")
     chrome_options.add_argument("--disable-default-apps")
     chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-    chrome_options.add_argument("--single-process")  # Important for containers
+    if Config.CHROME_SINGLE_PROCESS and Config.RENDER_TABS <= 1:
+        chrome_options.add_argument("--single-process")  # Important for containers
+    else:
+        # Multi-tab rendering: keep background tabs running at full speed
+        chrome_options.add_argument("--disable-background-timer-throttling")
+        chrome_options.add_argument("--disable-renderer-backgrounding")
+        chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+        chrome_options.add_argument("--disable-popup-blocking")
     chrome_options.add_argument("--no-zygote")  # Important for containers
-    chrome_options.add_argument("--remote-debugging-port=9222")
+    # A fixed port would stop several browsers running side by side; without
+    # one, chromedriver picks a free port itself.
+    if debug_port:
+        chrome_options.add_argument(f"--remote-debugging-port={debug_port}")
     chrome_options.add_argument("--window-size=1920,1080")
     chrome_options.add_argument(f"user-agent={get_random_user_agent()}")
     
@@ -37,17 +163,210 @@ def create_driver(headless=None):
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
+
+    # Network log for XHR/JSON capture (hydration.capture_json_responses)
+    if Config.CAPTURE_XHR:
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    # Resource blocking — parse_html only needs the DOM
+    if resource_policy is None:
+        resource_policy = ResourcePolicy.from_config()
+    prefs = resource_policy.chrome_prefs()
+    if prefs:
+        chrome_options.add_experimental_option("prefs", prefs)
     
     try:
-        service = Service(ChromeDriverManager().install())
+        service = Service(resolve_driver_path())
         driver = webdriver.Chrome(service=service, options=chrome_options)
         
         # Set timeouts
         driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
         driver.set_script_timeout(Config.SCRIPT_TIMEOUT)
         driver.implicitly_wait(Config.IMPLICIT_WAIT)
+        _apply_resource_policy(driver, resource_policy)
+        # Kept for the tabs Scraper.scrape_dynamic_many opens (apply_tab_resource_policy)
+        driver.resource_policy = resource_policy
         
         return driver
     except Exception as e:
         logger.error(f"Failed to create driver: {e}")
         raise
+
+
+def _free_port():
+    """Ask the OS for an unused TCP port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _browser_memory_mb(driver):
+    """
+    Resident memory of the browser behind driver, in MB.
+    Uses the chromedriver process tree when psutil is installed, otherwise the
+    page's JS heap. Returns None if neither is available.
+    """
+    try:
+        if psutil is not None:
+            proc = psutil.Process(driver.service.process.pid)
+            procs = [proc] + proc.children(recursive=True)
+            return sum(p.memory_info().rss for p in procs) / (1024 * 1024)
+        heap = driver.execute_script(
+            "return performance.memory ? performance.memory.usedJSHeapSize : null"
+        )
+        return heap / (1024 * 1024) if heap else None
+    except Exception:
+        return None
+
+
+class PooledDriver:
+    """A pool-owned WebDriver plus the bookkeeping used to decide recycling."""
+
+    def __init__(self, driver, debug_port):
+        self.driver = driver
+        self.debug_port = debug_port
+        self.pages = 0
+        self.baseline_mb = _browser_memory_mb(driver)
+
+    def is_alive(self):
+        """Cheap liveness probe — a crashed tab or browser raises here."""
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error closing WebDriver on port {self.debug_port}: {e}")
+
+
+class DriverPool:
+    """
+    Fixed-size pool of Chrome instances, each on its own debugging port.
+
+    Callers check a driver out, use it for one page and check it back in:
+
+        with pool.driver() as driver:
+            scraper.scrape_dynamic(url, driver)
+
+    Browsers start lazily on the first checkout that finds no idle one (call
+    warm_up() to start them all up front). Every checkout runs a liveness
+    probe and transparently replaces a dead browser. A browser is recycled
+    (quit and replaced) after ``max_pages`` pages, when its memory has grown
+    by more than ``max_memory_mb`` since it started, or when the page raised
+    a WebDriver error.
+    """
+
+    def __init__(self, size=None, max_pages=None, max_memory_mb=None, headless=None,
+                 resource_policy=None):
+        if size is None:
+            size = Config.DRIVER_POOL_SIZE or min(Config.CRAWL_WORKERS, os.cpu_count() or 1)
+        self.size = max(1, size)
+        self.max_pages = max_pages if max_pages is not None else Config.DRIVER_MAX_PAGES
+        self.max_memory_mb = max_memory_mb if max_memory_mb is not None else Config.DRIVER_MAX_MEMORY_MB
+        self.headless = headless
+        self.resource_policy = resource_policy
+
+        self._idle = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _spawn(self):
+        port = _free_port()
+        driver = create_driver(
+            headless=self.headless, debug_port=port, resource_policy=self.resource_policy
+        )
+        logger.info(f"WebDriver started on debugging port {port}")
+        return PooledDriver(driver, port)
+
+    def _discard(self, pooled):
+        pooled.quit()
+        with self._lock:
+            self._created -= 1
+
+    def warm_up(self):
+        """Start every browser now instead of on first checkout."""
+        while True:
+            with self._lock:
+                if self._created >= self.size:
+                    break
+                self._created += 1
+            try:
+                self._idle.put(self._spawn())
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+    def checkout(self, timeout=None):
+        """Return a live PooledDriver, starting one if the pool has room."""
+        if self._closed:
+            raise RuntimeError("DriverPool is closed")
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_spawn = self._created < self.size
+                    if can_spawn:
+                        self._created += 1
+                if can_spawn:
+                    try:
+                        return self._spawn()
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+                pooled = self._idle.get(timeout=timeout)
+
+            if pooled.is_alive():
+                return pooled
+            logger.warning(f"WebDriver on port {pooled.debug_port} is unresponsive — replacing it")
+            self._discard(pooled)
+
+    def checkin(self, pooled, healthy=True):
+        """Return a driver to the pool, recycling it if it is due."""
+        pooled.pages += 1
+        reason = None
+        if self._closed:
+            reason = "pool closed"
+        elif not healthy:
+            reason = "WebDriver error"
+        elif self.max_pages and pooled.pages >= self.max_pages:
+            reason = f"{pooled.pages} pages served"
+        elif self.max_memory_mb and pooled.baseline_mb is not None:
+            current = _browser_memory_mb(pooled.driver)
+            if current is not None and current - pooled.baseline_mb > self.max_memory_mb:
+                reason = f"memory grew {current - pooled.baseline_mb:.0f} MB"
+
+        if reason:
+            logger.info(f"Recycling WebDriver on port {pooled.debug_port}: {reason}")
+            self._discard(pooled)
+        else:
+            self._idle.put(pooled)
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """Context-managed checkout yielding the raw WebDriver."""
+        pooled = self.checkout(timeout=timeout)
+        healthy = True
+        try:
+            yield pooled.driver
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            self.checkin(pooled, healthy=healthy)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(pooled)
@@ -0,0 +1,97 @@
+"""
+Streaming export of a crawl's extracted records from its job log.
+
+/download used to load the whole log, clean every record, hold them all in a
+list and json.dumps the lot into one response, so memory and time grew with
+the crawl until large downloads timed out.  Here records are read, cleaned
+and encoded one at a time and sent in ~CHUNK_BYTES chunks, so memory stays
+flat whatever the crawl size:
+
+  - json:   a JSON array (what the web UI parses), one record per element
+  - ndjson: one compact JSON record per line
+  - either optionally gzip-compressed as it streams
+"""
+
+import json
+import zlib
+from typing import Any, Iterable, Iterator
+
+FORMAT_JSON = "json"
+FORMAT_NDJSON = "ndjson"
+FORMATS = (FORMAT_JSON, FORMAT_NDJSON)
+
+MEDIA_TYPES = {FORMAT_JSON: "application/json", FORMAT_NDJSON: "application/x-ndjson"}
+
+# Bytes gathered before a chunk is sent
+CHUNK_BYTES = 64 * 1024
+
+_EXTRACTED = "Extracted content"
+# Every "Extracted content" log line contains this; other lines skip json.loads
+_EXTRACTED_MARKER = json.dumps({"message": _EXTRACTED})[1:-1]
+
+_EMPTY = ("", [], {}, None)
+
+
+def clean_data(obj: Any) -> Any:
+    """Drop empty strings, lists, dicts and None values, recursively."""
+    if isinstance(obj, dict):
+        return {k: v2 for k, v in obj.items() if (v2 := clean_data(v)) not in _EMPTY}
+    if isinstance(obj, list):
+        return [c for item in obj if (c := clean_data(item)) not in _EMPTY]
+    return None if obj == "" else obj
+
+
+def iter_records(lines: Iterable[str]) -> Iterator[dict]:
+    """Cleaned extracted-content records from job log lines; malformed lines are skipped."""
+    for line in lines:
+        if _EXTRACTED_MARKER not in line:
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if entry.get("message") == _EXTRACTED and "data" in entry:
+            processed = clean_data(entry["data"])
+            if processed:
+                yield processed
+
+
+def _encode(records: Iterable[dict], fmt: str) -> Iterator[str]:
+    if fmt == FORMAT_NDJSON:
+        for record in records:
+            yield json.dumps(record, ensure_ascii=False) + "\n"
+        return
+    yield "["
+    separator = "\n  "
+    for record in records:
+        yield separator + json.dumps(record, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+        separator = ",\n  "
+    yield "\n]" if separator != "\n  " else "]"
+
+
+def stream_records(records: Iterable[dict], fmt: str = FORMAT_JSON, gzip: bool = False,
+                   chunk_bytes: int = CHUNK_BYTES) -> Iterator[bytes]:
+    """Encode records as fmt and yield the output in chunks of about chunk_bytes."""
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if gzip else None  # gzip container
+
+    buffer, size = [], 0
+    for piece in _encode(records, fmt):
+        data = piece.encode("utf-8")
+        buffer.append(data)
+        size += len(data)
+        if size >= chunk_bytes:
+            chunk = b"".join(buffer)
+            buffer, size = [], 0
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+                if not chunk:  # zlib is still buffering
+                    continue
+            yield chunk
+
+    tail = b"".join(buffer)
+    if compressor is not None:
+        tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+        yield tail
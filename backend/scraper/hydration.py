@@ -0,0 +1,215 @@
+"""
+Structured-data capture for JS-framework sites.
+
+React/Next.js/Nuxt apps usually ship the data a page renders either embedded
+in the static HTML (hydration payloads such as __NEXT_DATA__) or via JSON API
+calls.  Reading those payloads directly is faster and more faithful than
+rendering the DOM, and their URL-bearing fields give the crawler links that
+would otherwise only exist after JavaScript runs.
+
+Handles:
+- <script id="__NEXT_DATA__">            → "next_data"
+- <script id="__NUXT_DATA__">            → "nuxt_data"
+- window.__APOLLO_STATE__ / __INITIAL_STATE__ / __PRELOADED_STATE__ / __NUXT__
+  assignments holding a JSON literal     → "app_state"
+- <script type="application/ld+json">    → "json_ld"
+- other <script type="application/json" id=…> → "json"
+- JSON XHR/fetch responses read from Chrome's performance log → "xhr"
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from bs4 import Tag
+
+from .links import LinkResolver
+from .parser_backends import make_soup
+
+logger = logging.getLogger("scraper")
+
+# structured_data keys that carry the page's own render data (not just SEO markup)
+HYDRATION_KEYS = ("next_data", "nuxt_data", "app_state", "xhr")
+
+_STATE_ASSIGNMENT = re.compile(
+    r"window\.(__APOLLO_STATE__|__INITIAL_STATE__|__PRELOADED_STATE__|__NUXT__)\s*=\s*"
+)
+
+# JSON keys whose relative-path string values are treated as links.
+_LINK_KEY = re.compile(r"(href|url|link|path|slug|permalink|canonical|^as)$", re.IGNORECASE)
+
+# Build-asset paths that are never pages.
+_ASSET_PREFIXES = ("/_next/", "/_nuxt/", "/static/", "/assets/")
+_ASSET_SUFFIX = re.compile(
+    r"\.(js|mjs|css|map|json|png|jpe?g|gif|webp|avif|svg|ico|woff2?|ttf|eot|mp4|webm|mp3)$",
+    re.IGNORECASE,
+)
+
+_MAX_LINK_LENGTH = 2048
+
+
+def _loads(text: str) -> Optional[Any]:
+    try:
+        return json.loads(text)
+    except (TypeError, ValueError):
+        return None
+
+
+def _state_assignments(script_text: str) -> Dict[str, Any]:
+    """Decode `window.__X__ = {...}` assignments whose value is a JSON literal."""
+    found: Dict[str, Any] = {}
+    decoder = json.JSONDecoder()
+    for m in _STATE_ASSIGNMENT.finditer(script_text):
+        try:
+            value, _ = decoder.raw_decode(script_text, m.end())
+        except ValueError:
+            continue  # JS object literal, not JSON
+        found[m.group(1)] = value
+    return found
+
+
+class StructuredDataCollector:
+    """Per-page accumulator; feed it every <script> Tag via visit()."""
+
+    __slots__ = ("data",)
+
+    def __init__(self):
+        self.data: Dict[str, Any] = {}
+
+    def visit(self, script: Tag) -> None:
+        self.visit_script(script.get("src"), script.get("type"), script.get("id"), script.string)
+
+    def visit_script(self, src: Optional[str], stype: Optional[str], sid: Optional[str], text: Optional[str]) -> None:
+        """Backend-neutral visit: a <script>'s src/type/id attributes and its text."""
+        if src or not text:
+            return
+        stype = (stype or "").lower()
+        sid = sid or ""
+
+        if sid == "__NEXT_DATA__":
+            payload = _loads(text)
+            if payload is not None:
+                self.data["next_data"] = payload
+        elif sid == "__NUXT_DATA__":
+            payload = _loads(text)
+            if payload is not None:
+                self.data["nuxt_data"] = payload
+        elif stype == "application/ld+json":
+            payload = _loads(text)
+            if payload is not None:
+                self.data.setdefault("json_ld", []).append(payload)
+        elif stype == "application/json" and sid:
+            payload = _loads(text)
+            if payload is not None:
+                self.data.setdefault("json", {})[sid] = payload
+        elif not stype or "javascript" in stype:
+            state = _state_assignments(text)
+            if state:
+                self.data.setdefault("app_state", {}).update(state)
+
+    def finish(self) -> Optional[Dict[str, Any]]:
+        return self.data or None
+
+
+def extract_structured_data(markup) -> Optional[Dict[str, Any]]:
+    """Collect embedded JSON payloads from HTML or an already-parsed soup."""
+    soup = markup if isinstance(markup, Tag) else make_soup(markup)
+    collector = StructuredDataCollector()
+    for script in soup.find_all("script"):
+        collector.visit(script)
+    return collector.finish()
+
+
+def _looks_like_page_path(value: str) -> bool:
+    if not value.startswith("/") or value.startswith("//"):
+        return False
+    if any(c.isspace() for c in value) or len(value) > _MAX_LINK_LENGTH:
+        return False
+    path = urlparse(value).path
+    return not path.startswith(_ASSET_PREFIXES) and not _ASSET_SUFFIX.search(path)
+
+
+def links_from_payload(payload: Any, base_url: str) -> List[str]:
+    """
+    Walk a decoded JSON payload and return absolute URLs found in it.
+    Absolute http(s) strings count anywhere; root-relative paths only under
+    link-like keys (href, url, path, slug, …) to avoid picking up ids.
+    """
+    links: List[str] = []
+    resolve = LinkResolver(base_url).resolve
+    stack = [(None, payload)]
+    while stack:
+        key, value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(value.items())
+        elif isinstance(value, list):
+            stack.extend((key, v) for v in value)
+        elif isinstance(value, str):
+            if value.startswith(("http://", "https://")):
+                if len(value) <= _MAX_LINK_LENGTH and not any(c.isspace() for c in value):
+                    if not _ASSET_SUFFIX.search(urlparse(value).path):
+                        links.append(value)
+            elif key and isinstance(key, str) and _LINK_KEY.search(key) and _looks_like_page_path(value):
+                links.append(resolve(value))
+    return links
+
+
+def hydration_links(structured: Optional[Dict[str, Any]], base_url: str) -> List[str]:
+    """
+    Links referenced by a page's hydration payloads (HYDRATION_KEYS).
+    JSON-LD and other JSON islands are skipped: their URLs are schema.org
+    contexts, logos and social profiles, not pages of the site.
+    """
+    hydration = {key: structured[key] for key in HYDRATION_KEYS if structured and key in structured}
+    return links_from_payload(hydration, base_url) if hydration else []
+
+
+def has_hydration_payload(content: Optional[dict]) -> bool:
+    """True when scraped content already carries the page's render data."""
+    structured = (content or {}).get("structured_data") or {}
+    return any(key in structured for key in HYDRATION_KEYS)
+
+
+def capture_json_responses(driver, max_responses: int = 20, max_bytes: int = 2_000_000) -> List[Dict[str, Any]]:
+    """
+    Read JSON XHR/fetch responses from Chrome's performance log.
+    Requires the driver to be created with performance logging enabled
+    (create_driver does this when CAPTURE_XHR is set).
+    """
+    captured: List[Dict[str, Any]] = []
+    try:
+        entries = driver.get_log("performance")
+    except Exception as e:
+        logger.warning(f"Performance log unavailable: {e}")
+        return captured
+
+    for entry in entries:
+        if len(captured) >= max_responses:
+            break
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        if message.get("method") != "Network.responseReceived":
+            continue
+        params = message.get("params", {})
+        response = params.get("response", {})
+        if params.get("type") not in ("XHR", "Fetch") or "json" not in (response.get("mimeType") or ""):
+            continue
+        try:
+            body = driver.execute_cdp_cmd(
+                "Network.getResponseBody", {"requestId": params.get("requestId")}
+            )
+        except Exception:
+            continue  # body already evicted
+        text = body.get("body") or ""
+        if body.get("base64Encoded") or len(text) > max_bytes:
+            continue
+        payload = _loads(text)
+        if payload is not None:
+            captured.append({"url": response.get("url"), "data": payload})
+    return captured
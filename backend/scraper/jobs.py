@@ -0,0 +1,423 @@
+"""
+Server job manager: crawls and audits run side by side, each under its own ID.
+
+server.py used to hold one global crawler and one global auditor, so /start
+was refused while any crawl ran.  JobManager runs up to MAX_CONCURRENT_JOBS
+jobs at once, queues up to MAX_QUEUED_JOBS more in submission order, and keeps
+the last JOB_HISTORY finished jobs for status lookups and downloads.
+
+With JOB_PROCESSES (the default) each job runs in its own worker process, so
+page parsing never holds the API process's GIL and a job that crashes (or is
+OOM-killed) only fails itself.  The server talks to a worker over two
+channels: a multiprocessing Event carrying the stop signal, and a Queue
+carrying the worker's log lines (already JSON-encoded) and its final state.
+A monitor thread per job writes the lines to the job's log file (and to the
+LogBroadcaster feeding /logs clients).  Workers close their handlers on the
+shared logs/*.log files, which only the API process may rotate, so a worker's
+records land in its job log alone.  A worker that ignores a stop for
+JOB_STOP_TIMEOUT seconds is terminated.  Workers are not daemonic, so they
+can start processes of their own (the PARSE_POOL parse workers); shutdown()
+stops and reaps them when the server exits.
+
+Without JOB_PROCESSES jobs run in threads of the API process.  Their loggers
+are shared, so each job's handler carries a JobLogFilter and the job's threads
+are bound to its ID (see logger.bind_job).
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import Config
+from .log_stream import LogBroadcaster
+from .logger import JobLogFilter, JSONFormatter, bind_job, disable_file_logging
+
+KIND_CRAWL = "crawl"
+KIND_AUDIT = "audit"
+
+STATE_QUEUED = "queued"
+STATE_RUNNING = "running"
+STATE_FINISHED = "finished"
+STATE_STOPPED = "stopped"
+STATE_FAILED = "failed"
+
+# Loggers whose records go to a job's log file, and the file's name prefix
+_JOB_LOGGERS = {
+    KIND_CRAWL: ("crawler", "scraper", "errors"),
+    KIND_AUDIT: ("auditor",),
+}
+_LOG_PREFIX = {KIND_CRAWL: "scrape", KIND_AUDIT: "audit"}
+
+# Worker -> server messages
+_MSG_LOG = "log"
+_MSG_DONE = "done"
+
+_POLL_SECONDS = 0.5
+
+
+class QueueFullError(RuntimeError):
+    """Raised by JobManager.submit when MAX_QUEUED_JOBS jobs are already waiting."""
+
+
+@dataclass(eq=False)
+class Job:
+    id: str
+    kind: str
+    url: str
+    log_path: str
+    report_path: str = ""
+    state: str = STATE_QUEUED
+    error: str = ""
+    pid: Optional[int] = None
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    stop_requested: bool = False
+    worker: Any = field(default=None, repr=False)  # has stop(): Crawler / SitemapAuditor / worker process
+    target: Optional[Callable] = field(default=None, repr=False)
+    args: tuple = field(default=(), repr=False)
+
+    @property
+    def active(self) -> bool:
+        return self.state in (STATE_QUEUED, STATE_RUNNING)
+
+    def attach(self, worker) -> None:
+        """Register the object whose stop() ends the job; stops it at once if a stop already came in."""
+        self.worker = worker
+        if self.stop_requested:
+            worker.stop()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "url": self.url,
+            "state": self.state,
+            "error": self.error,
+            "pid": self.pid,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "logs_path": self.log_path,
+            "report_path": self.report_path,
+        }
+
+
+class _LineHandler(logging.Handler):
+    """Formats records as JSON lines and hands each line to a callback."""
+
+    def __init__(self, emit_line: Callable[[str], None]):
+        super().__init__()
+        self.emit_line = emit_line
+        self.setFormatter(JSONFormatter())
+
+    def emit(self, record):
+        try:
+            self.emit_line(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+class _JobLog:
+    """A job's log file, flushed line by line; lines are also published to log stream clients."""
+
+    def __init__(self, path: str, publish: Optional[Callable[[str], None]] = None):
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._publish = publish
+
+    def write(self, line: str) -> None:
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+        if self._publish is not None:
+            self._publish(line)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class _WorkerJob:
+    """What a job target sees inside a worker process in place of the Job."""
+
+    def __init__(self, job: Job, stop_event):
+        self.id = job.id
+        self.kind = job.kind
+        self.url = job.url
+        self.log_path = job.log_path
+        self.report_path = job.report_path
+        self._stop_event = stop_event
+
+    @property
+    def stop_requested(self) -> bool:
+        return self._stop_event.is_set()
+
+    def attach(self, worker) -> None:
+        threading.Thread(target=self._stop_on_signal, args=(worker,), daemon=True).start()
+
+    def _stop_on_signal(self, worker) -> None:
+        self._stop_event.wait()
+        worker.stop()
+
+
+def _job_process(job: _WorkerJob, events, target: Callable, args: tuple) -> None:
+    """Worker process entry point: run the target, streaming log lines and the outcome to the server."""
+    # Importing the target opened the shared crawler/scraper/errors logs; only
+    # the API process writes (and rotates) those, this job's lines go through events
+    disable_file_logging()
+    handler = _LineHandler(lambda line: events.put((_MSG_LOG, line)))
+    loggers = [logging.getLogger(name) for name in _JOB_LOGGERS[job.kind]]
+    for lg in loggers:
+        lg.addHandler(handler)
+    try:
+        target(job, *args)
+        events.put((_MSG_DONE, STATE_STOPPED if job.stop_requested else STATE_FINISHED, ""))
+    except Exception as e:
+        print(f"Job {job.id} ({job.kind}) error: {e}")
+        events.put((_MSG_DONE, STATE_FAILED, str(e)))
+    finally:
+        for lg in loggers:
+            lg.removeHandler(handler)
+
+
+class _WorkerProcess:
+    """Server-side handle of a job's worker process; stop() raises the stop Event."""
+
+    def __init__(self, job: Job, ctx):
+        self.stop_event = ctx.Event()
+        self.events = ctx.Queue()
+        self.stop_sent: Optional[float] = None
+        self.process = ctx.Process(
+            target=_job_process,
+            args=(_WorkerJob(job, self.stop_event), self.events, job.target, job.args),
+            name=f"job-{job.id}",
+            # Not daemonic: a daemonic process may not start children, and a
+            # crawl with PARSE_POOL needs its own parse workers
+            daemon=False,
+        )
+
+    def stop(self) -> None:
+        if self.stop_sent is None:
+            self.stop_sent = time.monotonic()
+        self.stop_event.set()
+
+
+class JobManager:
+    """
+    Runs job targets, at most max_concurrent at a time, in worker processes
+    (processes=True) or threads.
+
+    submit(kind, url, target, *args) calls target(job, *args) once a slot is
+    free; the target calls job.attach(worker) so stop() can reach it.  For
+    worker processes target and args must be picklable (module-level function).
+    """
+
+    def __init__(self, log_dir: str, max_concurrent: Optional[int] = None,
+                 max_queued: Optional[int] = None, history: Optional[int] = None,
+                 processes: Optional[bool] = None, broadcaster: Optional[LogBroadcaster] = None):
+        self.log_dir = log_dir
+        self.max_concurrent = max(1, max_concurrent or Config.MAX_CONCURRENT_JOBS)
+        self.max_queued = Config.MAX_QUEUED_JOBS if max_queued is None else max_queued
+        self.history = Config.JOB_HISTORY if history is None else history
+        self.processes = Config.JOB_PROCESSES if processes is None else processes
+        self.stop_timeout = Config.JOB_STOP_TIMEOUT
+        self.broadcaster = broadcaster
+        # spawn: forking the threaded API server could copy held locks into the child
+        self._ctx = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}  # submission order
+        self._queue = deque()
+        self._running = 0
+        self._finished = deque()
+        self._workers = set()  # live _WorkerProcess handles
+        self._closed = False
+        self._atexit_registered = False
+
+    def submit(self, kind: str, url: str, target: Callable, *args) -> Job:
+        job_id = uuid.uuid4().hex[:8]
+        os.makedirs(self.log_dir, exist_ok=True)
+        log_path = os.path.abspath(os.path.join(self.log_dir, f"{_LOG_PREFIX[kind]}_{job_id}.log"))
+        job = Job(id=job_id, kind=kind, url=url, log_path=log_path, target=target, args=args)
+        if kind == KIND_AUDIT:
+            job.report_path = os.path.abspath(os.path.join(self.log_dir, f"audit_{job_id}_report.json"))
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("JobManager is shut down")
+            if self._running >= self.max_concurrent:
+                if len(self._queue) >= self.max_queued:
+                    raise QueueFullError(f"{len(self._queue)} jobs already queued")
+                self._queue.append(job)
+                self._jobs[job.id] = job
+                return job
+            self._jobs[job.id] = job
+            self._start(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def latest(self, kind: str) -> Optional[Job]:
+        """Most recently submitted job of a kind (what the single-job endpoints act on)."""
+        with self._lock:
+            for job in reversed(self._jobs.values()):
+                if job.kind == kind:
+                    return job
+        return None
+
+    def jobs(self, kind: Optional[str] = None) -> List[Job]:
+        with self._lock:
+            return [job for job in self._jobs.values() if kind is None or job.kind == kind]
+
+    def stop(self, job_id: str) -> bool:
+        """Stop a running job or drop a queued one; False if it is unknown or already over."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or not job.active:
+                return False
+            job.stop_requested = True
+            if job.state == STATE_QUEUED:
+                self._queue.remove(job)
+                job.state = STATE_STOPPED
+                job.finished = time.time()
+                self._retire(job)
+                return True
+            worker = job.worker
+        if worker is not None:
+            worker.stop()
+        return True
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """
+        Drop queued jobs, stop running ones, and terminate worker processes
+        still alive after timeout seconds (default JOB_STOP_TIMEOUT).
+        """
+        with self._lock:
+            self._closed = True
+            queued = [job.id for job in self._queue]
+        for job_id in queued:
+            self.stop(job_id)
+        for job in self.jobs():
+            if job.state == STATE_RUNNING:
+                self.stop(job.id)
+
+        with self._lock:
+            workers = list(self._workers)
+        deadline = time.monotonic() + (self.stop_timeout if timeout is None else timeout)
+        for worker in workers:
+            worker.process.join(max(0.0, deadline - time.monotonic()))
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+
+    def _start(self, job: Job) -> None:
+        # Caller holds self._lock
+        self._running += 1
+        job.state = STATE_RUNNING
+        job.started = time.time()
+        run = self._run_process if self.processes else self._run_thread
+        threading.Thread(target=run, args=(job,), name=f"job-{job.id}", daemon=True).start()
+
+    def _run_thread(self, job: Job) -> None:
+        bind_job(job.id)
+        log = self._open_log(job)
+        handler = _LineHandler(log.write)
+        handler.addFilter(JobLogFilter(job.id))
+        loggers = [logging.getLogger(name) for name in _JOB_LOGGERS[job.kind]]
+        for lg in loggers:
+            lg.addHandler(handler)
+
+        error = ""
+        try:
+            job.target(job, *job.args)
+            state = STATE_STOPPED if job.stop_requested else STATE_FINISHED
+        except Exception as e:
+            print(f"Job {job.id} ({job.kind}) error: {e}")
+            state, error = STATE_FAILED, str(e)
+        finally:
+            for lg in loggers:
+                lg.removeHandler(handler)
+            log.close()
+            bind_job(None)
+        self._finish(job, state, error)
+
+    def _run_process(self, job: Job) -> None:
+        """Monitor thread: start the worker, relay its messages, and detect crashes."""
+        log = self._open_log(job)
+        state, error = None, ""
+        worker = None
+        try:
+            worker = _WorkerProcess(job, self._ctx)
+            worker.process.start()
+            job.pid = worker.process.pid
+            with self._lock:
+                self._workers.add(worker)
+                if not self._atexit_registered:
+                    # Registered after multiprocessing's own exit hook, so it runs
+                    # first: that hook joins non-daemonic workers and would wait
+                    # for every crawl to finish
+                    atexit.register(self.shutdown, 5.0)
+                    self._atexit_registered = True
+            job.attach(worker)
+            while True:
+                try:
+                    message = worker.events.get(timeout=_POLL_SECONDS)
+                except queue.Empty:
+                    if not worker.process.is_alive():
+                        break
+                    if worker.stop_sent is not None and time.monotonic() - worker.stop_sent > self.stop_timeout:
+                        worker.process.terminate()
+                        state = STATE_STOPPED
+                    continue
+                if message[0] == _MSG_LOG:
+                    log.write(message[1])
+                elif message[0] == _MSG_DONE and state is None:
+                    state, error = message[1], message[2]
+            worker.process.join()
+            if state is None and job.stop_requested:  # terminated after a stop
+                state = STATE_STOPPED
+            elif state is None:
+                state, error = STATE_FAILED, f"Worker process exited with code {worker.process.exitcode}"
+            worker.events.close()
+        except Exception as e:  # the worker could not be started (e.g. unpicklable arguments)
+            print(f"Job {job.id} ({job.kind}) error: {e}")
+            state, error = STATE_FAILED, str(e)
+        finally:
+            log.close()
+            with self._lock:
+                self._workers.discard(worker)
+        self._finish(job, state, error)
+
+    def _open_log(self, job: Job) -> _JobLog:
+        if self.broadcaster is None:
+            return _JobLog(job.log_path)
+        broadcaster, channel = self.broadcaster, job.id
+        return _JobLog(job.log_path, lambda line: broadcaster.publish(channel, line))
+
+    def _finish(self, job: Job, state: str, error: str) -> None:
+        with self._lock:
+            job.state = state
+            job.error = error
+            job.finished = time.time()
+            job.worker = None
+            self._running -= 1
+            self._retire(job)
+            if self._queue and not self._closed:
+                self._start(self._queue.popleft())
+
+    def _retire(self, job: Job) -> None:
+        # Caller holds self._lock. Forget the oldest finished jobs beyond the history size.
+        job.target, job.args = None, ()
+        self._finished.append(job)
+        while len(self._finished) > self.history:
+            self._jobs.pop(self._finished.popleft().id, None)
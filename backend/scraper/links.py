@@ -0,0 +1,89 @@
+"""
+Link resolution and classification with memoization.
+
+A page's links are mostly repeats: the same navigation, footer and category
+hrefs appear on every page of a site, often several times per page.  Calling
+urljoin for every <a>/<img> and then urlparse twice more per link (internal
+check, normalization) made URL handling cost more than parsing on pages
+with thousands of nav links.
+
+LinkResolver resolves one page's hrefs.  Each distinct href is joined once
+per page, and absolute hrefs (http://, https://, //) are shared across pages:
+their result depends only on the page's scheme.
+
+LinkClassifier answers "internal?" and "normalized form?" for a crawl in a
+single urlparse per distinct URL, memoized for the whole crawl.  Results are
+identical to resolve_url / is_internal_url / normalize_url in utils.
+"""
+
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional, Tuple
+from urllib.parse import urljoin, urlparse, urlsplit, urlunparse
+
+_ABSOLUTE_PREFIXES = ("http://", "https://", "//")
+
+
+@lru_cache(maxsize=65536)
+def _join_absolute(scheme: str, href: str) -> str:
+    # urljoin ignores everything but the base's scheme when href has a host
+    return urljoin(f"{scheme}://", href)
+
+
+class LinkResolver:
+    """Resolve one page's hrefs against its URL."""
+
+    __slots__ = ("base_url", "_scheme", "_seen")
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self._scheme = urlsplit(base_url).scheme if base_url else ""
+        self._seen = {}
+
+    def resolve(self, href: str) -> str:
+        """Same result as utils.resolve_url(base_url, href)."""
+        try:
+            return self._seen[href]
+        except KeyError:
+            pass
+        if self._scheme and href.startswith(_ABSOLUTE_PREFIXES):
+            resolved = _join_absolute(self._scheme, href)
+        else:
+            resolved = urljoin(self.base_url, href)
+        self._seen[href] = resolved
+        return resolved
+
+
+class LinkClassifier:
+    """Internal/external check and normalization for one crawl's root URL."""
+
+    def __init__(self, root_url: str, cache_size: int = 65536):
+        self.root_domain = urlparse(root_url).netloc
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+
+    def _classify(self, url: str) -> Tuple[bool, Optional[str]]:
+        """(is internal, normalized url or None), from one urlparse."""
+        p = urlparse(url)
+        netloc = p.netloc
+        internal = netloc == self.root_domain or netloc.endswith("." + self.root_domain)
+        scheme = p.scheme.lower()
+        if not scheme or not netloc:
+            return internal, None
+        return internal, urlunparse((scheme, netloc.lower(), p.path, p.params, p.query, ""))
+
+    def is_internal(self, url: str) -> bool:
+        """Same result as utils.is_internal_url(root_url, url)."""
+        return self.classify(url)[0]
+
+    def normalize(self, url: str) -> Optional[str]:
+        """Same result as utils.normalize_url(url)."""
+        if not url:
+            return None
+        return self.classify(url)[1]
+
+    def internal(self, links: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        """(link, normalized) for each internal link with a valid normalized form."""
+        classify = self.classify
+        for link in links:
+            internal, normalized = classify(link)
+            if internal and normalized:
+                yield link, normalized
@@ -0,0 +1,142 @@
+"""
+In-memory fan-out of job log lines to WebSocket clients.
+
+The /logs endpoints used to tail the job's log file: every client opened the
+file and polled readline() every 100 ms, sending one frame per line.  Now
+each job's log sink publishes its JSON lines to a LogBroadcaster channel (the
+job ID) as they are logged, and every client holds a Subscription:
+
+  - publish() may be called from any thread.  Lines are gathered per channel
+    and handed to the event loop by a single scheduled callback, however
+    many lines arrive before it runs.
+  - Each subscription buffers at most LOG_STREAM_CLIENT_BUFFER lines.  A
+    client that reads slower than the crawl logs loses its oldest lines and,
+    in their place, gets one warning line saying how many were dropped.  It
+    never slows the crawl or the other clients.
+  - next_frame() waits for a line, lingers LOG_STREAM_BATCH_MS for more, and
+    returns up to LOG_STREAM_BATCH_LINES lines joined by newlines as one frame.
+"""
+
+import asyncio
+import json
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from .config import Config
+
+
+class Subscription:
+    """One client's view of a channel; use from the event loop only."""
+
+    def __init__(self, broadcaster: "LogBroadcaster", channel: Optional[str]):
+        self._broadcaster = broadcaster
+        self.channel = None
+        self._lines = deque(maxlen=broadcaster.client_buffer)
+        self._ready = asyncio.Event()
+        self.dropped = 0
+        self.follow(channel)
+
+    def follow(self, channel: Optional[str]) -> None:
+        """Switch to another channel (None = none); lines still buffered are kept."""
+        if channel != self.channel:
+            self._broadcaster._move(self, self.channel, channel)
+            self.channel = channel
+
+    def close(self) -> None:
+        self.follow(None)
+
+    def _push(self, lines: List[str]) -> None:
+        overflow = len(self._lines) + len(lines) - self._lines.maxlen
+        if overflow > 0:
+            self.dropped += overflow
+        self._lines.extend(lines)
+        self._ready.set()
+
+    async def next_frame(self, timeout: Optional[float] = None) -> Optional[str]:
+        """The next batch of lines as one newline-joined frame; None if none arrived within timeout."""
+        if not self._lines:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        if self._broadcaster.batch_seconds > 0:
+            await asyncio.sleep(self._broadcaster.batch_seconds)
+        self._ready.clear()
+
+        batch = []
+        if self.dropped:
+            batch.append(_lag_notice(self.dropped))
+            self.dropped = 0
+        while self._lines and len(batch) < self._broadcaster.batch_lines:
+            batch.append(self._lines.popleft())
+        if self._lines:
+            self._ready.set()
+        return "\n".join(batch) if batch else None
+
+
+class LogBroadcaster:
+    def __init__(self, client_buffer: Optional[int] = None, batch_lines: Optional[int] = None,
+                 batch_ms: Optional[int] = None):
+        self.client_buffer = max(1, client_buffer or Config.LOG_STREAM_CLIENT_BUFFER)
+        self.batch_lines = max(1, batch_lines or Config.LOG_STREAM_BATCH_LINES)
+        self.batch_seconds = (Config.LOG_STREAM_BATCH_MS if batch_ms is None else batch_ms) / 1000
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._pending: Dict[str, List[str]] = {}
+        self._flush_scheduled = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(self, channel: Optional[str] = None) -> Subscription:
+        """Subscribe from the event loop; lines published from then on are delivered."""
+        self._loop = asyncio.get_running_loop()
+        return Subscription(self, channel)
+
+    def publish(self, channel: str, line: str) -> None:
+        """Queue a log line for a channel's subscribers; safe from any thread, cheap when nobody listens."""
+        with self._lock:
+            if channel not in self._subscribers:
+                return
+            self._pending.setdefault(channel, []).append(line)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+            loop = self._loop
+        try:
+            loop.call_soon_threadsafe(self._flush)
+        except RuntimeError:  # event loop closed (server shutting down)
+            with self._lock:
+                self._pending.clear()
+                self._flush_scheduled = False
+
+    def _flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flush_scheduled = False
+            targets = {channel: list(self._subscribers.get(channel, ())) for channel in pending}
+        for channel, lines in pending.items():
+            for subscription in targets[channel]:
+                subscription._push(lines)
+
+    def _move(self, subscription: Subscription, old: Optional[str], new: Optional[str]) -> None:
+        with self._lock:
+            if old is not None:
+                subscribers = self._subscribers.get(old)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[old]
+            if new is not None:
+                self._subscribers.setdefault(new, set()).add(subscription)
+
+
+def _lag_notice(dropped: int) -> str:
+    """A log line, in the job log format, standing in for lines a slow client missed."""
+    return json.dumps({
+        "timestamp": datetime.now().isoformat(),
+        "level": "WARNING",
+        "message": f"Log stream lagging: {dropped} lines dropped",
+        "module": "log_stream",
+        "dropped": dropped,
+    })
@@ -1,3 +1,4 @@
+import contextvars
 import logging
 import logging.handlers
 import os
@@ -17,6 +18,13 @@ class StructuredMessage:
             s += " | " + json.dumps(self.kwargs, default=str)
         return s
 
+def _json_default(value):
+    """Objects with to_dict() (ExtractedContent) are encoded from their fields, without a copy."""
+    to_dict = getattr(value, "to_dict", None)
+    if to_dict is not None:
+        return to_dict()
+    return str(value)
+
 class JSONFormatter(logging.Formatter):
     def format(self, record):
         log_entry = {
@@ -39,40 +47,83 @@ class JSONFormatter(logging.Formatter):
             if key not in standard_attrs and not key.startswith("_"):
                 log_entry[key] = value
         
-        return json.dumps(log_entry, default=str)
+        return json.dumps(log_entry, default=_json_default)
+
+# Job whose work the current thread is doing; set by the server's job runner
+# and by the crawl/audit thread pools (ThreadPoolExecutor threads do not
+# inherit context variables)
+_current_job = contextvars.ContextVar("current_job", default=None)
+
+def bind_job(job_id):
+    """Attribute log records from this thread to job_id (None to clear)."""
+    _current_job.set(job_id)
+
+def current_job():
+    return _current_job.get()
+
+class JobLogFilter(logging.Filter):
+    """Passes only records logged on behalf of one job, so concurrent jobs sharing
+    the crawler/scraper loggers each get their own log file."""
+
+    def __init__(self, job_id):
+        super().__init__()
+        self.job_id = job_id
+
+    def filter(self, record):
+        return _current_job.get() == self.job_id
+
+_LOG_FILES = {
+    "crawler": "crawler.log",
+    "scraper": "scraper.log",
+    "errors": "errors.log",
+    "auditor": "auditor.log",
+}
+
+# Cleared in job worker processes (disable_file_logging): their records reach
+# the server through the job's event queue instead
+_file_logging = True
+
+def disable_file_logging():
+    """
+    Close this process's handlers on the shared log files and stop opening them.
+    Several processes rotating one RotatingFileHandler file lose lines: one
+    renames the file while the others keep writing to the old one.
+    """
+    global _file_logging
+    _file_logging = False
+    for name in _LOG_FILES:
+        logger = logging.getLogger(name)
+        for handler in list(logger.handlers):
+            if isinstance(handler, logging.FileHandler):
+                logger.removeHandler(handler)
+                handler.close()
 
 def setup_loggers():
-    if not os.path.exists(Config.LOG_DIR):
+    if _file_logging and not os.path.exists(Config.LOG_DIR):
         os.makedirs(Config.LOG_DIR)
 
-    loggers = {
-        "crawler": "crawler.log",
-        "scraper": "scraper.log",
-        "errors": "errors.log",
-        "auditor": "auditor.log",
-    }
-    
     LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     formatter = logging.Formatter(LOG_FORMAT)
     json_formatter = JSONFormatter()
 
     configured_loggers = {}
 
-    for name, filename in loggers.items():
+    for name, filename in _LOG_FILES.items():
         logger = logging.getLogger(name)
         logger.setLevel(Config.LOG_LEVEL)
         logger.propagate = False  # Prevent double logging to root
 
         # File Handler (JSON structured for machine reading if needed, or standard)
         # Requirement: Structured JSON logs
-        file_handler = logging.handlers.RotatingFileHandler(
-            os.path.join(Config.LOG_DIR, filename), 
-            maxBytes=10*1024*1024, # 10MB
-            backupCount=5,
-            encoding='utf-8'
-        )
-        file_handler.setFormatter(json_formatter)
-        logger.addHandler(file_handler)
+        if _file_logging:
+            file_handler = logging.handlers.RotatingFileHandler(
+                os.path.join(Config.LOG_DIR, filename), 
+                maxBytes=10*1024*1024, # 10MB
+                backupCount=5,
+                encoding='utf-8'
+            )
+            file_handler.setFormatter(json_formatter)
+            logger.addHandler(file_handler)
 
         # Console Handler (High level progress)
         if name == "crawler":
@@ -0,0 +1,236 @@
+"""
+Single-pass page analysis — framework fingerprinting and rendering-mode
+classification from one parsed DOM.
+
+Framework signatures are declared once in FRAMEWORK_SIGNATURES and compiled
+into a PageAnalyzer.  Analysing a page walks the tree exactly once, collecting
+only the markers the table refers to (ids, tag names, attributes, script srcs);
+the rules are then evaluated against that marker set in priority order.  The
+walk is cheap enough to run on every crawled page, not just the homepage.
+
+Marker syntax used in signatures:
+  "#id"          any element with that id
+  "tag#id"       an element of that tag with that id
+  "<tag>"        any element of that tag
+  "[attr]"       any element carrying that attribute
+  "src:<regex>"  a <script src> matching the regex
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+
+from .parser_backends import make_soup
+
+# Rendering modes
+RENDER_STATIC   = "static"     # plain server-rendered HTML, no JS framework
+RENDER_HYDRATED = "hydrated"   # framework present, root already server-rendered
+RENDER_CSR      = "csr"        # framework app shell with an empty root — needs JS
+
+# A framework root with less visible text than this is treated as an empty shell.
+SPA_TEXT_THRESHOLD = 200
+
+# Tags whose text never counts as visible root content.
+_INVISIBLE_TAGS = {"noscript", "script", "style", "template"}
+
+
+@dataclass(frozen=True)
+class FrameworkSignature:
+    name: str
+    markers: Tuple[str, ...]          # any one present → match
+    requires: Tuple[str, ...] = ()    # every one must also be present
+
+
+# Order matters: the first matching signature wins.
+FRAMEWORK_SIGNATURES: Tuple[FrameworkSignature, ...] = (
+    FrameworkSignature("Next.js", ("script#__NEXT_DATA__", "src:/_next/")),
+    FrameworkSignature("Nuxt.js", ("div#__nuxt", "div#__layout", "src:/_nuxt/")),
+    FrameworkSignature("Gatsby (React)", ("#gatsby-focus-wrapper", "src:gatsby")),
+    FrameworkSignature("React (Vite)", (r"src:assets/index-\w+\.js",), requires=("#root",)),
+    FrameworkSignature("React (CRA)", ("src:static/js/",), requires=("#root",)),
+    FrameworkSignature("React", ("#root",)),
+    FrameworkSignature("Vue.js", ("#app",)),
+    FrameworkSignature("Angular", ("<app-root>", "[ng-version]")),
+    FrameworkSignature("SvelteKit", ("src:_app/immutable",)),
+)
+
+# Elements that host a client-rendered app, in lookup priority.
+SPA_ROOT_MARKERS: Tuple[str, ...] = ("#root", "#app", "<app-root>")
+
+
+@dataclass
+class PageAnalysis:
+    framework: Optional[str]
+    rendering_mode: str               # one of the RENDER_* constants above
+    has_noscript_fallback: bool       # True if <noscript> block contains links
+    noscript_link_count: int          # unique hrefs found inside <noscript>
+
+    @property
+    def spa_detected(self) -> bool:
+        return self.rendering_mode == RENDER_CSR
+
+
+class PageAnalyzer:
+    """Framework signature table compiled into a single-walk matcher."""
+
+    def __init__(
+        self,
+        signatures: Tuple[FrameworkSignature, ...] = FRAMEWORK_SIGNATURES,
+        spa_roots: Tuple[str, ...] = SPA_ROOT_MARKERS,
+        spa_text_threshold: int = SPA_TEXT_THRESHOLD,
+    ):
+        self.signatures = signatures
+        self.spa_roots = spa_roots
+        self.spa_text_threshold = spa_text_threshold
+
+        self._ids: Set[str] = set()
+        self._tag_ids: Set[Tuple[str, str]] = set()
+        self._tags: Set[str] = set()
+        self._attrs: Set[str] = set()
+        src_patterns: List[str] = []
+
+        all_markers = [m for sig in signatures for m in sig.markers + sig.requires]
+        for marker in all_markers + list(spa_roots):
+            if marker.startswith("src:"):
+                if marker[4:] not in src_patterns:
+                    src_patterns.append(marker[4:])
+            elif marker.startswith("<"):
+                self._tags.add(marker[1:-1])
+            elif marker.startswith("["):
+                self._attrs.add(marker[1:-1])
+            elif marker.startswith("#"):
+                self._ids.add(marker[1:])
+            else:
+                tag, _, el_id = marker.partition("#")
+                self._tag_ids.add((tag, el_id))
+
+        # One alternation for every script-src rule; group name → marker.
+        self._src_markers: Dict[str, str] = {
+            f"s{i}": f"src:{p}" for i, p in enumerate(src_patterns)
+        }
+        self._src_re = (
+            re.compile("|".join(f"(?P<s{i}>{p})" for i, p in enumerate(src_patterns)))
+            if src_patterns else None
+        )
+
+    def may_be_root(self, name: str, attrs: Dict) -> bool:
+        """True if an element with this tag/attrs could become an SPA root marker."""
+        return name in self._tags or attrs.get("id") in self._ids
+
+    def collector(self) -> "PageSignals":
+        """Return a fresh per-page collector; feed it every Tag via visit()."""
+        return PageSignals(self)
+
+    def analyze(self, markup: Union[str, bytes, BeautifulSoup]) -> PageAnalysis:
+        soup = markup if isinstance(markup, Tag) else make_soup(markup)
+        signals = self.collector()
+        for el in soup.descendants:
+            if isinstance(el, Tag):
+                signals.visit(el)
+        return signals.finish()
+
+
+class PageSignals:
+    """Marker accumulator for one page; see PageAnalyzer.collector()."""
+
+    __slots__ = ("_analyzer", "markers", "srcs", "roots", "noscript_links")
+
+    def __init__(self, analyzer: PageAnalyzer):
+        self._analyzer = analyzer
+        self.markers: Set[str] = set()
+        self.srcs: List[str] = []
+        self.roots: Dict[str, Tag] = {}
+        self.noscript_links: Set[str] = set()
+
+    def visit(self, tag: Tag) -> None:
+        self.visit_element(tag.name, tag.attrs, tag)
+        if tag.name == "noscript":
+            self.add_noscript_links(link.get("href", "") for link in tag.find_all("a", href=True))
+
+    def visit_element(self, name: str, attrs: Dict, node) -> None:
+        """Backend-neutral visit: tag name, attribute dict, and the node itself
+        (kept for SPA roots so finish() can measure their text)."""
+        a = self._analyzer
+
+        if name in a._tags:
+            marker = f"<{name}>"
+            self.markers.add(marker)
+            self.roots.setdefault(marker, node)
+
+        el_id = attrs.get("id")
+        if el_id:
+            if el_id in a._ids:
+                marker = f"#{el_id}"
+                self.markers.add(marker)
+                self.roots.setdefault(marker, node)
+            if (name, el_id) in a._tag_ids:
+                self.markers.add(f"{name}#{el_id}")
+
+        for attr in a._attrs:
+            if attr in attrs:
+                self.markers.add(f"[{attr}]")
+
+        if name == "script":
+            src = attrs.get("src")
+            if src:
+                self.srcs.append(src)
+
+    def add_noscript_links(self, hrefs) -> None:
+        self.noscript_links.update(hrefs)
+
+    def finish(self, text_length=None) -> PageAnalysis:
+        """Evaluate the signatures; text_length(root) measures an SPA root's
+        visible text (defaults to the BeautifulSoup walk)."""
+        text_length = text_length or _visible_text_length
+        a = self._analyzer
+        markers = self.markers
+        if a._src_re is not None and self.srcs:
+            for m in a._src_re.finditer("\n".join(self.srcs)):
+                markers.add(a._src_markers[m.lastgroup])
+
+        framework: Optional[str] = None
+        for sig in a.signatures:
+            if any(m in markers for m in sig.markers) and all(m in markers for m in sig.requires):
+                framework = sig.name
+                break
+
+        mode = RENDER_STATIC
+        if framework:
+            mode = RENDER_HYDRATED
+            root = next((self.roots[m] for m in a.spa_roots if m in self.roots), None)
+            if root is not None and text_length(root) < a.spa_text_threshold:
+                mode = RENDER_CSR
+
+        return PageAnalysis(
+            framework=framework,
+            rendering_mode=mode,
+            has_noscript_fallback=len(self.noscript_links) > 0,
+            noscript_link_count=len(self.noscript_links),
+        )
+
+
+def _visible_text_length(root: Tag) -> int:
+    """Length of root.get_text(strip=True), ignoring noscript/script/style."""
+    total = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for child in node.children:
+            if isinstance(child, Tag):
+                if child.name not in _INVISIBLE_TAGS:
+                    stack.append(child)
+            elif type(child) in (NavigableString, CData):
+                total += len(child.strip())
+    return total
+
+
+DEFAULT_ANALYZER = PageAnalyzer()
+
+
+def analyze_page(markup: Union[str, bytes, BeautifulSoup]) -> PageAnalysis:
+    """Analyse a page (HTML or an already-parsed soup) with the default rules."""
+    return DEFAULT_ANALYZER.analyze(markup)
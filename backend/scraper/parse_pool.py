@@ -0,0 +1,126 @@
+"""
+Process-pool parse stage.
+
+parse_html is pure Python and CPU-bound, so when several fetch threads parse
+their own pages they take turns on the GIL and a crawl never uses more than
+one core.  ParsePool moves parsing into worker processes: a fetch thread hands
+over the raw response bytes and gets an ExtractedContent back, and the pages
+of different threads are parsed on different cores.
+
+Only bytes go in and a dataclass comes out, so the cost of crossing the
+process boundary is one pickle of the body and one of the result.  A bounded
+semaphore limits the bodies waiting for a free worker; once it is full,
+submit() blocks, which makes fetch threads wait for the parse stage instead
+of piling downloaded pages up in memory.
+
+A worker that dies (segfault in a C parser, OOM kill) breaks the executor;
+the pool then starts a fresh one and retries that page once in a new worker.
+A page that kills a second worker fails on its own (BrokenProcessPool, which
+scrape_url logs) — it is never parsed in the crawler process, where the same
+crash would take the whole crawl down.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from .config import Config
+from .parser import ExtractedContent, ExtractionProfile, get_profile, parse_html
+
+logger = logging.getLogger("scraper")
+
+
+def _parse_bytes(body: bytes, url: str, encoding: Optional[str], profile: ExtractionProfile, schema=None) -> ExtractedContent:
+    """Worker entry point: decode and parse one page."""
+    return parse_html(body, url, profile=profile, schema=schema, encoding=encoding)
+
+
+class ParsePool:
+    """ProcessPoolExecutor for parse_html with a bounded intake."""
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        workers = workers if workers is not None else Config.PARSE_WORKERS
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        max_pending = max_pending if max_pending is not None else Config.PARSE_MAX_PENDING
+        # Bodies queued or being parsed at once; 0 = two per worker
+        self.max_pending = max_pending if max_pending > 0 else 2 * self.workers
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._closed = False
+
+    @classmethod
+    def from_config(cls) -> Optional["ParsePool"]:
+        """The configured pool, or None when PARSE_POOL is off."""
+        if not Config.PARSE_POOL:
+            return None
+        return cls()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ParsePool is closed")
+            if self._executor is None:
+                # Workers start on first use, so a crawl that never parses pays nothing.
+                # spawn, not fork: the crawler forks from a process full of threads.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info(f"Parse pool started with {self.workers} worker process(es)")
+            return self._executor
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        """Replace a broken executor (unless another thread already did)."""
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, body: bytes, url: str, encoding: Optional[str] = None, profile=None, schema=None) -> Future:
+        """
+        Queue one page for parsing (encoding None = sniff it from the bytes,
+        see charset). Blocks while max_pending pages are already
+        queued or in progress (backpressure on the fetch threads).
+        """
+        profile = get_profile(profile)
+        self._slots.acquire()
+        try:
+            future = self._get_executor().submit(_parse_bytes, body, url, encoding, profile, schema)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def parse(self, body: bytes, url: str, encoding: Optional[str] = None, profile=None, schema=None) -> ExtractedContent:
+        """
+        Parse one page in a worker process and wait for the result. Raises
+        BrokenProcessPool if the page killed its worker twice.
+        """
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                return self.submit(body, url, encoding, profile, schema).result()
+            except BrokenProcessPool:
+                self._restart(executor)
+                if attempt:
+                    logger.error(f"Parse worker died twice on {url} — skipping the page")
+                    raise
+                logger.warning(f"Parse worker died on {url} — restarting the pool and retrying once")
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
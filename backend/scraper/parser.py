@@ -1,10 +1,26 @@
-from bs4 import BeautifulSoup
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional
-from .utils import resolve_url
+import re
+import codecs
+import json
+from dataclasses import dataclass, fields as dataclass_fields
+from typing import Any, List, Dict, FrozenSet, Optional, Tuple, Union
+from bs4 import CData, NavigableString, SoupStrainer, Tag
+from .hydration import StructuredDataCollector, hydration_links
+from .page_analysis import DEFAULT_ANALYZER, _INVISIBLE_TAGS
+from .parser_backends import BACKEND_SELECTOLAX, LexborHTMLParser, make_soup, resolve_backend
+from .charset import decode_html
+from .links import LinkResolver
 
-@dataclass
+# Characters of page text kept in ExtractedContent.text_content
+TEXT_CONTENT_LIMIT = 5000
+
+@dataclass(slots=True)
 class ExtractedContent:
+    """
+    One page's extracted fields. Slotted, and passed around as is: callers
+    read it like a mapping (content.get("title"), content["links"]) without
+    a dict being built, and to_dict() is a shallow view for serialization —
+    the lists and dicts inside are shared, not copied.
+    """
     title: str
     meta_description: str
     headings: Dict[str, List[str]]
@@ -13,68 +29,478 @@ class ExtractedContent:
     images: List[Dict[str, str]] # list of {src, alt}
     forms: List[Dict[str, str]] # Simple form structure representation
     text_content: str # raw text dump
+    framework: Optional[str] = None # detected JS framework, if any
+    rendering_mode: Optional[str] = None # static / hydrated / csr (see page_analysis)
+    structured_data: Optional[Dict[str, Any]] = None # embedded JSON payloads (see hydration)
+    canonical: Optional[str] = None # <link rel="canonical"> href as written
+    meta_robots: Optional[str] = None # <meta name="robots"> content
+    schema_fields: Optional[Dict[str, Any]] = None # site-specific fields (see schema)
+    duplicate_of: Optional[str] = None # earlier URL with the identical body (see dedup)
+    near_duplicate_of: Optional[str] = None # earlier URL with near-identical text
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow field dict; nested values are the content's own objects."""
+        return {name: getattr(self, name) for name in _FIELD_NAMES}
+
+    def to_json(self) -> bytes:
+        """UTF-8 JSON of the content, encoded straight from the fields."""
+        return json.dumps(self.to_dict(), ensure_ascii=False).encode("utf-8")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExtractedContent":
+        """Rebuild from to_dict() output (e.g. a render-cache entry); unknown keys are ignored."""
+        return cls(
+            title=data.get("title") or "",
+            meta_description=data.get("meta_description") or "",
+            headings=data.get("headings") or {},
+            paragraphs=data.get("paragraphs") or [],
+            links=data.get("links") or [],
+            images=data.get("images") or [],
+            forms=data.get("forms") or [],
+            text_content=data.get("text_content") or "",
+            **{name: data.get(name) for name in _OPTIONAL_FIELDS},
+        )
+
+    # Read-only mapping access, for callers written against the old dict results
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in _FIELD_SET else default
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+
+_FIELD_NAMES = tuple(f.name for f in dataclass_fields(ExtractedContent))
+_FIELD_SET = frozenset(_FIELD_NAMES)
+_OPTIONAL_FIELDS = tuple(f.name for f in dataclass_fields(ExtractedContent) if f.default is None)
+
+
+@dataclass(frozen=True)
+class ExtractionProfile:
+    """
+    Which ExtractedContent fields a caller needs. Fields outside the profile
+    are left empty and cost nothing to skip. head_only parses the document
+    only up to </head> (or <body>); only_tags builds just those elements
+    (SoupStrainer) on the BeautifulSoup backends.
+    """
+    name: str
+    fields: FrozenSet[str]
+    head_only: bool = False
+    only_tags: Optional[Tuple[str, ...]] = None
+
+
+_ALL_FIELDS = _FIELD_SET
+
+PROFILE_FULL = ExtractionProfile("full", _ALL_FIELDS)
+# What the crawlers need to follow links and decide whether a page needs JavaScript
+PROFILE_CRAWL = ExtractionProfile("crawl", frozenset({
+    "title", "headings", "paragraphs", "links", "text_content",
+    "framework", "rendering_mode", "structured_data",
+}))
+# Markup links plus links found in embedded hydration payloads
+PROFILE_LINKS_ONLY = ExtractionProfile("links_only", frozenset({"links"}), only_tags=("a", "script"))
+# Indexing signals from <head>: title, description, canonical, robots
+PROFILE_SEO_HEAD = ExtractionProfile(
+    "seo_head",
+    frozenset({"title", "meta_description", "canonical", "meta_robots"}),
+    head_only=True,
+    only_tags=("title", "meta", "link"),
+)
+
+PROFILES = {p.name: p for p in (PROFILE_FULL, PROFILE_CRAWL, PROFILE_LINKS_ONLY, PROFILE_SEO_HEAD)}
+
+_HEAD_END = re.compile(r"</head\s*>|<body[\s>]", re.IGNORECASE)
+
+
+def get_profile(profile: Union[str, ExtractionProfile, None]) -> ExtractionProfile:
+    """Look up a profile by name (None = full)."""
+    if profile is None:
+        return PROFILE_FULL
+    if isinstance(profile, ExtractionProfile):
+        return profile
+    try:
+        return PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown extraction profile '{profile}' (expected one of {', '.join(PROFILES)})")
+
 
-def parse_html(html_content: str, base_url: str) -> ExtractedContent:
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # 1. Title & Meta
-    title = soup.title.string.strip() if soup.title else ""
-    meta_desc = ""
-    meta_tag = soup.find('meta', attrs={'name': 'description'})
-    if meta_tag:
-        meta_desc = meta_tag.get('content', '').strip()
-
-    # 2. Headings
-    headings = {}
-    for level in range(1, 7):
-        tag = f'h{level}'
-        headings[tag] = [h.get_text(strip=True) for h in soup.find_all(tag)]
-
-    # 3. Paragraphs
-    paragraphs = [p.get_text(strip=True) for p in soup.find_all('p') if p.get_text(strip=True)]
-
-    # 4. Links
+def parse_html(
+    html_content: Union[str, bytes],
+    base_url: str,
+    backend: Optional[str] = None,
+    profile: Union[str, ExtractionProfile, None] = None,
+    schema=None,
+    encoding: Optional[str] = None,
+) -> ExtractedContent:
+    """
+    Extract page content with the configured parser backend (PARSER_BACKEND,
+    see parser_backends). Backends agree on well-formed pages but repair
+    malformed markup differently (see parser_backends).
+    profile (name or ExtractionProfile, default "full") limits the work to
+    the fields the caller needs. schema (a compiled schema.ExtractionSchema)
+    adds site-specific fields as schema_fields, reading the whole document.
+    html_content may be the raw response bytes; they are decoded once with
+    encoding, or with the charset sniffed from BOM / <meta> (see charset).
+    """
+    if isinstance(html_content, (bytes, bytearray)):
+        if encoding:
+            html_content = codecs.decode(html_content, encoding, "replace")
+        else:
+            html_content = decode_html(html_content)
+    profile = get_profile(profile)
+    if profile.head_only and schema is None:
+        m = _HEAD_END.search(html_content)
+        if m:
+            html_content = html_content[:m.start()]
+
+    backend = resolve_backend(backend)
+    if backend == BACKEND_SELECTOLAX:
+        content = _parse_selectolax(html_content, base_url, profile)
+        if schema is not None:
+            content.schema_fields = schema.extract(html_content, base_url)
+        return content
+
+    parse_only = SoupStrainer(list(profile.only_tags)) if profile.only_tags and schema is None else None
+    soup = make_soup(html_content, backend, parse_only=parse_only)
+    content = _parse_soup(soup, base_url, profile)
+    if schema is not None:
+        # Runs on the tree just walked; _parse_soup does not modify it
+        content.schema_fields = schema.extract(html_content, base_url, soup=soup)
+    return content
+
+
+# String types BeautifulSoup's get_text() counts as text (no script/style/
+# template strings, comments or doctypes).
+_TEXT_TYPES = (NavigableString, CData)
+
+_HEADING_TAGS = {f"h{level}" for level in range(1, 7)}
+
+
+def _is_canonical(rel) -> bool:
+    """rel is a list on BeautifulSoup trees and a string on selectolax."""
+    values = rel.split() if isinstance(rel, str) else (rel or [])
+    return any(v.lower() == "canonical" for v in values)
+
+
+def _parse_soup(soup, base_url: str, profile: ExtractionProfile = PROFILE_FULL) -> ExtractedContent:
+    """
+    Collect every field in one depth-first walk of the tree, dispatching on
+    tag name. Headings and paragraphs being walked stay "open" and receive
+    each text node beneath them, which is exactly what get_text(strip=True)
+    would have returned for them.
+    """
+    want = profile.fields
+    want_headings = "headings" in want
+    want_paragraphs = "paragraphs" in want
+    want_links = "links" in want
+    want_images = "images" in want
+    want_forms = "forms" in want
+    want_text = "text_content" in want
+    want_analysis = "rendering_mode" in want or "framework" in want
+    want_scripts = "structured_data" in want or want_links
+
+    title_tag = None
+    meta_desc = None
+    canonical = None
+    meta_robots = None
+    headings = {f"h{level}": [] for level in range(1, 7)} if want_headings else {}
+    paragraphs = []
     links = []
-    for a in soup.find_all('a', href=True):
-        full_url = resolve_url(base_url, a['href'])
-        links.append(full_url)
-    
-    # 5. Images
     images = []
-    for img in soup.find_all('img', src=True):
-        img_src = resolve_url(base_url, img['src'])
-        images.append({
-            "src": img_src,
-            "alt": img.get('alt', '')
-        })
-
-    # 6. Forms (Basic capture)
     forms = []
-    for form in soup.find_all('form'):
-        form_data = {
-            "action": form.get('action', ''),
-            "method": form.get('method', 'get'),
-            "inputs": []
-        }
-        for inp in form.find_all('input'):
-            form_data["inputs"].append({
-                "name": inp.get('name'),
-                "type": inp.get('type'),
-                "placeholder": inp.get('placeholder')
+    texts = []
+    signals = DEFAULT_ANALYZER.collector()
+    structured_collector = StructuredDataCollector()
+    resolve = LinkResolver(base_url).resolve
+
+    open_text = []      # string lists of headings/paragraphs being walked
+    open_closers = []   # what to do when each of those elements ends
+    open_forms = []     # input lists of forms being walked
+    noscript_depth = 0
+
+    stack = [soup]
+    while stack:
+        node = stack.pop()
+
+        if node is None:  # end of an element that opened a collector
+            open_closers.pop()()
+            continue
+
+        if not isinstance(node, Tag):
+            if type(node) in _TEXT_TYPES and (want_text or open_text):
+                text = node.strip()
+                if text:
+                    if want_text:
+                        texts.append(text)
+                    for strings in open_text:
+                        strings.append(text)
+            continue
+
+        name = node.name
+        attrs = node.attrs
+        closer = None
+
+        if want_analysis and node is not soup:
+            signals.visit_element(name, attrs, node)
+
+        if (want_headings and name in _HEADING_TAGS) or (want_paragraphs and name == "p"):
+            strings = []
+            open_text.append(strings)
+            if name == "p":
+                slot = len(paragraphs)
+                paragraphs.append(None)
+            else:
+                slot = len(headings[name])
+                headings[name].append(None)
+            target = paragraphs if name == "p" else headings[name]
+
+            def closer(strings=strings, target=target, slot=slot):
+                open_text.pop()  # elements nest, so the innermost one is closing
+                target[slot] = "".join(strings)
+        elif name == "a":
+            href = attrs.get("href")
+            if href is not None:
+                if want_links:
+                    links.append(resolve(href))
+                if noscript_depth:
+                    signals.add_noscript_links((href,))
+        elif name == "img" and want_images:
+            src = attrs.get("src")
+            if src is not None:
+                images.append({
+                    "src": resolve(src),
+                    "alt": attrs.get("alt", ""),
+                })
+        elif name == "form" and want_forms:
+            inputs = []
+            forms.append({
+                "action": attrs.get("action", ""),
+                "method": attrs.get("method", "get"),
+                "inputs": inputs,
             })
-        forms.append(form_data)
-        
-    # 7. Main Text Content (Structured blocks - simplified for log)
-    # Get text from generic containers like article, section, div.main
-    main_content = soup.get_text(separator='\n', strip=True)
+            open_forms.append(inputs)
+
+            def closer():
+                open_forms.pop()
+        elif name == "input":
+            for inputs in open_forms:
+                inputs.append({
+                    "name": attrs.get("name"),
+                    "type": attrs.get("type"),
+                    "placeholder": attrs.get("placeholder"),
+                })
+        elif name == "title":
+            if title_tag is None:
+                title_tag = node
+        elif name == "meta":
+            meta_name = attrs.get("name")
+            if meta_desc is None and meta_name == "description":
+                meta_desc = attrs.get("content", "").strip()
+            elif meta_robots is None and meta_name and meta_name.lower() == "robots":
+                meta_robots = attrs.get("content", "").strip()
+        elif name == "link":
+            if canonical is None and _is_canonical(attrs.get("rel")):
+                canonical = (attrs.get("href") or "").strip() or None
+        elif name == "script" and want_scripts:
+            structured_collector.visit(node)
+        elif name == "noscript" and want_analysis:
+            noscript_depth += 1
+
+            def closer():
+                nonlocal noscript_depth
+                noscript_depth -= 1
+
+        if closer is not None:
+            open_closers.append(closer)
+            stack.append(None)
+        stack.extend(reversed(node.contents))
+
+    # Empty paragraphs are dropped, as before
+    paragraphs = [p for p in paragraphs if p]
 
+    analysis = signals.finish() if want_analysis else None
+
+    # Embedded JSON (hydration state, JSON-LD) and the links its hydration state references
+    structured = structured_collector.finish()
+    if structured and want_links:
+        links.extend(hydration_links(structured, base_url))
+
+    return _build_content(
+        profile,
+        title=(title_tag.string or "").strip() if title_tag is not None else "",
+        meta_description=meta_desc or "",
+        headings=headings,
+        paragraphs=paragraphs,
+        links=list(dict.fromkeys(links)), # dedupe, keeping document order
+        images=images,
+        forms=forms,
+        text_content="\n".join(texts)[:TEXT_CONTENT_LIMIT],
+        analysis=analysis,
+        structured_data=structured,
+        canonical=canonical,
+        meta_robots=meta_robots,
+    )
+
+
+def _build_content(profile, analysis=None, **values) -> ExtractedContent:
+    """ExtractedContent with only the profile's fields filled in."""
+    if analysis is not None:
+        values["framework"] = analysis.framework
+        values["rendering_mode"] = analysis.rendering_mode
+    want = profile.fields
     return ExtractedContent(
+        title=values["title"] if "title" in want else "",
+        meta_description=values["meta_description"] if "meta_description" in want else "",
+        headings=values["headings"] if "headings" in want else {},
+        paragraphs=values["paragraphs"] if "paragraphs" in want else [],
+        links=values["links"] if "links" in want else [],
+        images=values["images"] if "images" in want else [],
+        forms=values["forms"] if "forms" in want else [],
+        text_content=values["text_content"] if "text_content" in want else "",
+        framework=values.get("framework") if "framework" in want else None,
+        rendering_mode=values.get("rendering_mode") if "rendering_mode" in want else None,
+        structured_data=values["structured_data"] if "structured_data" in want else None,
+        canonical=values["canonical"] if "canonical" in want else None,
+        meta_robots=values["meta_robots"] if "meta_robots" in want else None,
+    )
+
+
+# ── selectolax backend ───────────────────────────────────────────────────────
+# Same fields as the BeautifulSoup path, collected in one traverse() of the
+# Lexbor tree. Known divergence: Lexbor keeps <template> contents out of the
+# document (per the HTML5 spec), so elements inside templates are not reported.
+
+def _sx_attr(attrs, key, default=None):
+    """attrs.get with BeautifulSoup semantics: a valueless attribute is ""."""
+    if key not in attrs:
+        return default
+    value = attrs[key]
+    return "" if value is None else value
+
+
+def _sx_text(node) -> str:
+    return node.text(deep=True, separator="", strip=True)
+
+
+def _sx_visible_text_length(root) -> int:
+    """Length of an SPA root's visible text, ignoring noscript/script/style."""
+    total = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for child in node.iter(include_text=True):
+            tag = child.tag
+            if tag == "-text":
+                total += len(child.text(deep=False).strip())
+            elif not tag.startswith("-") and tag not in _INVISIBLE_TAGS:
+                stack.append(child)
+    return total
+
+
+def _parse_selectolax(html_content: str, base_url: str, profile: ExtractionProfile = PROFILE_FULL) -> ExtractedContent:
+    # Lexbor builds the whole tree in C either way; the profile only trims the output.
+    tree = LexborHTMLParser(html_content)
+
+    title = ""
+    meta_desc = None
+    canonical = None
+    meta_robots = None
+    headings = {f"h{level}": [] for level in range(1, 7)}
+    paragraphs = []
+    links = []
+    images = []
+    forms = []
+    texts = []
+    signals = DEFAULT_ANALYZER.collector()
+    structured_collector = StructuredDataCollector()
+    resolve = LinkResolver(base_url).resolve
+    seen_title = False
+
+    root = tree.root
+    nodes = root.traverse(include_text=True) if root is not None else ()
+    for node in nodes:
+        tag = node.tag
+        if tag == "-text":
+            parent = node.parent
+            if parent is None or parent.tag not in ("script", "style", "template"):
+                text = node.text(deep=False).strip()
+                if text:
+                    texts.append(text)
+            continue
+        if tag.startswith("-"):
+            continue  # comments, doctype
+
+        attrs = node.attributes
+        signals.visit_element(tag, attrs, node)
+
+        if tag in headings:
+            headings[tag].append(_sx_text(node))
+        elif tag == "p":
+            text = _sx_text(node)
+            if text:
+                paragraphs.append(text)
+        elif tag == "a":
+            if "href" in attrs:
+                links.append(resolve(_sx_attr(attrs, "href")))
+        elif tag == "img":
+            if "src" in attrs:
+                images.append({
+                    "src": resolve(_sx_attr(attrs, "src")),
+                    "alt": _sx_attr(attrs, "alt", ""),
+                })
+        elif tag == "form":
+            forms.append({
+                "action": _sx_attr(attrs, "action", ""),
+                "method": _sx_attr(attrs, "method", "get"),
+                "inputs": [
+                    {
+                        "name": _sx_attr(inp.attributes, "name"),
+                        "type": _sx_attr(inp.attributes, "type"),
+                        "placeholder": _sx_attr(inp.attributes, "placeholder"),
+                    }
+                    for inp in node.css("input")
+                ],
+            })
+        elif tag == "title":
+            if not seen_title:
+                seen_title = True
+                title = node.text(deep=True).strip()
+        elif tag == "meta":
+            meta_name = attrs.get("name")
+            if meta_desc is None and meta_name == "description":
+                meta_desc = _sx_attr(attrs, "content", "").strip()
+            elif meta_robots is None and meta_name and meta_name.lower() == "robots":
+                meta_robots = _sx_attr(attrs, "content", "").strip()
+        elif tag == "link":
+            if canonical is None and _is_canonical(attrs.get("rel")):
+                canonical = (attrs.get("href") or "").strip() or None
+        elif tag == "script":
+            structured_collector.visit_script(
+                attrs.get("src"), attrs.get("type"), attrs.get("id"), node.text(deep=True)
+            )
+        elif tag == "noscript":
+            signals.add_noscript_links(
+                _sx_attr(a.attributes, "href", "") for a in node.css("a[href]")
+            )
+
+    analysis = signals.finish(text_length=_sx_visible_text_length)
+    structured = structured_collector.finish()
+    if structured:
+        links.extend(hydration_links(structured, base_url))
+
+    return _build_content(
+        profile,
         title=title,
-        meta_description=meta_desc,
+        meta_description=meta_desc or "",
         headings=headings,
         paragraphs=paragraphs,
-        links=list(set(links)), # dedupe
+        links=list(dict.fromkeys(links)),
         images=images,
         forms=forms,
-        text_content=main_content[:5000] # Truncate for sanity if needed, or keep full
+        text_content="\n".join(texts)[:TEXT_CONTENT_LIMIT],
+        analysis=analysis,
+        structured_data=structured,
+        canonical=canonical,
+        meta_robots=meta_robots,
     )
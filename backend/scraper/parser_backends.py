@@ -0,0 +1,89 @@
+"""
+HTML parser backend selection.
+
+parse_html can run on three backends, chosen with PARSER_BACKEND:
+
+  html.parser  BeautifulSoup on Python's built-in parser (always available)
+  lxml         BeautifulSoup on lxml's C parser (pip install lxml)
+  selectolax   selectolax's Lexbor bindings, no BeautifulSoup tree at all
+               (pip install selectolax)
+
+On well-formed pages every backend yields the same ExtractedContent.  On
+malformed markup they differ: html.parser keeps the nesting the markup spells
+out (an unclosed <p> or <h1> swallows what follows, nested <form>s are kept,
+<textarea> content is parsed as tags), while lxml and Lexbor repair the tree
+the way a browser does, and Lexbor leaves <template> contents out.  Headings,
+paragraphs, forms, text and links can therefore change when PARSER_BACKEND
+does; tests/test_parser_backends.py lists each known divergence.
+
+An unavailable backend falls back to html.parser with a single warning, so a
+missing wheel never breaks a crawl.  make_soup() is for the places that still
+need a BeautifulSoup tree (auditor <head> checks, page analysis on raw HTML);
+it uses lxml whenever it is installed and the configured backend is not
+html.parser.
+"""
+
+import logging
+
+from bs4 import BeautifulSoup
+
+from .config import Config
+
+try:
+    import lxml  # noqa: F401  (only needed as a BeautifulSoup tree builder)
+except ImportError:  # optional dependency
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional dependency
+    LexborHTMLParser = None
+
+logger = logging.getLogger("scraper")
+
+BACKEND_HTML_PARSER = "html.parser"
+BACKEND_LXML = "lxml"
+BACKEND_SELECTOLAX = "selectolax"
+
+BACKENDS = (BACKEND_HTML_PARSER, BACKEND_LXML, BACKEND_SELECTOLAX)
+
+_warned = set()
+
+
+def available_backends():
+    """Backends whose libraries are importable here."""
+    found = [BACKEND_HTML_PARSER]
+    if lxml is not None:
+        found.append(BACKEND_LXML)
+    if LexborHTMLParser is not None:
+        found.append(BACKEND_SELECTOLAX)
+    return found
+
+
+def resolve_backend(name=None):
+    """Configured (or requested) backend, or html.parser if it cannot be used."""
+    name = (name or Config.PARSER_BACKEND or BACKEND_HTML_PARSER).lower()
+    if name in available_backends():
+        return name
+    if name not in _warned:
+        _warned.add(name)
+        if name in BACKENDS:
+            logger.warning(f"Parser backend '{name}' is not installed — using html.parser")
+        else:
+            logger.warning(f"Unknown parser backend '{name}' — using html.parser")
+    return BACKEND_HTML_PARSER
+
+
+def soup_features(backend=None):
+    """BeautifulSoup tree builder for backend (selectolax maps to lxml if present)."""
+    if resolve_backend(backend) != BACKEND_HTML_PARSER and lxml is not None:
+        return BACKEND_LXML
+    return BACKEND_HTML_PARSER
+
+
+def make_soup(markup, backend=None, parse_only=None):
+    """
+    Parse markup into a BeautifulSoup tree with the fastest allowed builder.
+    parse_only (a SoupStrainer) builds only the matching elements.
+    """
+    return BeautifulSoup(markup, soup_features(backend), parse_only=parse_only)
@@ -0,0 +1,177 @@
+"""
+On-disk cache of rendered-page extraction results.
+
+A Selenium render is the most expensive thing a crawl or audit does, and most
+pages have not changed between runs.  Entries are keyed by URL plus a cheap
+fingerprint of the page's static response — its ETag when the server sends
+one, otherwise a hash of the static body — so a page whose static shell is
+unchanged reuses its previous render instead of launching the browser.
+A render with no preceding static fetch is keyed by the validators of a HEAD
+request (ETag, or Last-Modified with Content-Length) and skips the cache when
+the server sends neither, rather than downloading the body just to hash it.
+
+Each entry is one JSON file holding the (content, links) pair scrape_dynamic
+returned.  The cache is bounded by entry count and total size; the least
+recently used entries are evicted first (hits refresh a file's mtime).
+Entries older than max_age_hours are ignored even if the fingerprint matches,
+because the data a client-rendered page fetches can change behind an
+identical shell.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .config import Config
+
+logger = logging.getLogger("scraper")
+
+
+def fingerprint_response(response, digest=None) -> str:
+    """
+    ETag of a static response, or a hash of its body when there is none.
+    digest is a sha256 object already fed the body, for streamed responses.
+    """
+    etag = response.headers.get("ETag")
+    if etag:
+        return f"etag:{etag}"
+    if digest is None:
+        digest = hashlib.sha256(response.content)
+    return "sha256:" + digest.hexdigest()
+
+
+def fingerprint_headers(headers) -> Optional[str]:
+    """
+    Fingerprint from validator headers alone (e.g. a HEAD response): the ETag,
+    else Last-Modified plus Content-Length; None when there is neither.
+    """
+    etag = headers.get("ETag")
+    if etag:
+        return f"etag:{etag}"
+    modified = headers.get("Last-Modified")
+    if modified:
+        return f"modified:{modified}|length:{headers.get('Content-Length', '')}"
+    return None
+
+
+class RenderCache:
+    """Bounded, thread-safe LRU store of render results on disk."""
+
+    def __init__(self, directory: str, max_entries: int = 5000, max_mb: int = 500, max_age_hours: float = 24):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_mb * 1024 * 1024
+        self.max_age = max_age_hours * 3600 if max_age_hours else None
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, Tuple[float, int]]] = None  # key -> (mtime, size)
+        self._bytes = 0
+
+    @classmethod
+    def from_config(cls) -> Optional["RenderCache"]:
+        """The configured cache, or None when RENDER_CACHE_DIR is unset."""
+        if not Config.RENDER_CACHE_DIR:
+            return None
+        return cls(
+            Config.RENDER_CACHE_DIR,
+            max_entries=Config.RENDER_CACHE_MAX_ENTRIES,
+            max_mb=Config.RENDER_CACHE_MAX_MB,
+            max_age_hours=Config.RENDER_CACHE_MAX_AGE_HOURS,
+        )
+
+    @staticmethod
+    def key(url: str, fingerprint: str) -> str:
+        return hashlib.sha256(f"{url}\0{fingerprint}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def _load_index(self) -> Dict[str, Tuple[float, int]]:
+        """Scan the directory once; later bookkeeping is in memory."""
+        if self._index is None:
+            self._index = {}
+            self._bytes = 0
+            if os.path.isdir(self.directory):
+                for root, _, files in os.walk(self.directory):
+                    for name in files:
+                        if not name.endswith(".json"):
+                            continue
+                        try:
+                            st = os.stat(os.path.join(root, name))
+                        except OSError:
+                            continue
+                        self._index[name[:-5]] = (st.st_mtime, st.st_size)
+                        self._bytes += st.st_size
+        return self._index
+
+    def _remove(self, key: str) -> None:
+        entry = self._index.pop(key, None)
+        if entry:
+            self._bytes -= entry[1]
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def get(self, url: str, fingerprint: Optional[str]) -> Optional[Tuple[dict, List[str]]]:
+        """Cached (content, links) for url at this fingerprint, or None."""
+        if not fingerprint:
+            return None
+        key = self.key(url, fingerprint)
+        with self._lock:
+            index = self._load_index()
+            entry = index.get(key)
+            if entry is None:
+                return None
+            now = time.time()
+            if self.max_age is not None and now - entry[0] > self.max_age:
+                self._remove(key)
+                return None
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as f:
+                    record = json.load(f)
+                os.utime(self._path(key), (now, now))
+            except (OSError, ValueError):
+                self._remove(key)
+                return None
+            index[key] = (now, entry[1])
+        return record["content"], record["links"]
+
+    def put(self, url: str, fingerprint: Optional[str], content: dict, links: List[str]) -> None:
+        """Store a render result, evicting least recently used entries past the bounds."""
+        if not fingerprint or not content:
+            return
+        key = self.key(url, fingerprint)
+        data = json.dumps({"url": url, "content": content, "links": links}, ensure_ascii=False).encode("utf-8")
+        path = self._path(key)
+        with self._lock:
+            index = self._load_index()
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except OSError as e:
+                logger.warning(f"Render cache write failed for {url}: {e}")
+                return
+            if key in index:
+                self._bytes -= index[key][1]
+            index[key] = (time.time(), len(data))
+            self._bytes += len(data)
+
+            if len(index) > self.max_entries or self._bytes > self.max_bytes:
+                for old in sorted(index, key=lambda k: index[k][0]):
+                    if len(index) <= self.max_entries and self._bytes <= self.max_bytes:
+                        break
+                    if old != key:
+                        self._remove(old)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load_index())
@@ -0,0 +1,113 @@
+"""
+Learned per-site fetch strategy — decides whether a URL should go straight to
+the browser or be tried with a plain HTTP fetch first.
+
+Pages are grouped by host + path template (/products/123 and /products/456
+share "/products/{n}").  Every static fetch records whether the page turned out
+to need JavaScript; once a template has enough observations, later pages in it
+go directly to the fetcher that worked, avoiding the static-fetch-then-render
+double round trip on JS-heavy sites.  Templates with no history fall back to a
+per-host default, which callers seed from site intelligence (spa_detected).
+
+Templates learned as "render" are still re-checked statically every
+``recheck_every`` pages so a mixed site can un-learn a wrong default.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, Tuple
+from urllib.parse import urlparse
+
+FETCH_STATIC = "static"
+FETCH_RENDER = "render"
+
+_NUMERIC = re.compile(r"^\d+$")
+_HASHLIKE = re.compile(r"^(?=.*\d)[0-9a-fA-F-]{8,}$")
+_HAS_DIGIT = re.compile(r"\d")
+_SLUGLIKE = re.compile(r"[-_.]")
+
+
+def path_template(url: str) -> Tuple[str, str]:
+    """
+    Return (host, template) for url.
+    - all-digit segments      → {n}
+    - hex / uuid-like ids     → {h}
+    - other segments w/ digits→ {v}
+    - slug-like last segment  → {slug}  (only below the first path level)
+    """
+    p = urlparse(url)
+    segments = [s for s in p.path.split("/") if s]
+    out = []
+    for i, seg in enumerate(segments):
+        if _NUMERIC.match(seg):
+            out.append("{n}")
+        elif _HASHLIKE.match(seg):
+            out.append("{h}")
+        elif _HAS_DIGIT.search(seg):
+            out.append("{v}")
+        elif i == len(segments) - 1 and i > 0 and _SLUGLIKE.search(seg):
+            out.append("{slug}")
+        else:
+            out.append(seg)
+    return p.netloc.lower(), "/" + "/".join(out)
+
+
+@dataclass
+class _TemplateStats:
+    static_ok: int = 0
+    needed_render: int = 0
+    direct_renders: int = 0
+
+    @property
+    def samples(self) -> int:
+        return self.static_ok + self.needed_render
+
+
+class RenderStrategyCache:
+    """Thread-safe host/template → fetch strategy table."""
+
+    def __init__(self, min_samples: int = 2, render_ratio: float = 0.5, recheck_every: int = 10):
+        self.min_samples = min_samples
+        self.render_ratio = render_ratio
+        self.recheck_every = recheck_every
+        self._templates: Dict[Tuple[str, str], _TemplateStats] = {}
+        self._host_default: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def seed(self, url: str, needs_render: bool) -> None:
+        """Set the default for every not-yet-learned template on url's host."""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            self._host_default[host] = needs_render
+
+    def decide(self, url: str) -> str:
+        """Return FETCH_RENDER or FETCH_STATIC for url."""
+        key = path_template(url)
+        with self._lock:
+            stats = self._templates.get(key)
+            if stats is not None and stats.samples >= self.min_samples:
+                render = stats.needed_render / stats.samples >= self.render_ratio
+            else:
+                render = self._host_default.get(key[0], False)
+
+            if not render:
+                return FETCH_STATIC
+
+            stats = self._templates.setdefault(key, _TemplateStats())
+            stats.direct_renders += 1
+            if self.recheck_every and stats.direct_renders % self.recheck_every == 0:
+                return FETCH_STATIC
+            return FETCH_RENDER
+
+    def record(self, url: str, needed_render: bool) -> None:
+        """Record the outcome of a static fetch of url."""
+        key = path_template(url)
+        with self._lock:
+            stats = self._templates.setdefault(key, _TemplateStats())
+            if needed_render:
+                stats.needed_render += 1
+            else:
+                stats.static_ok += 1
@@ -0,0 +1,221 @@
+"""
+Declarative site-specific extraction schemas.
+
+parse_html extracts the same generic fields from every page.  A schema adds
+named fields — price, SKU, stock — defined by CSS selectors or XPath, so they
+come out of the crawl already structured instead of being regexed out of
+text_content downstream.
+
+A schema is a mapping of field name to spec; a bare string is a CSS selector:
+
+    {
+        "title": "h1.product-title",
+        "price": {"css": ".price", "type": "number"},
+        "sku":   {"xpath": "//span[@itemprop='sku']/text()"},
+        "stock": {"css": ".availability", "regex": "(\\d+) in stock", "type": "int"},
+        "gallery": {"css": "img.gallery", "attr": "src", "many": true},
+    }
+
+Spec keys:
+  css / xpath   exactly one.  XPath needs lxml (optional dependency); it may
+                also be a string(), count() or boolean() expression.
+  attr          attribute to read instead of the element's text; href/src
+                values are resolved against the page URL.
+  many          list of every match instead of the first (default false).
+  regex         keep only the match (its first group, if it has one).
+  type          text (default), number or int.
+
+compile_schema() validates and compiles every selector, pattern and XPath
+once per crawl; ExtractionSchema.extract() then only runs them on each page,
+reusing the BeautifulSoup tree parse_html already built.  A compiled schema
+pickles as its spec and is compiled once per parse-pool worker.
+"""
+
+import hashlib
+import json
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Union
+
+import soupsieve
+
+from .links import LinkResolver
+from .parser_backends import make_soup
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # optional dependency
+    etree = None
+
+TYPE_TEXT = "text"
+TYPE_NUMBER = "number"
+TYPE_INT = "int"
+_TYPES = (TYPE_TEXT, TYPE_NUMBER, TYPE_INT)
+
+_SPEC_KEYS = {"css", "xpath", "attr", "many", "regex", "type"}
+_URL_ATTRS = {"href", "src"}
+_NUMBER = re.compile(r"-?\d[\d,]*(?:\.\d+)?|-?\.\d+")
+
+
+class _Field:
+    __slots__ = ("name", "css", "xpath", "attr", "many", "regex", "type")
+
+    def __init__(self, name, css=None, xpath=None, attr=None, many=False, regex=None, type=TYPE_TEXT):
+        self.name = name
+        self.css = css
+        self.xpath = xpath
+        self.attr = attr
+        self.many = many
+        self.regex = regex
+        self.type = type
+
+
+class ExtractionSchema:
+    """Compiled schema; build with compile_schema()."""
+
+    def __init__(self, spec: Dict[str, Any], fields: List[_Field]):
+        self.spec = spec
+        self.fields = fields
+        self.uses_css = any(f.css is not None for f in fields)
+        self.uses_xpath = any(f.xpath is not None for f in fields)
+        canonical = json.dumps(spec, sort_keys=True)
+        self.key = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+        self._canonical = canonical
+
+    def __reduce__(self):
+        # Selectors are recompiled (once per process) from the spec
+        return _compile_cached, (self._canonical,)
+
+    def extract(self, html: str, base_url: str, soup=None) -> Dict[str, Any]:
+        """
+        Field values for one page. soup is the page's BeautifulSoup tree when
+        the caller has one; otherwise it is built only if a CSS field needs it.
+        """
+        if self.uses_css and soup is None:
+            soup = make_soup(html)
+        tree = _lxml_tree(html) if self.uses_xpath else None
+        resolve = LinkResolver(base_url).resolve
+
+        values = {}
+        for field in self.fields:
+            if field.css is not None:
+                matches = field.css.select(soup) if field.many else _first(field.css.select_one(soup))
+                raw = [_tag_value(m, field.attr) for m in matches]
+            else:
+                raw = [] if tree is None else [_xpath_value(m, field.attr) for m in _xpath_matches(field.xpath(tree))]
+                if not field.many:
+                    raw = raw[:1]
+            converted = []
+            for value in raw:
+                if value is None:
+                    continue
+                if field.attr in _URL_ATTRS:
+                    value = resolve(value)
+                value = _convert(value, field)
+                if value is not None:
+                    converted.append(value)
+            values[field.name] = converted if field.many else (converted[0] if converted else None)
+        return values
+
+
+def compile_schema(spec: Optional[Dict[str, Union[str, Dict[str, Any]]]]) -> Optional[ExtractionSchema]:
+    """Validate and compile a schema spec; raises ValueError on a bad spec."""
+    if not spec:
+        return None
+    if not isinstance(spec, dict):
+        raise ValueError("Extraction schema must be an object of field name -> selector or spec")
+    fields = []
+    for name, field_spec in spec.items():
+        if isinstance(field_spec, str):
+            field_spec = {"css": field_spec}
+        if not isinstance(field_spec, dict):
+            raise ValueError(f"Field '{name}': expected a CSS selector or an object")
+        unknown = set(field_spec) - _SPEC_KEYS
+        if unknown:
+            raise ValueError(f"Field '{name}': unknown keys {', '.join(sorted(unknown))}")
+        if ("css" in field_spec) == ("xpath" in field_spec):
+            raise ValueError(f"Field '{name}': give exactly one of css or xpath")
+
+        field_type = field_spec.get("type", TYPE_TEXT)
+        if field_type not in _TYPES:
+            raise ValueError(f"Field '{name}': type must be one of {', '.join(_TYPES)}")
+        field = _Field(name, attr=field_spec.get("attr"), many=bool(field_spec.get("many", False)), type=field_type)
+        try:
+            if "css" in field_spec:
+                field.css = soupsieve.compile(field_spec["css"])
+            else:
+                if etree is None:
+                    raise ValueError("XPath fields need lxml (pip install lxml)")
+                field.xpath = etree.XPath(field_spec["xpath"])
+            if field_spec.get("regex"):
+                field.regex = re.compile(field_spec["regex"])
+        except ValueError as e:
+            raise ValueError(f"Field '{name}': {e}")
+        except Exception as e:  # soupsieve / lxml syntax errors
+            raise ValueError(f"Field '{name}': invalid selector or pattern: {e}")
+        fields.append(field)
+    return ExtractionSchema(spec, fields)
+
+
+@lru_cache(maxsize=32)
+def _compile_cached(canonical: str) -> ExtractionSchema:
+    return compile_schema(json.loads(canonical))
+
+
+def _first(match):
+    return [match] if match is not None else []
+
+
+def _tag_value(tag, attr):
+    if attr:
+        value = tag.get(attr)
+        return " ".join(value) if isinstance(value, list) else value
+    return " ".join(tag.stripped_strings)
+
+
+def _xpath_matches(result):
+    # string(), count() and boolean() expressions return one scalar, not a node list
+    if isinstance(result, (str, float, bool)):
+        return [result]
+    return result
+
+
+def _xpath_value(match, attr):
+    if isinstance(match, bool):  # boolean(), in XPath's string form
+        return "true" if match else "false"
+    if isinstance(match, float):  # count(), sum(): "3", not "3.0"
+        return str(int(match)) if match.is_integer() else str(match)
+    if isinstance(match, str):  # text() / @attr / string() results
+        return str(match).strip()
+    if attr:
+        return match.get(attr)
+    return " ".join(t.strip() for t in match.itertext() if t.strip())
+
+
+def _lxml_tree(html: str):
+    if not html or not html.strip():
+        return None
+    try:
+        # Bytes, so documents carrying an XML encoding declaration parse too
+        return lxml.html.fromstring(html.encode("utf-8"), parser=lxml.html.HTMLParser(encoding="utf-8"))
+    except (etree.ParserError, ValueError):
+        return None
+
+
+def _convert(value: str, field: _Field):
+    if field.regex is not None:
+        m = field.regex.search(value)
+        if not m:
+            return None
+        value = m.group(1) if m.groups() else m.group(0)
+    if field.type == TYPE_TEXT:
+        return value
+    m = _NUMBER.search(value)
+    if not m:
+        return None
+    number = m.group(0).replace(",", "")
+    try:
+        return int(float(number)) if field.type == TYPE_INT else float(number)
+    except ValueError:
+        return None
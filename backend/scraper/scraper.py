@@ -1,22 +1,56 @@
 import time
+import hashlib
 import requests
 import logging
-from dataclasses import asdict
+import threading
+from collections import OrderedDict, deque
+from dataclasses import replace
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import JavascriptException, TimeoutException, WebDriverException
 
 from .config import Config
+from .charset import detect_encoding, sniff_encoding
 from .utils import get_random_user_agent
-from .parser import parse_html, ExtractedContent
+from .hydration import capture_json_responses, links_from_payload
+from .parser import parse_html, ExtractedContent, TEXT_CONTENT_LIMIT
+from .dedup import DUPLICATE_EXACT, DuplicateIndex, DuplicateMatch
+from .parse_pool import ParsePool
+from .driver_manager import apply_tab_resource_policy
+from .render_cache import RenderCache, fingerprint_headers, fingerprint_response
+from .schema import ExtractionSchema
+from .stream_parser import stream_extract
 from .logger import get_logger
 
 logger = get_logger("scraper")
 error_logger = get_logger("errors")
 
+# Static-fetch fingerprints kept for a render that may follow. A render runs
+# in the same crawl batch as its fetch; an evicted one costs a HEAD request.
+_MAX_PENDING_FINGERPRINTS = 1000
+
 class Scraper:
-    def __init__(self, session: requests.Session = None):
+    def __init__(
+        self,
+        session: requests.Session = None,
+        render_cache: RenderCache = None,
+        parse_pool: ParsePool = None,
+        dedup: DuplicateIndex = None,
+        schema: ExtractionSchema = None,
+    ):
+        # Rendered pages are cached by URL + static fingerprint (RENDER_CACHE_DIR)
+        self.render_cache = render_cache if render_cache is not None else RenderCache.from_config()
+        # Fingerprints of static fetches, consumed by the render that follows them.
+        # Most static pages are never rendered, so only the newest are kept.
+        self._fingerprints = OrderedDict()
+        self._fingerprints_lock = threading.Lock()
+        # Static pages are parsed in these worker processes when given (PARSE_POOL)
+        self.parse_pool = parse_pool
+        # Exact / near-duplicate detection of static pages (per crawl)
+        self.dedup = dedup
+        # Site-specific fields (schema.compile_schema) added to every page's content
+        self.schema = schema
         if session is not None:
             self.session = session
         else:
@@ -26,7 +60,7 @@ class Scraper:
                 "Accept-Language": "en-US,en;q=0.9",
             })
 
-    def scrape_url(self, url, driver=None):
+    def scrape_url(self, url, driver=None, profile=None):
         """
         Extract content from URL.
         Strategy:
@@ -34,6 +68,7 @@ class Scraper:
         2. Detect if content seems missing or if JS is required (heuristic).
         3. If dynamic, use Selenium.
         For now, we can config to Force Selenium or use a simple heuristic.
+        profile picks the extraction profile (parser.PROFILES, default "full").
         """
         
         # Random delay before request
@@ -42,78 +77,475 @@ class Scraper:
         try:
             # Attempt Static Scrape
             logger.info(f"Scraping static: {url}")
-            response = self.session.get(url, timeout=Config.PAGE_LOAD_TIMEOUT)
-            
-            if response.status_code == 403:
-                error_logger.warning(f"403 Forbidden on {url} — returning None so caller can retry with Selenium")
-                return None, []
+            response = self.session.get(url, timeout=Config.PAGE_LOAD_TIMEOUT, stream=True)
+            try:
+                if response.status_code == 403:
+                    error_logger.warning(f"403 Forbidden on {url} — returning None so caller can retry with Selenium")
+                    return None, []
 
-            if response.status_code != 200:
-                error_logger.error(f"Failed to fetch {url}: Status {response.status_code}")
-                return None, []
+                if response.status_code != 200:
+                    error_logger.error(f"Failed to fetch {url}: Status {response.status_code}")
+                    return None, []
 
-            html = response.text
-            
-            # Simple Heuristic: If we need Selenium, use it. 
-            # (e.g., empty body or specific markers). 
-            # For this MVP, we'll try to stick to static unless configured otherwise or obvious failure.
+                # Simple Heuristic: If we need Selenium, use it. 
+                # (e.g., empty body or specific markers). 
+                # For this MVP, we'll try to stick to static unless configured otherwise or obvious failure.
+                
+                # Parse — pages over STREAM_THRESHOLD_BYTES are extracted while
+                # they download instead of being held and turned into a DOM
+                content, duplicate = self._extract_response(response, url, profile)
+            finally:
+                response.close()
             
-            # Parse
-            content = parse_html(html, url)
-            
-            return asdict(content), content.links
+            if duplicate is not None:
+                # duplicate_of / near_duplicate_of: the earlier URL with this content.
+                # A shallow copy, so the copy in the duplicate index stays unflagged.
+                content = replace(content, **{duplicate.kind: duplicate.of})
+            return content, content.links
 
         except Exception as e:
             error_logger.exception(f"Error scraping {url}: {e}")
             return None, []
 
-    def scrape_dynamic(self, url, driver):
+    def _extract_response(self, response, url, profile=None):
+        """
+        Parse a 200 response, streaming it if it exceeds STREAM_THRESHOLD_BYTES.
+        Returns (content, DuplicateMatch or None).
+        """
+        threshold = Config.STREAM_THRESHOLD_BYTES
+        chunks = response.iter_content(chunk_size=65536)
+        content_type = response.headers.get("Content-Type")
+        digest = hashlib.sha256() if self.render_cache is not None or self.dedup is not None else None
+
+        body = bytearray()
+        streamed = False
+        for chunk in chunks:
+            body.extend(chunk)
+            if threshold and len(body) > threshold:
+                streamed = True
+                break
+
+        # BOM / header / <meta> in the first KB, else a UTF-8 check, and only
+        # then statistical detection — never requests' whole-body guess.
+        # An undeclared complete body is left to parse_html, which decodes it once.
+        if streamed:
+            encoding = detect_encoding(body, content_type, final=False)
+        else:
+            encoding = sniff_encoding(body, content_type)
+
+        if not streamed:
+            body_hash = None
+            if digest is not None:
+                digest.update(body)
+                body_hash = digest.hexdigest()
+                if self.render_cache is not None:
+                    self._remember_fingerprint(url, fingerprint_response(response, digest=digest))
+            if self.dedup is not None:
+                # The same body under another URL: reuse its parse
+                hit = self.dedup.cached(body_hash, url, profile)
+                if hit is not None:
+                    original, content = hit
+                    return content, DuplicateMatch(DUPLICATE_EXACT, original) if original != url else None
+            if self.parse_pool is not None:
+                content = self.parse_pool.parse(bytes(body), url, encoding, profile, schema=self.schema)
+            else:
+                content = parse_html(body, url, profile=profile, schema=self.schema, encoding=encoding)
+            return content, self._record_content(url, body_hash, content, profile)
+
+        logger.info(f"Large page (>{threshold} bytes) — streaming extraction: {url}")
+        if self.schema is not None:
+            logger.warning(f"Extraction schema skipped for streamed page (no document tree): {url}")
+        exhausted = []
+
+        def remaining():
+            yield bytes(body)
+            for chunk in chunks:
+                yield chunk
+            exhausted.append(True)
+
+        def hashed(source):
+            for chunk in source:
+                digest.update(chunk)
+                yield chunk
+
+        source = remaining() if digest is None else hashed(remaining())
+        content = stream_extract(source, url, encoding=encoding, profile=profile)
+        # A head-only profile stops reading early; a partial hash is no fingerprint
+        body_hash = None
+        if digest is not None and exhausted:
+            body_hash = digest.hexdigest()
+            if self.render_cache is not None:
+                self._remember_fingerprint(url, fingerprint_response(response, digest=digest))
+        return content, self._record_content(url, body_hash, content, profile)
+
+    def _record_content(self, url, body_hash, content, profile=None):
+        """Index a parsed page for duplicate detection; returns its near-duplicate match."""
+        if self.dedup is None:
+            return None
+        return self.dedup.add(url, body_hash, content, profile)
+
+    def _remember_fingerprint(self, url, fingerprint):
+        with self._fingerprints_lock:
+            self._fingerprints[url] = fingerprint
+            self._fingerprints.move_to_end(url)
+            while len(self._fingerprints) > _MAX_PENDING_FINGERPRINTS:
+                self._fingerprints.popitem(last=False)
+
+    def scrape_dynamic(self, url, driver, extraction=None):
         """
         Scrape using Selenium Driver.
+        extraction="browser" (default, Config.DYNAMIC_EXTRACTION) builds the
+        ExtractedContent inside the page with one injected script and only
+        ships that JSON back; extraction="html" transfers driver.page_source
+        and parses it with parse_html.
         """
         if not driver:
             error_logger.error("Selenium driver not provided for dynamic scrape.")
             return None, []
-            
+
+        fingerprint = self._render_fingerprint(url)
+        cached = self._cached_render(url, fingerprint)
+        if cached:
+            return cached
+
+        content, links = self._render_page(url, driver, extraction)
+        self._store_render(url, fingerprint, content, links)
+        return content, links
+
+    def _render_page(self, url, driver, extraction=None):
+        """Navigate the current tab to url and extract it."""
         try:
             logger.info(f"Scraping dynamic: {url}")
             logger.info("Navigating to URL...")
             driver.get(url)
             logger.info("Navigation complete. Waiting for body element...")
-            
-            # Wait for body
-            WebDriverWait(driver, Config.PAGE_LOAD_TIMEOUT).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            logger.info("Body element found. Performing auto-scroll...")
-            
-            # Auto-scroll to trigger lazy loading
-            self.auto_scroll(driver)
-            logger.info("Auto-scroll complete. Extracting page source...")
-            
-            html = driver.page_source
-            content = parse_html(html, url)
-            logger.info(f"Content extracted successfully from {url}")
-            return asdict(content), content.links
+            return self._extract_loaded_page(url, driver, extraction)
             
         except TimeoutException:
             logger.warning(f"Timeout waiting for page load: {url}")
             error_logger.error(f"Timeout waiting for page load: {url}")
             return None, []
+        except JavascriptException as e:
+            logger.warning(f"Script error on {url}: {e}")
+            error_logger.error(f"Script error on {url}: {e}")
+            return None, []
+        except WebDriverException as e:
+            # The browser itself failed: raise so the pool checkout that lent
+            # this driver sees it and replaces it instead of handing it out again.
+            logger.warning(f"WebDriver error on {url}: {e}")
+            error_logger.error(f"WebDriver error on {url}: {e}")
+            raise
         except Exception as e:
             logger.warning(f"Selenium error on {url}: {e}")
             error_logger.exception(f"Selenium error on {url}: {e}")
             return None, []
 
-    def auto_scroll(self, driver):
+    def scrape_dynamic_many(self, urls, driver, tabs=None, extraction=None):
+        """
+        Render several URLs in parallel tabs of one browser.
+
+        Up to ``tabs`` pages load concurrently (opened with window.open, which
+        does not block WebDriver); tabs are harvested in FIFO order while the
+        others keep loading in the background. Returns a list of
+        (content, links) aligned with urls.
+        """
+        tabs = max(1, tabs or Config.RENDER_TABS)
+        if not driver:
+            error_logger.error("Selenium driver not provided for dynamic scrape.")
+            return [(None, []) for _ in urls]
+
+        fingerprints = [self._render_fingerprint(url) for url in urls]
+        results = [self._cached_render(url, fp) or (None, []) for url, fp in zip(urls, fingerprints)]
+        misses = [i for i, (content, _) in enumerate(results) if not content]
+
+        if tabs == 1 or len(misses) == 1:
+            rendered = [self._render_page(urls[i], driver, extraction) for i in misses]
+        else:
+            rendered = self._render_tabs([urls[i] for i in misses], driver, tabs, extraction)
+        for i, (content, links) in zip(misses, rendered):
+            results[i] = (content, links)
+            self._store_render(urls[i], fingerprints[i], content, links)
+        return results
+
+    def _render_tabs(self, urls, driver, tabs, extraction=None):
+        """Load urls in up to ``tabs`` concurrent tabs; results align with urls."""
+        results = [(None, [])] * len(urls)
+        pending = deque(enumerate(urls))
+        open_tabs = {}  # window handle -> (index, url)
+        main = driver.current_window_handle
+
+        try:
+            while pending or open_tabs:
+                while pending and len(open_tabs) < tabs:
+                    index, url = pending.popleft()
+                    before = set(driver.window_handles)
+                    driver.execute_script("window.open('about:blank', '_blank');")
+                    opened = set(driver.window_handles) - before
+                    if not opened:
+                        error_logger.error(f"Could not open a tab for {url}")
+                        continue
+                    logger.info(f"Scraping dynamic (tab): {url}")
+                    handle = opened.pop()
+                    open_tabs[handle] = (index, url)
+                    # The new tab is its own DevTools target: block resources
+                    # there before it navigates. Assigning location does not
+                    # block, so the tab loads while the others are opened.
+                    driver.switch_to.window(handle)
+                    apply_tab_resource_policy(driver)
+                    driver.execute_script("window.location.href = arguments[0];", url)
+                    driver.switch_to.window(main)
+
+                handle = next(iter(open_tabs))
+                index, url = open_tabs.pop(handle)
+                try:
+                    driver.switch_to.window(handle)
+                    results[index] = self._extract_loaded_page(url, driver, extraction)
+                except TimeoutException:
+                    error_logger.error(f"Timeout waiting for page load: {url}")
+                except JavascriptException as e:
+                    error_logger.error(f"Script error on {url}: {e}")
+                except WebDriverException as e:
+                    error_logger.error(f"WebDriver error on {url}: {e}")
+                    raise
+                except Exception as e:
+                    error_logger.exception(f"Selenium error on {url}: {e}")
+                finally:
+                    try:
+                        driver.close()
+                        driver.switch_to.window(main)
+                    except Exception as e:
+                        error_logger.error(f"Could not close tab for {url}: {e}")
+        finally:
+            # Leave only the main tab behind so the driver can go back to its pool.
+            for handle in open_tabs:
+                try:
+                    driver.switch_to.window(handle)
+                    driver.close()
+                except Exception:
+                    pass
+            try:
+                driver.switch_to.window(main)
+            except Exception:
+                pass
+        return results
+
+    def fingerprint(self, url):
+        """
+        Cheap fingerprint of url's static response for render-cache keys,
+        from the validators of a HEAD request only. None when the server
+        sends none, so the render skips the cache.
+        """
+        try:
+            head = self.session.head(url, timeout=Config.PAGE_LOAD_TIMEOUT, allow_redirects=True)
+            if head.status_code == 200:
+                return fingerprint_headers(head.headers)
+        except Exception as e:
+            logger.warning(f"Could not fingerprint {url}: {e}")
+        return None
+
+    def _render_fingerprint(self, url):
+        """Fingerprint from the preceding static fetch, or from a HEAD request."""
+        if self.render_cache is None:
+            return None
+        with self._fingerprints_lock:
+            fingerprint = self._fingerprints.pop(url, None)
+        fingerprint = fingerprint or self.fingerprint(url)
+        if fingerprint and self.schema is not None:
+            # A render stored under another schema has other schema_fields
+            fingerprint = f"{fingerprint}|schema:{self.schema.key}"
+        return fingerprint
+
+    def _cached_render(self, url, fingerprint):
+        if self.render_cache is None or not fingerprint:
+            return None
+        cached = self.render_cache.get(url, fingerprint)
+        if cached:
+            logger.info(f"Render cache hit (static shell unchanged): {url}")
+            content, links = cached
+            return ExtractedContent.from_dict(content), links
+        return None
+
+    def _store_render(self, url, fingerprint, content, links):
+        if self.render_cache is not None and fingerprint and content:
+            self.render_cache.put(url, fingerprint, content.to_dict(), links)
+
+    def _extract_loaded_page(self, url, driver, extraction=None):
+        """Wait for the current tab's body, scroll, and extract its content."""
+        extraction = extraction or Config.DYNAMIC_EXTRACTION
+
+        # Wait for body
+        wait = WebDriverWait(driver, Config.PAGE_LOAD_TIMEOUT)
+        wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        # driver.get returns after the load event, but a tab opened by
+        # _render_tabs may still be loading: wait for it the same way.
+        wait.until(_document_complete)
+        logger.info("Body element found. Performing auto-scroll...")
+        
+        # Auto-scroll to trigger lazy loading
+        self.auto_scroll(driver)
+
+        if extraction == "html":
+            logger.info("Auto-scroll complete. Extracting page source...")
+            html = driver.page_source
+            content = parse_html(html, url, schema=self.schema)
+        else:
+            logger.info("Auto-scroll complete. Extracting content in browser...")
+            content = self.extract_in_browser(driver)
+            if self.schema is not None:
+                # Schema selectors run on the rendered DOM's serialization
+                content.schema_fields = self.schema.extract(driver.page_source, url)
+
+        if Config.CAPTURE_XHR:
+            xhr = capture_json_responses(driver)
+            if xhr:
+                content.structured_data = {**(content.structured_data or {}), "xhr": xhr}
+                content.links = list(dict.fromkeys(content.links + links_from_payload(xhr, url)))
+        logger.info(f"Content extracted successfully from {url}")
+        return content, content.links
+
+    def extract_in_browser(self, driver):
+        """
+        Run _EXTRACT_JS in the page and build ExtractedContent from its JSON.
+        Links and image srcs come back already resolved by the browser.
+        """
+        data = driver.execute_script(_EXTRACT_JS, TEXT_CONTENT_LIMIT)
+        return ExtractedContent(
+            title=data.get("title") or "",
+            meta_description=data.get("meta_description") or "",
+            headings=data.get("headings") or {},
+            paragraphs=data.get("paragraphs") or [],
+            links=data.get("links") or [],
+            images=data.get("images") or [],
+            forms=data.get("forms") or [],
+            text_content=data.get("text_content") or "",
+            canonical=data.get("canonical"),
+            meta_robots=data.get("meta_robots"),
+        )
+
+    def auto_scroll(self, driver, max_steps=None, max_seconds=None):
         """
         Scroll down the page to trigger lazy loading.
+
+        Each step scrolls to the bottom and waits in the browser until DOM
+        mutations and resource loads have been quiet for SCROLL_IDLE_MS (or
+        the step times out), instead of sleeping a fixed second. Stops as soon
+        as the page stops growing, and after max_steps / max_seconds so
+        infinite-scroll feeds terminate. Returns the number of steps taken.
         """
-        last_height = driver.execute_script("return document.body.scrollHeight")
-        while True:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1) # Wait to load
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
+        max_steps = max_steps if max_steps is not None else Config.SCROLL_MAX_STEPS
+        max_seconds = max_seconds if max_seconds is not None else Config.SCROLL_MAX_SECONDS
+        deadline = time.monotonic() + max_seconds
+
+        steps = 0
+        while steps < max_steps:
+            remaining_ms = int((deadline - time.monotonic()) * 1000)
+            if remaining_ms <= 0:
+                logger.info(f"Auto-scroll stopped after {max_seconds}s time cap")
+                break
+            try:
+                result = driver.execute_async_script(
+                    _SCROLL_STEP_JS,
+                    Config.SCROLL_IDLE_MS,
+                    min(Config.SCROLL_STEP_TIMEOUT_MS, remaining_ms),
+                )
+            except Exception as e:
+                logger.warning(f"Auto-scroll aborted: {e}")
                 break
-            last_height = new_height
+            steps += 1
+            if not result or not result.get("grew"):
+                break
+        else:
+            logger.info(f"Auto-scroll stopped after {max_steps} steps")
+        return steps
+
+
+# Scrolls to the bottom, then resolves once the page has been quiet (no DOM
+# mutations, no new resource loads) for idleMs, or after timeoutMs.
+_SCROLL_STEP_JS = """
+const idleMs = arguments[0], timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+const before = document.body.scrollHeight;
+let last = start;
+const touch = () => { last = performance.now(); };
+const mo = new MutationObserver(touch);
+mo.observe(document.body, {childList: true, subtree: true, attributes: true});
+let po = null;
+try {
+    po = new PerformanceObserver(touch);
+    po.observe({entryTypes: ['resource']});
+} catch (e) {}
+window.scrollTo(0, document.body.scrollHeight);
+(function check() {
+    const now = performance.now();
+    if (now - last >= idleMs || now - start >= timeoutMs) {
+        mo.disconnect();
+        if (po) po.disconnect();
+        const height = document.body.scrollHeight;
+        done({height: height, grew: height > before});
+    } else {
+        setTimeout(check, 50);
+    }
+})();
+"""
+
+
+# Mirrors parser.parse_html in the browser. Element text follows BeautifulSoup's
+# get_text(strip=True): every text node stripped, empties dropped, then joined.
+# <noscript> is skipped because with JS on its content is one raw-markup string.
+_EXTRACT_JS = """
+const textLimit = arguments[0];
+const SKIP = new Set(['SCRIPT', 'STYLE', 'TEMPLATE', 'NOSCRIPT']);
+function texts(root, limit) {
+    const out = [];
+    let size = 0;
+    const walker = document.createTreeWalker(root, NodeFilter.SHOW_TEXT, {
+        acceptNode(node) {
+            for (let el = node.parentElement; el && el !== root.parentElement; el = el.parentElement) {
+                if (SKIP.has(el.tagName)) return NodeFilter.FILTER_REJECT;
+            }
+            return NodeFilter.FILTER_ACCEPT;
+        }
+    });
+    while (walker.nextNode()) {
+        const t = walker.currentNode.nodeValue.trim();
+        if (!t) continue;
+        out.push(t);
+        size += t.length + 1;
+        if (limit && size > limit) break;
+    }
+    return out;
+}
+const attr = (el, name) => el.getAttribute(name);
+const title = document.querySelector('title');
+const meta = document.querySelector('meta[name="description"]');
+const robots = Array.from(document.querySelectorAll('meta[name]')).find(m => m.name.toLowerCase() === 'robots');
+const canonical = Array.from(document.querySelectorAll('link[rel]')).find(l => l.relList.contains('canonical'));
+const headings = {};
+for (let level = 1; level <= 6; level++) {
+    headings['h' + level] = Array.from(document.querySelectorAll('h' + level), h => texts(h).join(''));
+}
+return {
+    title: title ? title.textContent.trim() : '',
+    meta_description: meta ? (attr(meta, 'content') || '').trim() : '',
+    headings: headings,
+    paragraphs: Array.from(document.querySelectorAll('p'), p => texts(p).join('')).filter(Boolean),
+    links: Array.from(new Set(Array.from(document.querySelectorAll('a[href]'), a => a.href))),
+    images: Array.from(document.querySelectorAll('img[src]'), img => ({src: img.src, alt: attr(img, 'alt') || ''})),
+    forms: Array.from(document.forms, f => ({
+        action: attr(f, 'action') || '',
+        method: attr(f, 'method') || 'get',
+        inputs: Array.from(f.querySelectorAll('input'), i => ({
+            name: attr(i, 'name'), type: attr(i, 'type'), placeholder: attr(i, 'placeholder')
+        }))
+    })),
+    text_content: texts(document.documentElement, textLimit).join('\\n').slice(0, textLimit),
+    canonical: canonical ? ((attr(canonical, 'href') || '').trim() || null) : null,
+    meta_robots: robots ? (attr(robots, 'content') || '').trim() : null,
+};
+"""
+
+
+def _document_complete(driver):
+    """WebDriverWait condition: the current tab has fired its load event."""
+    return driver.execute_script("return document.readyState") == "complete"
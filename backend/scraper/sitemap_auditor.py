@@ -23,7 +23,6 @@ from __future__ import annotations
 import dataclasses
 import json
 import logging
-import re
 import threading
 import time
 from collections import deque
@@ -33,11 +32,18 @@ from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse, urlunparse
 
 import requests
-from bs4 import BeautifulSoup
 
+from .config import Config
+from .hydration import has_hydration_payload
+from .page_analysis import RENDER_CSR, analyze_page
+from .parser import PROFILE_CRAWL, PROFILE_SEO_HEAD, parse_html
+from .render_strategy import FETCH_RENDER, RenderStrategyCache
 from .scraper import Scraper
 from .sitemap_parser import SitemapEntry, discover_sitemap_urls, parse_sitemap
-from .utils import get_random_user_agent, is_internal_url
+from .charset import decode_html
+from .links import LinkClassifier
+from .logger import bind_job, current_job
+from .utils import get_random_user_agent
 
 logger = logging.getLogger("auditor")
 
@@ -106,6 +112,40 @@ def _is_non_page_url(url: str) -> bool:
     return any(path.endswith(ext) for ext in NON_PAGE_EXTENSIONS)
 
 
+# ── Response helpers ──────────────────────────────────────────────────────────
+
+def _is_html_response(headers) -> bool:
+    """True when the Content-Type is HTML-ish, or missing (assume HTML)."""
+    ctype = (headers.get("Content-Type") or "").lower()
+    return not ctype or "html" in ctype
+
+
+def _header_noindex(headers) -> bool:
+    return "noindex" in (headers.get("X-Robots-Tag") or "").lower()
+
+
+def _range_covers_body(resp: requests.Response, received: int) -> bool:
+    """For a 206 response, True if the requested range was the whole body."""
+    content_range = resp.headers.get("Content-Range") or ""
+    total = content_range.rsplit("/", 1)[-1]
+    return total.isdigit() and int(total) <= received
+
+
+# PROFILE_SEO_HEAD without the cut at </head>: some CMSs emit the robots meta
+# or rel=canonical inside <body>, and a full-body audit must still see them
+_SEO_DOCUMENT = dataclasses.replace(PROFILE_SEO_HEAD, name="seo_document", head_only=False)
+
+
+def _parse_head_meta(html: str, head_only: bool = False) -> Tuple[bool, Optional[str]]:
+    """
+    Return (meta_noindex, canonical_href) from an HTML document, searched
+    whole; head_only=True reads only up to </head> (a ranged prefix).
+    """
+    head = parse_html(html, "", profile=PROFILE_SEO_HEAD if head_only else _SEO_DOCUMENT)
+    noindex = "noindex" in (head.meta_robots or "").lower()
+    return noindex, head.canonical
+
+
 # ── Data classes ──────────────────────────────────────────────────────────────
 
 @dataclass
@@ -262,6 +302,10 @@ class AuditConfig:
     delay: float = 0.5
     strip_query: bool = False
     js_fallback: bool = False
+    head_probe: bool = True         # HEAD / ranged GET before any full GET
+    probe_bytes: int = 16384        # prefix size read when inspecting <head>
+    block_resources: Optional[List[str]] = None   # JS fallback: resource types to block (None = config default)
+    block_trackers: Optional[bool] = None         # JS fallback: block ad/analytics hosts (None = config default)
 
 
 # ── Auditor ───────────────────────────────────────────────────────────────────
@@ -297,42 +341,10 @@ class SitemapAuditor:
 
         try:
             time.sleep(self.config.delay)
-            resp = self._session.get(url, timeout=30, allow_redirects=True)
-            final_url = resp.url
-            status_code = resp.status_code
-            is_redirect = len(resp.history) > 0
-            noindex = False
-            canonical: Optional[str] = None
-            html: Optional[str] = None
-
-            if status_code == 200:
-                xrt = resp.headers.get("X-Robots-Tag", "")
-                if "noindex" in xrt.lower():
-                    noindex = True
-
-                soup = BeautifulSoup(resp.text, "html.parser")
-                meta_robots = soup.find(
-                    "meta", attrs={"name": lambda x: x and x.lower() == "robots"}
-                )
-                if meta_robots and "noindex" in meta_robots.get("content", "").lower():
-                    noindex = True
-
-                canon = soup.find("link", rel="canonical")
-                if canon:
-                    canonical = (canon.get("href") or "").strip() or None
-
-                if store_html:
-                    html = resp.text
-
-            info = PageInfo(
-                url=url,
-                final_url=final_url,
-                status_code=status_code,
-                is_redirect=is_redirect,
-                noindex=noindex,
-                canonical=canonical,
-                html=html,
-            )
+            if store_html or not self.config.head_probe:
+                info = self._fetch_full(url, store_html=store_html)
+            else:
+                info = self._probe_page(url)
         except Exception as exc:
             info = PageInfo(
                 url=url,
@@ -349,80 +361,132 @@ class SitemapAuditor:
 
         return info
 
-    # ── Intelligence detection ────────────────────────────────────────────────
-
-    def _detect_framework(self, html: str) -> Optional[str]:
-        """Detect JS framework from homepage HTML markers."""
-        soup = BeautifulSoup(html, "html.parser")
-        scripts = [s.get("src", "") for s in soup.find_all("script", src=True)]
-
-        # Next.js
-        if soup.find("script", id="__NEXT_DATA__"):
-            return "Next.js"
-        if any("/_next/" in s for s in scripts):
-            return "Next.js"
-
-        # Nuxt.js
-        if soup.find("div", id="__nuxt") or soup.find("div", id="__layout"):
-            return "Nuxt.js"
-        if any("/_nuxt/" in s for s in scripts):
-            return "Nuxt.js"
-
-        # Gatsby
-        if soup.find(id="gatsby-focus-wrapper") or any("gatsby" in s for s in scripts):
-            return "Gatsby (React)"
-
-        # React + Vite (assets/index-<hash>.js)
-        root = soup.find(id="root")
-        if root and any(re.search(r"assets/index-\w+\.js", s) for s in scripts):
-            return "React (Vite)"
-
-        # React + CRA
-        if root and any("static/js/" in s for s in scripts):
-            return "React (CRA)"
-
-        # Generic React
-        if root:
-            return "React"
-
-        # Vue
-        app_div = soup.find(id="app")
-        if app_div and any("vue" in s.lower() for s in scripts):
-            return "Vue.js"
-        if app_div:
-            return "Vue.js"
-
-        # Angular
-        if soup.find("app-root") or soup.find(attrs={"ng-version": True}):
-            return "Angular"
-
-        # SvelteKit
-        if any("_app/immutable" in s for s in scripts):
-            return "SvelteKit"
-
-        return None
+    def _fetch_full(self, url: str, store_html: bool = False) -> PageInfo:
+        """Plain GET of the whole document."""
+        resp = self._session.get(url, timeout=30, allow_redirects=True)
+        noindex = False
+        canonical: Optional[str] = None
+        html: Optional[str] = None
+
+        if resp.status_code == 200:
+            noindex = _header_noindex(resp.headers)
+            text = decode_html(resp.content, resp.headers.get("Content-Type"))
+            meta_noindex, canonical = _parse_head_meta(text)
+            noindex = noindex or meta_noindex
+            if store_html:
+                html = text
+
+        return PageInfo(
+            url=url,
+            final_url=resp.url,
+            status_code=resp.status_code,
+            is_redirect=len(resp.history) > 0,
+            noindex=noindex,
+            canonical=canonical,
+            html=html,
+        )
 
-    def _detect_noscript_links(self, html: str) -> Tuple[bool, int]:
+    def _probe_page(self, url: str) -> PageInfo:
         """
-        Returns (has_noscript_fallback, noscript_link_count).
-        Counts links that appear ONLY inside <noscript> blocks.
+        Cheapest request sequence that still answers every audit question.
+
+        HEAD gives status, redirect target and X-Robots-Tag.  Only a 200 HTML
+        page needs its <head> inspected, and that is read from a ranged GET of
+        the first ``probe_bytes``; a full GET happens only when </head> is not
+        inside that prefix.  Servers that reject or mis-answer HEAD (405, 501,
+        any error status) are re-checked with the ranged GET directly.
         """
-        soup = BeautifulSoup(html, "html.parser")
+        try:
+            head = self._session.head(url, timeout=30, allow_redirects=True)
+        except requests.RequestException:
+            head = None
+
+        if head is None or head.status_code >= 400:
+            return self._fetch_prefix(url)
+
+        is_redirect = len(head.history) > 0
+        if head.status_code != 200:
+            return PageInfo(
+                url=url,
+                final_url=head.url,
+                status_code=head.status_code,
+                is_redirect=is_redirect,
+                noindex=False,
+                canonical=None,
+            )
+
+        if not _is_html_response(head.headers):
+            return PageInfo(
+                url=url,
+                final_url=head.url,
+                status_code=200,
+                is_redirect=is_redirect,
+                noindex=_header_noindex(head.headers),
+                canonical=None,
+            )
+
+        info = self._fetch_prefix(head.url)
+        info.url = url
+        info.is_redirect = info.is_redirect or is_redirect
+        return info
+
+    def _fetch_prefix(self, url: str) -> PageInfo:
+        """Ranged, streamed GET that stops reading once </head> has been seen."""
+        limit = self.config.probe_bytes
+        resp = self._session.get(
+            url,
+            timeout=30,
+            allow_redirects=True,
+            stream=True,
+            headers={"Range": f"bytes=0-{limit - 1}"},
+        )
+        try:
+            status_code = resp.status_code
+            if status_code == 416:
+                # Range rejected (e.g. empty body) — nothing to save by probing.
+                return self._fetch_full(url)
+            if status_code == 206:
+                status_code = 200
 
-        # All links in document
-        all_links = {a.get("href", "") for a in soup.find_all("a", href=True)}
+            info = PageInfo(
+                url=url,
+                final_url=resp.url,
+                status_code=status_code,
+                is_redirect=len(resp.history) > 0,
+                noindex=False,
+                canonical=None,
+            )
+            if status_code != 200:
+                return info
+
+            info.noindex = _header_noindex(resp.headers)
+            if not _is_html_response(resp.headers):
+                return info
+
+            prefix = bytearray()
+            exhausted = True
+            for chunk in resp.iter_content(chunk_size=4096):
+                prefix.extend(chunk)
+                if b"</head" in prefix.lower() or len(prefix) >= limit:
+                    exhausted = False
+                    break
+            head_seen = b"</head" in prefix.lower()
+        finally:
+            resp.close()
 
-        # Links inside <noscript> only
-        noscript_links: Set[str] = set()
-        for ns in soup.find_all("noscript"):
-            for a in ns.find_all("a", href=True):
-                noscript_links.add(a.get("href", ""))
+        if not head_seen and not exhausted and not _range_covers_body(resp, len(prefix)):
+            return self._fetch_full(url)
 
-        # Links that appear ONLY in noscript (not in the regular DOM)
-        exclusive_noscript = noscript_links - (all_links - noscript_links)
+        # An exhausted stream is the whole document: search it whole, like _fetch_full
+        meta_noindex, canonical = _parse_head_meta(
+            decode_html(prefix, resp.headers.get("Content-Type"), final=exhausted),
+            head_only=not exhausted,
+        )
+        info.noindex = info.noindex or meta_noindex
+        info.canonical = canonical
+        return info
 
-        has_fallback = len(noscript_links) > 0
-        return has_fallback, len(noscript_links)
+    # ── Intelligence detection ────────────────────────────────────────────────
 
     def _detect_site_intelligence(self) -> SiteIntelligence:
         """Fetch homepage and analyse it for framework, SPA, noscript patterns."""
@@ -438,32 +502,20 @@ class SitemapAuditor:
                 homepage_html_available=False,
             )
 
-        framework = self._detect_framework(info.html)
-        has_noscript, noscript_count = self._detect_noscript_links(info.html)
-
-        # A site is considered SPA if a JS framework is detected AND the root div
-        # has no meaningful child content in raw HTML.
-        spa_detected = False
-        if framework:
-            soup = BeautifulSoup(info.html, "html.parser")
-            root = soup.find(id="root") or soup.find(id="app") or soup.find("app-root")
-            if root:
-                # Raw HTML text content inside the root div (excluding noscript)
-                for ns in (root.find_all("noscript") if root else []):
-                    ns.decompose()
-                raw_text = (root.get_text(strip=True) if root else "")
-                spa_detected = len(raw_text) < 200
+        # One parse feeds framework, SPA-root and noscript detection.
+        analysis = analyze_page(info.html)
 
         logger.info(
-            f"[intelligence] framework={framework} spa={spa_detected} "
-            f"noscript_fallback={has_noscript} noscript_links={noscript_count}"
+            f"[intelligence] framework={analysis.framework} spa={analysis.spa_detected} "
+            f"noscript_fallback={analysis.has_noscript_fallback} "
+            f"noscript_links={analysis.noscript_link_count}"
         )
 
         return SiteIntelligence(
-            framework=framework,
-            spa_detected=spa_detected,
-            has_noscript_fallback=has_noscript,
-            noscript_link_count=noscript_count,
+            framework=analysis.framework,
+            spa_detected=analysis.spa_detected,
+            has_noscript_fallback=analysis.has_noscript_fallback,
+            noscript_link_count=analysis.noscript_link_count,
             homepage_html_available=True,
         )
 
@@ -609,6 +661,11 @@ class SitemapAuditor:
     # ── BFS crawl ─────────────────────────────────────────────────────────────
 
     def _is_spa_content(self, content: dict) -> bool:
+        # Links were already recovered from an embedded hydration payload.
+        if Config.PREFER_HYDRATION_DATA and has_hydration_payload(content):
+            return False
+        if content.get("rendering_mode") == RENDER_CSR:
+            return True
         text = content.get("text_content", "").lower()
         indicators = [
             "you need to enable javascript",
@@ -623,21 +680,45 @@ class SitemapAuditor:
         total_h = sum(len(v) for v in headings.values()) if headings else 0
         return len(paragraphs) == 0 and total_h == 0 and len(text.strip()) < 100
 
-    def _crawl_bfs(self) -> Set[str]:
+    def _crawl_bfs(self, spa_detected: bool = False) -> Set[str]:
         scraper = Scraper(session=self._session)
         visited_norm: Set[str] = set()
         queue: deque = deque([(self.config.root_url, 0)])
 
-        driver = None
+        strategy = RenderStrategyCache()
+        strategy.seed(self.config.root_url, spa_detected)
+        site_links = LinkClassifier(self.config.root_url)
+
+        drivers = None
         spa_warned = False
 
         if self.config.js_fallback:
+            # The browser itself starts on the first page that needs rendering.
+            from .driver_manager import DriverPool, ResourcePolicy
+            policy = ResourcePolicy.from_request(
+                self.config.block_resources, block_trackers=self.config.block_trackers
+            )
+            drivers = DriverPool(size=1, resource_policy=policy)
+
+        def render(url: str):
+            # Pool checkout replaces a crashed browser instead of failing every later page.
+            nonlocal drivers
             try:
-                from .driver_manager import create_driver
-                driver = create_driver()
-                logger.info("JS fallback Selenium driver initialised")
+                pooled = drivers.checkout()
             except Exception as exc:
                 logger.warning(f"JS fallback driver unavailable: {exc}")
+                drivers.close()
+                drivers = None
+                return None, []
+            healthy = True
+            try:
+                return scraper.scrape_dynamic(url, pooled.driver)
+            except Exception as exc:
+                healthy = False
+                logger.warning(f"JS fallback render failed for {url}: {exc}")
+                return None, []
+            finally:
+                drivers.checkin(pooled, healthy=healthy)
 
         try:
             while queue and len(visited_norm) < self.config.max_pages:
@@ -653,29 +734,39 @@ class SitemapAuditor:
                 visited_norm.add(norm)
                 logger.info(f"[crawl] {current_url}  depth={depth}")
 
-                content, links = scraper.scrape_url(current_url)
-
-                if content and self._is_spa_content(content):
-                    if driver:
-                        content, links = scraper.scrape_dynamic(current_url, driver)
-                    elif not spa_warned:
-                        logger.warning(
-                            "SPA/JS-rendered navigation detected. "
-                            "Set js_fallback=True for full coverage."
-                        )
-                        spa_warned = True
-
-                if not content and driver:
-                    content, links = scraper.scrape_dynamic(current_url, driver)
+                # Templates learned as JS-rendered go straight to the browser.
+                if drivers and strategy.decide(current_url) == FETCH_RENDER:
+                    content, links = render(current_url)
+                    if not content:
+                        content, links = scraper.scrape_url(current_url, profile=PROFILE_CRAWL)
+                else:
+                    # Only links and the SPA heuristics' fields are needed here
+                    content, links = scraper.scrape_url(current_url, profile=PROFILE_CRAWL)
+
+                    if content and self._is_spa_content(content):
+                        strategy.record(current_url, True)
+                        if drivers:
+                            content, links = render(current_url)
+                        elif not spa_warned:
+                            logger.warning(
+                                "SPA/JS-rendered navigation detected. "
+                                "Set js_fallback=True for full coverage."
+                            )
+                            spa_warned = True
+                    elif content:
+                        strategy.record(current_url, False)
+
+                    if not content and drivers:
+                        content, links = render(current_url)
 
                 for link in links:
-                    if is_internal_url(self.config.root_url, link):
+                    if site_links.is_internal(link):
                         norm_link = self._norm(link)
                         if norm_link and norm_link not in visited_norm:
                             queue.append((link, depth + 1))
         finally:
-            if driver:
-                driver.quit()
+            if drivers:
+                drivers.close()
 
         return visited_norm
 
@@ -762,7 +853,7 @@ class SitemapAuditor:
             )
 
         logger.info(f"Crawling up to {self.config.max_pages} pages…")
-        crawled_norm = self._crawl_bfs()
+        crawled_norm = self._crawl_bfs(spa_detected=site_intel.spa_detected)
         logger.info(f"Crawled {len(crawled_norm)} URLs")
 
         if self._stop:
@@ -772,7 +863,9 @@ class SitemapAuditor:
         urls_to_check = list(sitemap_raw_by_norm.values())
         logger.info(f"Checking {len(urls_to_check)} sitemap URLs for SEO metadata…")
 
-        with ThreadPoolExecutor(max_workers=self.config.max_workers) as pool:
+        with ThreadPoolExecutor(
+            max_workers=self.config.max_workers, initializer=bind_job, initargs=(current_job(),)
+        ) as pool:
             futures = {pool.submit(self._fetch_page_info, u): u for u in urls_to_check}
             for fut in as_completed(futures):
                 if self._stop:
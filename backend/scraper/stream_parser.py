@@ -0,0 +1,395 @@
+"""
+Bounded-memory streaming extraction for very large pages.
+
+parse_html builds the whole DOM before extracting anything, so a multi-MB
+listing page costs a tree many times its size only for most of its text to be
+truncated to TEXT_CONTENT_LIMIT.  StreamingExtractor runs on Python's
+incremental html.parser tokenizer instead: the body is fed chunk by chunk
+straight from the response, no tree is kept, and every output is capped —
+page text stops accumulating at the limit, links and images stop at their
+maximums, and each heading/paragraph keeps at most TEXT_CONTENT_LIMIT
+characters.  Memory use is therefore independent of page size.
+
+Output fields match parse_html for ordinary pages (same ExtractedContent,
+same text rules: script/style/template strings and comments are not text).
+On pages that hit a cap the capped lists are simply shorter.
+"""
+
+import codecs
+from html.parser import HTMLParser
+from typing import Iterable, Optional
+
+from .config import Config
+from .hydration import StructuredDataCollector, hydration_links
+from .page_analysis import DEFAULT_ANALYZER, _INVISIBLE_TAGS
+from .parser import (
+    TEXT_CONTENT_LIMIT,
+    ExtractedContent,
+    _HEADING_TAGS,
+    _build_content,
+    _is_canonical,
+    get_profile,
+)
+from .links import LinkResolver
+
+# Elements that never have an end tag and are never pushed on the open stack.
+_VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+# Open-element stack bound; deeper (usually unclosed) elements are not tracked.
+_MAX_DEPTH = 1024
+
+# Inline <script> bodies larger than this are not decoded as JSON.
+_MAX_SCRIPT_CHARS = 5_000_000
+
+# Characters of one uninterrupted text run kept before the rest is dropped.
+_MAX_RUN_CHARS = 65536
+
+
+class _TextCounter:
+    """Visible-text length of an element that may be an SPA root."""
+
+    __slots__ = ("length",)
+
+    def __init__(self):
+        self.length = 0
+
+
+class _CappedText:
+    """Strings of an open heading/paragraph, up to limit characters."""
+
+    __slots__ = ("parts", "size", "limit")
+
+    def __init__(self, limit):
+        self.parts = []
+        self.size = 0
+        self.limit = limit
+
+    def add(self, text):
+        if self.size < self.limit:
+            self.parts.append(text)
+            self.size += len(text)
+
+    def value(self):
+        return "".join(self.parts)[:self.limit]
+
+
+class StreamingExtractor(HTMLParser):
+    """Incremental ExtractedContent builder; feed() text, then close()."""
+
+    def __init__(
+        self,
+        base_url: str,
+        profile=None,
+        text_limit: int = TEXT_CONTENT_LIMIT,
+        max_links: Optional[int] = None,
+        max_images: Optional[int] = None,
+        max_items: Optional[int] = None,
+    ):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self._resolve = LinkResolver(base_url).resolve
+        self.profile = get_profile(profile)
+        self.text_limit = text_limit
+        self.max_links = max_links if max_links is not None else Config.STREAM_MAX_LINKS
+        self.max_images = max_images if max_images is not None else Config.STREAM_MAX_IMAGES
+        self.max_items = max_items if max_items is not None else Config.STREAM_MAX_ITEMS
+
+        want = self.profile.fields
+        self._want_headings = "headings" in want
+        self._want_paragraphs = "paragraphs" in want
+        self._want_links = "links" in want
+        self._want_images = "images" in want
+        self._want_forms = "forms" in want
+        self._want_text = "text_content" in want
+        self._want_analysis = "rendering_mode" in want or "framework" in want
+        self._want_scripts = "structured_data" in want or self._want_links
+
+        self.done = False  # head_only profiles stop at </head>
+
+        self._title = None
+        self._title_parts = None
+        self._meta_desc = None
+        self._meta_robots = None
+        self._canonical = None
+        self._headings = {f"h{level}": [] for level in range(1, 7)} if self._want_headings else {}
+        self._paragraphs = []
+        self._items = 0
+        self._links = {}
+        self._images = []
+        self._forms = []
+        self._texts = []
+        self._text_size = 0
+
+        self._signals = DEFAULT_ANALYZER.collector()
+        self._structured = StructuredDataCollector()
+
+        # Open elements: (name, closer or None)
+        self._stack = []
+        self._open_text = []
+        self._open_forms = []
+        self._counters = []
+        self._invisible = 0     # open noscript/script/style/template (SPA-root text rules)
+        self._hidden = 0        # open script/style/template (page-text rules)
+        self._noscript = 0
+        self._script = None     # (attrs, parts, size) of the open <script>
+        self._run = []          # pending text run; the tokenizer splits runs at feed() boundaries
+        self._run_size = 0
+
+    # ── tokenizer callbacks ───────────────────────────────────────────────────
+
+    def handle_starttag(self, tag, attr_list):
+        if self.done:
+            return
+        self._flush()
+        attrs = {k: ("" if v is None else v) for k, v in attr_list}
+        self._start(tag, attrs, void=tag in _VOID_TAGS)
+
+    def handle_startendtag(self, tag, attr_list):
+        if self.done:
+            return
+        self._flush()
+        attrs = {k: ("" if v is None else v) for k, v in attr_list}
+        self._start(tag, attrs, void=True)
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        self._flush()
+        if tag == "head" and self.profile.head_only:
+            self.done = True
+            return
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                while len(self._stack) > i:
+                    _, closer = self._stack.pop()
+                    if closer is not None:
+                        closer()
+                return
+
+    def handle_data(self, data):
+        if self.done:
+            return
+        if self._script is not None:
+            attrs, parts, size = self._script
+            if size <= _MAX_SCRIPT_CHARS:
+                parts.append(data)
+                self._script = (attrs, parts, size + len(data))
+            return
+        if self._run_size < _MAX_RUN_CHARS:
+            self._run.append(data)
+            self._run_size += len(data)
+
+    def handle_comment(self, data):
+        self._flush()  # a comment ends the text run, as in BeautifulSoup
+
+    def _flush(self):
+        """Process the pending text run as one text node."""
+        if not self._run:
+            return
+        data = "".join(self._run)
+        self._run = []
+        self._run_size = 0
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+        if self._hidden:
+            return
+        text = data.strip()
+        if not text:
+            return
+        if self._want_text and self._text_size < self.text_limit:
+            self._texts.append(text)
+            self._text_size += len(text) + 1
+        for collector in self._open_text:
+            collector.add(text)
+        if not self._invisible:
+            for counter in self._counters:
+                counter.length += len(text)
+
+    # ── element handling ──────────────────────────────────────────────────────
+
+    def _start(self, name, attrs, void):
+        if self.profile.head_only and name == "body":
+            self.done = True
+            return
+
+        closers = []
+        root_counter = None
+        if self._want_analysis:
+            if DEFAULT_ANALYZER.may_be_root(name, attrs):
+                root_counter = _TextCounter()
+            self._signals.visit_element(name, attrs, root_counter)
+
+        if (self._want_headings and name in _HEADING_TAGS) or (self._want_paragraphs and name == "p"):
+            if self._items < self.max_items:
+                self._items += 1
+                collector = _CappedText(TEXT_CONTENT_LIMIT)
+                target = self._paragraphs if name == "p" else self._headings[name]
+                slot = len(target)
+                target.append(None)
+                self._open_text.append(collector)
+
+                def close_text():
+                    self._open_text.pop()
+                    target[slot] = collector.value()
+                closers.append(close_text)
+        elif name == "a":
+            href = attrs.get("href")
+            if href is not None:
+                if self._want_links and len(self._links) < self.max_links:
+                    self._links.setdefault(self._resolve(href), None)
+                if self._noscript:
+                    self._signals.add_noscript_links((href,))
+        elif name == "img" and self._want_images:
+            src = attrs.get("src")
+            if src is not None and len(self._images) < self.max_images:
+                self._images.append({"src": self._resolve(src), "alt": attrs.get("alt", "")})
+        elif name == "form" and self._want_forms:
+            inputs = []
+            if len(self._forms) < self.max_items:
+                self._forms.append({
+                    "action": attrs.get("action", ""),
+                    "method": attrs.get("method", "get"),
+                    "inputs": inputs,
+                })
+            self._open_forms.append(inputs)
+            closers.append(self._open_forms.pop)
+        elif name == "input":
+            for inputs in self._open_forms:
+                if len(inputs) < self.max_items:
+                    inputs.append({
+                        "name": attrs.get("name"),
+                        "type": attrs.get("type"),
+                        "placeholder": attrs.get("placeholder"),
+                    })
+        elif name == "title":
+            if self._title is None and self._title_parts is None:
+                self._title_parts = []
+
+                def close_title():
+                    self._title = "".join(self._title_parts).strip()
+                    self._title_parts = None
+                closers.append(close_title)
+        elif name == "meta":
+            meta_name = attrs.get("name")
+            if self._meta_desc is None and meta_name == "description":
+                self._meta_desc = attrs.get("content", "").strip()
+            elif self._meta_robots is None and meta_name and meta_name.lower() == "robots":
+                self._meta_robots = attrs.get("content", "").strip()
+        elif name == "link":
+            if self._canonical is None and _is_canonical(attrs.get("rel")):
+                self._canonical = (attrs.get("href") or "").strip() or None
+        elif name == "script":
+            self._script = (attrs, [], 0)
+
+            def close_script():
+                script_attrs, parts, size = self._script
+                self._script = None
+                if self._want_scripts and size <= _MAX_SCRIPT_CHARS:
+                    self._structured.visit_script(
+                        script_attrs.get("src"), script_attrs.get("type"), script_attrs.get("id"), "".join(parts)
+                    )
+            closers.append(close_script)
+        elif name == "noscript":
+            self._noscript += 1
+
+            def close_noscript():
+                self._noscript -= 1
+            closers.append(close_noscript)
+
+        if name in ("script", "style", "template"):
+            self._hidden += 1
+
+            def close_hidden():
+                self._hidden -= 1
+            closers.append(close_hidden)
+        if name in _INVISIBLE_TAGS:
+            self._invisible += 1
+
+            def close_invisible():
+                self._invisible -= 1
+            closers.append(close_invisible)
+        if root_counter is not None:
+            self._counters.append(root_counter)
+            closers.append(self._counters.pop)
+
+        if void:
+            for closer in reversed(closers):
+                closer()
+        elif len(self._stack) < _MAX_DEPTH:
+            self._stack.append((name, _chain(closers) if closers else None))
+        else:
+            for closer in reversed(closers):
+                closer()
+
+    # ── result ────────────────────────────────────────────────────────────────
+
+    def result(self) -> ExtractedContent:
+        """Close the tokenizer and any open elements, and build the content."""
+        if not self.done:
+            self.close()
+            self._flush()
+        while self._stack:
+            _, closer = self._stack.pop()
+            if closer is not None:
+                closer()
+        if self._title is None and self._title_parts is not None:
+            self._title = "".join(self._title_parts).strip()
+
+        analysis = self._signals.finish(text_length=lambda counter: counter.length) if self._want_analysis else None
+        structured = self._structured.finish()
+        links = list(self._links)
+        if structured and self._want_links:
+            room = self.max_links - len(links)
+            if room > 0:
+                links.extend(hydration_links(structured, self.base_url)[:room])
+
+        return _build_content(
+            self.profile,
+            title=self._title or "",
+            meta_description=self._meta_desc or "",
+            headings=self._headings,
+            paragraphs=[p for p in self._paragraphs if p],
+            links=list(dict.fromkeys(links)),
+            images=self._images,
+            forms=self._forms,
+            text_content="\n".join(self._texts)[:self.text_limit],
+            analysis=analysis,
+            structured_data=structured,
+            canonical=self._canonical,
+            meta_robots=self._meta_robots,
+        )
+
+
+def _chain(closers):
+    """One closer running several in reverse order of registration."""
+    if len(closers) == 1:
+        return closers[0]
+
+    def close_all():
+        for closer in reversed(closers):
+            closer()
+    return close_all
+
+
+def stream_extract(
+    chunks: Iterable[bytes],
+    base_url: str,
+    encoding: Optional[str] = None,
+    profile=None,
+) -> ExtractedContent:
+    """
+    Extract from an iterable of byte chunks (e.g. response.iter_content())
+    without holding the document. Stops reading early for head-only profiles.
+    """
+    decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    extractor = StreamingExtractor(base_url, profile=profile)
+    for chunk in chunks:
+        extractor.feed(decoder.decode(chunk))
+        if extractor.done:
+            break
+    else:
+        extractor.feed(decoder.decode(b"", final=True))
+    return extractor.result()
@@ -1,19 +1,19 @@
 import asyncio
-import threading
 import os
-import uuid
-import json
-import logging
-import logging.handlers
+from typing import Any, Dict, List, Optional
 
 from fastapi import FastAPI, WebSocket, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
 from scraper.crawler import Crawler
-from scraper.logger import get_logger, JSONFormatter
+from scraper.driver_manager import ResourcePolicy
+from scraper.export import FORMAT_JSON, FORMATS, MEDIA_TYPES, iter_records, stream_records
+from scraper.jobs import KIND_AUDIT, KIND_CRAWL, STATE_QUEUED, Job, JobManager, QueueFullError
+from scraper.log_stream import LogBroadcaster
+from scraper.schema import compile_schema
 
 load_dotenv()
 
@@ -32,194 +32,165 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ── Scraper state ────────────────────────────────────────────────────────────
+# ── Jobs ──────────────────────────────────────────────────────────────────────
+#
+# Crawls and audits are jobs with their own IDs, run concurrently up to
+# MAX_CONCURRENT_JOBS (see scraper/jobs.py). /jobs/{job_id}/... address one
+# job; the original single-session endpoints (/status, /stop, /download, /logs
+# and /audit/...) act on the most recently submitted crawl or audit.
 
-_status_lock = threading.Lock()
+LOG_DIR = os.path.join(os.path.dirname(__file__), "logs")
 
-
-class ScraperStatus:
-    def __init__(self):
-        self.is_running = False
-        self.current_url = ""
-        self.session_id = ""
-        self.current_log_file = ""
-
-
-status = ScraperStatus()
-active_crawler = None
+# Job log lines fan out to /logs WebSocket clients from memory (scraper/log_stream.py)
+log_stream = LogBroadcaster()
+jobs = JobManager(LOG_DIR, broadcaster=log_stream)
 
 
 class ScrapeRequest(BaseModel):
     url: str
     max_depth: int = 1
+    block_resources: Optional[List[str]] = None  # e.g. ["image", "font"]; None = server default
+    block_trackers: Optional[bool] = None
+    # Site-specific fields: {"price": {"css": ".price", "type": "number"}, ...}
+    # (see scraper/schema.py); values appear as schema_fields in each record
+    extraction_schema: Optional[Dict[str, Any]] = None
 
 
-def run_crawler_bg(url: str, max_depth: int):
-    global active_crawler
+def run_crawler_bg(job: Job, max_depth: int, resource_policy=None, schema=None):
+    crawler = Crawler(base_url=job.url, max_depth=max_depth, resource_policy=resource_policy, schema=schema)
+    job.attach(crawler)
+    crawler.start()
 
-    session_id = str(uuid.uuid4())[:8]
-    log_filename = f"scrape_{session_id}.log"
-    log_dir = os.path.join(os.path.dirname(__file__), "logs")
-    os.makedirs(log_dir, exist_ok=True)
-    log_path = os.path.join(log_dir, log_filename)
-
-    handler = logging.handlers.RotatingFileHandler(
-        log_path, maxBytes=10 * 1024 * 1024, backupCount=1, encoding="utf-8"
-    )
-    handler.setFormatter(JSONFormatter())
-
-    logger_names = ["crawler", "scraper", "errors"]
-    active_handlers = []
-    for name in logger_names:
-        lg = logging.getLogger(name)
-        lg.addHandler(handler)
-        active_handlers.append((lg, handler))
-
-    with _status_lock:
-        status.is_running = True
-        status.current_url = url
-        status.session_id = session_id
-        status.current_log_file = os.path.abspath(log_path)
 
+def _submit(kind: str, url: str, target, *args) -> Job:
     try:
-        active_crawler = Crawler(base_url=url, max_depth=max_depth)
-        active_crawler.start()
-    except Exception as e:
-        print(f"Crawler error: {e}")
-    finally:
-        with _status_lock:
-            status.is_running = False
-            status.current_url = ""
-        active_crawler = None
+        return jobs.submit(kind, url, target, *args)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=f"Too many jobs waiting ({e}); try again later")
 
-        for lg, h in active_handlers:
-            lg.removeHandler(h)
-        handler.close()
+
+def _get_job(job_id: str) -> Job:
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    return job
 
 
 @app.post("/start")
 async def start_scrape(request: ScrapeRequest):
-    with _status_lock:
-        if status.is_running:
-            raise HTTPException(status_code=400, detail="Scraper is already running")
-
-    thread = threading.Thread(
-        target=run_crawler_bg, args=(request.url, request.max_depth), daemon=True
-    )
-    thread.start()
-    return {"message": "Scraper started", "url": request.url}
+    policy = ResourcePolicy.from_request(request.block_resources, block_trackers=request.block_trackers)
+    try:
+        # Selectors are compiled once here, not per page
+        schema = compile_schema(request.extraction_schema)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid extraction_schema: {e}")
+    job = _submit(KIND_CRAWL, request.url, run_crawler_bg, request.max_depth, policy, schema)
+    message = "Scraper queued" if job.state == STATE_QUEUED else "Scraper started"
+    return {"message": message, "url": request.url, "job_id": job.id, "state": job.state}
+
+
+def _crawl_status(job: Optional[Job]) -> Dict[str, Any]:
+    if job is None:
+        return {"is_running": False, "current_url": "", "logs_path": "", "job_id": "", "state": ""}
+    return {
+        "is_running": job.active,
+        "current_url": job.url if job.active else "",
+        "logs_path": job.log_path,
+        "job_id": job.id,
+        "state": job.state,
+    }
 
 
 @app.get("/status")
 async def get_status():
-    with _status_lock:
-        return {
-            "is_running": status.is_running,
-            "current_url": status.current_url,
-            "logs_path": status.current_log_file,
-        }
+    return _crawl_status(jobs.latest(KIND_CRAWL))
+
+
+def _stop(job: Optional[Job], noun: str) -> Dict[str, str]:
+    if job is not None and jobs.stop(job.id):
+        return {"message": "Stop signal sent", "job_id": job.id}
+    return {"message": f"No active {noun} to stop"}
 
 
 @app.post("/stop")
 async def stop_scrape():
-    global active_crawler
-    if active_crawler:
-        active_crawler.stop()
-        return {"message": "Stop signal sent"}
-    return {"message": "No active crawler to stop"}
+    return _stop(jobs.latest(KIND_CRAWL), "crawler")
 
 
-@app.get("/download")
-async def download_logs():
-    log_file_path = status.current_log_file
+def _iter_log_lines(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        yield from f
+
+
+def _download_crawl(job: Optional[Job], format: str = FORMAT_JSON, gzip: bool = False) -> Response:
+    """Cleaned records of a crawl, streamed from its log (see scraper/export.py)."""
+    log_file_path = job.log_path if job else ""
     if not log_file_path or not os.path.exists(log_file_path):
         raise HTTPException(status_code=404, detail="No scrape session log found")
+    if format not in FORMATS:
+        raise HTTPException(status_code=422, detail=f"format must be one of {', '.join(FORMATS)}")
+
+    filename = f"scraper_data.{format}" + (".gz" if gzip else "")
+    # A sync iterator: Starlette runs it in a worker thread, off the event loop
+    return StreamingResponse(
+        stream_records(iter_records(_iter_log_lines(log_file_path)), format, gzip=gzip),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
 
-    def clean_data(obj):
-        if isinstance(obj, dict):
-            return {k: v2 for k, v in obj.items() if (v2 := clean_data(v)) not in ["", [], {}, None]}
-        if isinstance(obj, list):
-            cleaned = [c for item in obj if (c := clean_data(item)) not in ["", [], {}, None]]
-            return cleaned
-        return None if obj == "" else obj
 
-    cleaned_logs = []
-    try:
-        with open(log_file_path, "r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    entry = json.loads(line)
-                    if entry.get("message") == "Extracted content" and "data" in entry:
-                        processed = clean_data(entry.get("data"))
-                        if processed:
-                            cleaned_logs.append(processed)
-                except json.JSONDecodeError:
-                    continue
-    except Exception as e:
-        print(f"Error processing logs: {e}")
-        raise HTTPException(status_code=500, detail="Error processing log file")
+@app.get("/download")
+async def download_logs(format: str = FORMAT_JSON, gzip: bool = False):
+    """format: json (an array) or ndjson; gzip=true compresses the stream."""
+    return _download_crawl(jobs.latest(KIND_CRAWL), format, gzip)
 
-    return Response(
-        content=json.dumps(cleaned_logs, indent=2),
-        media_type="application/json",
-        headers={"Content-Disposition": "attachment; filename=scraper_data.json"},
-    )
 
+async def _wait_disconnect(websocket: WebSocket):
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
 
-@app.websocket("/logs")
-async def websocket_logs(websocket: WebSocket):
-    await websocket.accept()
-
-    current_file = None
-    file_handle = None
 
+async def _stream_logs(websocket: WebSocket, current_job_id, name: str):
+    """
+    Send a job's log lines as they are logged, several newline-separated JSON
+    lines per frame. current_job_id() names the job to follow; when it changes
+    (a newer job) the stream switches to it.
+    """
+    await websocket.accept()
+    subscription = log_stream.subscribe()
+    disconnected = asyncio.create_task(_wait_disconnect(websocket))
     try:
-        while True:
-            # Pick up new session log file whenever one becomes active
-            with _status_lock:
-                new_file = status.current_log_file
-
-            if new_file and new_file != current_file and os.path.exists(new_file):
-                if file_handle:
-                    file_handle.close()
-                current_file = new_file
-                file_handle = open(current_file, "r", encoding="utf-8")
-                file_handle.seek(0, 2)  # tail from end
-
-            if file_handle:
-                line = file_handle.readline()
-                if line:
-                    await websocket.send_text(line)
-                    continue
-
-            await asyncio.sleep(0.1)
+        while not disconnected.done():
+            subscription.follow(current_job_id())
+            frame = await subscription.next_frame(timeout=0.25)
+            if frame and not disconnected.done():
+                await websocket.send_text(frame)
     except Exception as e:
-        print(f"WebSocket /logs error: {e}")
+        print(f"WebSocket {name} error: {e}")
     finally:
-        if file_handle:
-            file_handle.close()
+        subscription.close()
+        disconnected.cancel()
         try:
             await websocket.close()
         except Exception:
             pass
 
 
-# ── Sitemap Audit state ───────────────────────────────────────────────────────
-
-_audit_lock = threading.Lock()
-
+def _latest_job_id(kind: str):
+    def current_job_id():
+        job = jobs.latest(kind)
+        return job.id if job else None
+    return current_job_id
 
-class AuditStatus:
-    def __init__(self):
-        self.is_running = False
-        self.session_id = ""
-        self.current_log_file = ""
-        self.report_path = ""
 
+@app.websocket("/logs")
+async def websocket_logs(websocket: WebSocket):
+    await _stream_logs(websocket, _latest_job_id(KIND_CRAWL), "/logs")
 
-audit_status = AuditStatus()
-active_auditor = None
 
+# ── Sitemap Audit ─────────────────────────────────────────────────────────────
 
 class AuditRequest(BaseModel):
     url: str
@@ -229,138 +200,118 @@ class AuditRequest(BaseModel):
     delay: float = 0.5
     strip_query: bool = False
     js_fallback: bool = False
+    head_probe: bool = True
+    block_resources: Optional[List[str]] = None
+    block_trackers: Optional[bool] = None
 
 
-def run_audit_bg(request: AuditRequest):
-    global active_auditor
-
+def run_audit_bg(job: Job, request: AuditRequest):
     from scraper.sitemap_auditor import SitemapAuditor, AuditConfig
 
-    session_id = str(uuid.uuid4())[:8]
-    log_dir = os.path.join(os.path.dirname(__file__), "logs")
-    os.makedirs(log_dir, exist_ok=True)
-    log_path = os.path.join(log_dir, f"audit_{session_id}.log")
-    report_path = os.path.join(log_dir, f"audit_{session_id}_report.json")
-
-    handler = logging.handlers.RotatingFileHandler(
-        log_path, maxBytes=10 * 1024 * 1024, backupCount=1, encoding="utf-8"
+    cfg = AuditConfig(
+        root_url=request.url,
+        sitemap_override=request.sitemap_override or None,
+        max_pages=request.max_pages,
+        max_workers=request.max_workers,
+        delay=request.delay,
+        strip_query=request.strip_query,
+        js_fallback=request.js_fallback,
+        head_probe=request.head_probe,
+        block_resources=request.block_resources,
+        block_trackers=request.block_trackers,
     )
-    handler.setFormatter(JSONFormatter())
+    auditor = SitemapAuditor(cfg)
+    job.attach(auditor)
+    report = auditor.run()
 
-    audit_logger = logging.getLogger("auditor")
-    audit_logger.addHandler(handler)
-
-    with _audit_lock:
-        audit_status.is_running = True
-        audit_status.session_id = session_id
-        audit_status.current_log_file = os.path.abspath(log_path)
-        audit_status.report_path = os.path.abspath(report_path)
-
-    try:
-        cfg = AuditConfig(
-            root_url=request.url,
-            sitemap_override=request.sitemap_override or None,
-            max_pages=request.max_pages,
-            max_workers=request.max_workers,
-            delay=request.delay,
-            strip_query=request.strip_query,
-            js_fallback=request.js_fallback,
-        )
-        active_auditor = SitemapAuditor(cfg)
-        report = active_auditor.run()
-
-        with open(report_path, "w", encoding="utf-8") as f:
-            f.write(report.to_json())
-
-    except Exception as e:
-        print(f"Audit error: {e}")
-    finally:
-        with _audit_lock:
-            audit_status.is_running = False
-        active_auditor = None
-        audit_logger.removeHandler(handler)
-        handler.close()
+    with open(job.report_path, "w", encoding="utf-8") as f:
+        f.write(report.to_json())
 
 
 @app.post("/audit")
 async def start_audit(request: AuditRequest):
-    with _audit_lock:
-        if audit_status.is_running:
-            raise HTTPException(status_code=400, detail="Audit is already running")
-
-    thread = threading.Thread(target=run_audit_bg, args=(request,), daemon=True)
-    thread.start()
-    return {"message": "Audit started", "url": request.url}
+    job = _submit(KIND_AUDIT, request.url, run_audit_bg, request)
+    message = "Audit queued" if job.state == STATE_QUEUED else "Audit started"
+    return {"message": message, "url": request.url, "job_id": job.id, "state": job.state}
 
 
 @app.post("/audit/stop")
 async def stop_audit():
-    global active_auditor
-    if active_auditor:
-        active_auditor.stop()
-        return {"message": "Stop signal sent"}
-    return {"message": "No active audit to stop"}
+    return _stop(jobs.latest(KIND_AUDIT), "audit")
+
+
+def _audit_status(job: Optional[Job]) -> Dict[str, Any]:
+    if job is None:
+        return {"is_running": False, "session_id": "", "logs_path": "", "report_path": "", "state": ""}
+    return {
+        "is_running": job.active,
+        "session_id": job.id,
+        "logs_path": job.log_path,
+        "report_path": job.report_path,
+        "state": job.state,
+    }
 
 
 @app.get("/audit/status")
 async def get_audit_status():
-    with _audit_lock:
-        return {
-            "is_running": audit_status.is_running,
-            "session_id": audit_status.session_id,
-            "logs_path": audit_status.current_log_file,
-            "report_path": audit_status.report_path,
-        }
+    return _audit_status(jobs.latest(KIND_AUDIT))
 
 
-@app.get("/audit/report")
-async def get_audit_report():
-    report_path = audit_status.report_path
+def _download_report(job: Optional[Job]) -> Response:
+    report_path = job.report_path if job else ""
     if not report_path or not os.path.exists(report_path):
         raise HTTPException(status_code=404, detail="No audit report found — run an audit first")
 
-    with open(report_path, "r", encoding="utf-8") as f:
-        content = f.read()
+    return FileResponse(report_path, media_type="application/json", filename="audit_report.json")
 
-    return Response(
-        content=content,
-        media_type="application/json",
-        headers={"Content-Disposition": "attachment; filename=audit_report.json"},
-    )
+
+@app.get("/audit/report")
+async def get_audit_report():
+    return _download_report(jobs.latest(KIND_AUDIT))
 
 
 @app.websocket("/audit/logs")
 async def websocket_audit_logs(websocket: WebSocket):
-    await websocket.accept()
+    await _stream_logs(websocket, _latest_job_id(KIND_AUDIT), "/audit/logs")
 
-    current_file = None
-    file_handle = None
 
-    try:
-        while True:
-            with _audit_lock:
-                new_file = audit_status.current_log_file
-
-            if new_file and new_file != current_file and os.path.exists(new_file):
-                if file_handle:
-                    file_handle.close()
-                current_file = new_file
-                file_handle = open(current_file, "r", encoding="utf-8")
-                file_handle.seek(0, 2)
-
-            if file_handle:
-                line = file_handle.readline()
-                if line:
-                    await websocket.send_text(line)
-                    continue
-
-            await asyncio.sleep(0.1)
-    except Exception as e:
-        print(f"WebSocket /audit/logs error: {e}")
-    finally:
-        if file_handle:
-            file_handle.close()
-        try:
-            await websocket.close()
-        except Exception:
-            pass
+# ── Per-job endpoints ─────────────────────────────────────────────────────────
+
+@app.get("/jobs")
+async def list_jobs(kind: Optional[str] = None):
+    return {
+        "max_concurrent": jobs.max_concurrent,
+        "jobs": [job.to_dict() for job in jobs.jobs(kind)],
+    }
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    return _get_job(job_id).to_dict()
+
+
+@app.get("/jobs/{job_id}/status")
+async def get_job_status(job_id: str):
+    job = _get_job(job_id)
+    return _crawl_status(job) if job.kind == KIND_CRAWL else _audit_status(job)
+
+
+@app.post("/jobs/{job_id}/stop")
+async def stop_job(job_id: str):
+    job = _get_job(job_id)
+    return _stop(job, "crawler" if job.kind == KIND_CRAWL else "audit")
+
+
+@app.get("/jobs/{job_id}/download")
+async def download_job(job_id: str, format: str = FORMAT_JSON, gzip: bool = False):
+    """Crawl jobs: the cleaned extracted records (as for /download). Audit jobs: the report."""
+    job = _get_job(job_id)
+    return _download_crawl(job, format, gzip) if job.kind == KIND_CRAWL else _download_report(job)
+
+
+@app.websocket("/jobs/{job_id}/logs")
+async def websocket_job_logs(websocket: WebSocket, job_id: str):
+    if jobs.get(job_id) is None:
+        await websocket.close(code=4404)
+        return
+    await _stream_logs(websocket, lambda: job_id, f"/jobs/{job_id}/logs")
@@ -0,0 +1,87 @@
+"""
+Unit tests covering:
+- Encoding precedence: BOM, Content-Type charset, <meta> within the first KB
+- Undeclared bodies: UTF-8 check, then statistical detection
+- parse_html on raw bytes; Scraper ignoring requests' ISO-8859-1 default
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.charset import PRESCAN_BYTES, decode_html, detect_encoding, sniff_encoding
+from scraper.parser import parse_html
+from scraper.scraper import Scraper
+
+CAFE = "<p>Café crème — naïve</p>"
+
+
+class TestSniff:
+    @pytest.mark.parametrize("body, expected", [
+        (b"\xef\xbb\xbf<p>x</p>", "utf-8-sig"),
+        ("<p>x</p>".encode("utf-16"), "utf-16"),
+        ("<p>x</p>".encode("utf-32"), "utf-32"),
+    ])
+    def test_bom(self, body, expected):
+        assert sniff_encoding(body, "text/html; charset=iso-8859-2") == expected
+
+    def test_header_beats_meta(self):
+        body = b'<meta charset="shift_jis"><p>x</p>'
+        assert sniff_encoding(body, "text/html; charset=UTF-8") == "utf-8"
+
+    @pytest.mark.parametrize("meta", [
+        b'<meta charset="windows-1251">',
+        b"<meta charset=windows-1251>",
+        b'<META http-equiv="Content-Type" content="text/html; charset=windows-1251">',
+    ])
+    def test_meta(self, meta):
+        assert sniff_encoding(b"<html><head>" + meta, "text/html") == "cp1251"
+
+    def test_meta_after_prescan_ignored(self):
+        body = b"<!--" + b"x" * PRESCAN_BYTES + b'--><meta charset="cp1251">'
+        assert sniff_encoding(body) is None
+
+    def test_latin1_label_decoded_as_windows_1252(self):
+        assert sniff_encoding(b"", "text/html; charset=ISO-8859-1") == "cp1252"
+
+    def test_meta_utf16_means_utf8(self):
+        assert sniff_encoding(b'<meta charset="utf-16">') == "utf-8"
+
+    def test_unknown_label_ignored(self):
+        assert sniff_encoding(b'<meta charset="no-such-charset">', "text/html; charset=bogus") is None
+
+
+class TestDetect:
+    def test_undeclared_utf8(self):
+        assert detect_encoding(CAFE.encode("utf-8")) == "utf-8"
+
+    def test_prefix_cut_inside_character(self):
+        body = CAFE.encode("utf-8")
+        cut = body[:body.index("é".encode()) + 1]
+        assert detect_encoding(cut, final=False) == "utf-8"
+
+    def test_undeclared_legacy_falls_back_to_detection(self):
+        body = ("<p>" + "Это обычная русская страница без объявления кодировки. " * 20 + "</p>").encode("cp1251")
+        assert "Это обычная" in decode_html(body)
+
+    def test_parse_html_accepts_bytes(self):
+        body = b'<meta charset="iso-8859-15"><p>caf\xe9 \xa4</p>'
+        assert parse_html(body, "https://example.com/").paragraphs == ["café €"]
+
+
+class TestScraperCharset:
+    def test_text_html_without_charset_is_not_latin1(self):
+        body = f"<html><head><title>Café</title></head><body>{CAFE}</body></html>".encode("utf-8")
+        response = MagicMock(status_code=200, encoding="ISO-8859-1", headers={"Content-Type": "text/html"})
+        response.iter_content = lambda chunk_size=1: iter([body])
+        session = MagicMock()
+        session.get.return_value = response
+        with patch("scraper.scraper.time.sleep"):
+            content, _ = Scraper(session=session, render_cache=None).scrape_url("https://example.com/")
+        assert content.title == "Café"
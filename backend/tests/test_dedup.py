@@ -0,0 +1,108 @@
+"""
+Unit tests covering:
+- SimHash: near-identical text close, different text far, short text ignored
+- DuplicateIndex: exact-body parse reuse keyed by URL directory and profile,
+  near-duplicate matches, bounded parse cache
+- Scraper flagging duplicates; Crawler not expanding duplicates' links
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.config import Config
+from scraper.crawler import Crawler
+from scraper.dedup import DUPLICATE_EXACT, DUPLICATE_NEAR, DuplicateIndex, hamming, simhash
+from scraper.parser import parse_html
+from scraper.scraper import Scraper
+
+WORDS = " ".join(f"word{i}" for i in range(300))
+
+
+def _content(text: str):
+    return parse_html(f"<p>{text}</p>", "https://example.com/")
+
+
+class TestSimHash:
+    def test_near_identical_text_is_close(self):
+        assert hamming(simhash(WORDS), simhash(WORDS + " extra")) <= 3
+
+    def test_different_text_is_far(self):
+        other = " ".join(f"other{i}" for i in range(300))
+        assert hamming(simhash(WORDS), simhash(other)) > 10
+
+    def test_short_text_has_no_hash(self):
+        assert simhash("Loading…") is None
+
+
+class TestDuplicateIndex:
+    def test_exact_body_reused_in_same_directory(self):
+        index = DuplicateIndex()
+        content = _content(WORDS)
+        index.add("https://example.com/a/page", "h1", content)
+        assert index.cached("h1", "https://example.com/a/page?utm=x") == ("https://example.com/a/page", content)
+
+    def test_exact_body_in_other_directory_parsed_again(self):
+        index = DuplicateIndex()
+        index.add("https://example.com/a/page", "h1", _content(WORDS))
+        assert index.cached("h1", "https://example.com/print/page") is None
+
+    def test_profiles_cached_separately(self):
+        index = DuplicateIndex()
+        index.add("https://example.com/page", "h1", _content(WORDS), profile="crawl")
+        assert index.cached("h1", "https://example.com/page") is None
+
+    def test_near_duplicate_matched(self):
+        index = DuplicateIndex()
+        assert index.add("https://example.com/1", "h1", _content(WORDS)) is None
+        match = index.add("https://example.com/2", "h2", _content(WORDS + " page 2"))
+        assert (match.kind, match.of) == (DUPLICATE_NEAR, "https://example.com/1")
+
+    def test_distinct_pages_not_matched(self):
+        index = DuplicateIndex()
+        index.add("https://example.com/1", "h1", _content(WORDS))
+        assert index.add("https://example.com/2", "h2", _content(" ".join(f"x{i}" for i in range(300)))) is None
+
+    def test_cache_bounded(self):
+        index = DuplicateIndex(max_cached=2)
+        for i in range(3):
+            index.add(f"https://example.com/{i}", f"h{i}", _content("short"))
+        assert index.cached("h0", "https://example.com/0") is None
+        assert index.cached("h2", "https://example.com/2") is not None
+
+
+class TestScraperDuplicates:
+    def _scraper(self, body: bytes):
+        response = MagicMock(status_code=200, encoding="utf-8", headers={})
+        response.iter_content = lambda chunk_size=1: iter([body])
+        session = MagicMock()
+        session.get.return_value = response
+        return Scraper(session=session, render_cache=None, dedup=DuplicateIndex())
+
+    def test_identical_body_parsed_once_and_flagged(self):
+        scraper = self._scraper(f"<p>{WORDS}</p>".encode())
+        with patch("scraper.scraper.time.sleep"), patch("scraper.scraper.parse_html", wraps=parse_html) as parse:
+            first, _ = scraper.scrape_url("https://example.com/page")
+            second, links = scraper.scrape_url("https://example.com/page?ref=mail")
+        assert parse.call_count == 1
+        assert first.duplicate_of is None
+        assert second.duplicate_of == "https://example.com/page"
+
+
+class TestCrawlerDuplicates:
+    def test_exact_duplicate_not_expanded(self):
+        crawler = Crawler(base_url="https://example.com/")
+        content = {"title": "T", DUPLICATE_EXACT: "https://example.com/"}
+        assert crawler._emit("https://example.com/?a=1", 1, content, ["https://example.com/x"]) == []
+
+    def test_near_duplicate_expanded_unless_configured(self, monkeypatch):
+        crawler = Crawler(base_url="https://example.com/")
+        content = {"title": "T", DUPLICATE_NEAR: "https://example.com/"}
+        links = ["https://example.com/x"]
+        assert crawler._emit("https://example.com/p2", 1, content, links) == links
+        monkeypatch.setattr(Config, "SKIP_DUPLICATE_OUTLINKS", True)
+        assert crawler._emit("https://example.com/p2", 1, content, links) == []
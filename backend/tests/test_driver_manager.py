@@ -0,0 +1,197 @@
+"""
+Unit tests covering:
+- DriverPool checkout/checkin and size bound
+- Unique debugging port per browser
+- Recycling after N pages and on WebDriver errors
+- Liveness check replacing a dead browser
+- Lazy startup and once-per-process driver binary resolution
+- Crawler keeping the pool on a failed render, dropping it when no browser starts
+- A WebDriver error during a render replacing the browser; a page timeout not
+- Resource blocking policy
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper import driver_manager
+from scraper.crawler import Crawler
+from scraper.driver_manager import DriverPool, ResourcePolicy, _apply_resource_policy
+
+
+@pytest.fixture
+def fake_create_driver():
+    created = []
+
+    def _create(headless=None, debug_port=None, resource_policy=None):
+        driver = MagicMock(name=f"driver-{len(created)}")
+        driver.debug_port = debug_port
+        created.append(driver)
+        return driver
+
+    with patch.object(driver_manager, "create_driver", side_effect=_create), \
+            patch.object(driver_manager, "_browser_memory_mb", return_value=None):
+        yield created
+
+
+class TestDriverPool:
+    def test_warm_up_starts_size_browsers_on_unique_ports(self, fake_create_driver):
+        pool = DriverPool(size=3, max_pages=0)
+        pool.warm_up()
+        assert len(fake_create_driver) == 3
+        assert len({d.debug_port for d in fake_create_driver}) == 3
+
+    def test_checkout_reuses_idle_driver(self, fake_create_driver):
+        pool = DriverPool(size=2, max_pages=0)
+        with pool.driver() as first:
+            pass
+        with pool.driver() as second:
+            pass
+        assert first is second
+        assert len(fake_create_driver) == 1
+
+    def test_pool_never_exceeds_size(self, fake_create_driver):
+        import queue
+
+        pool = DriverPool(size=1, max_pages=0)
+        held = pool.checkout()
+        with pytest.raises(queue.Empty):
+            pool.checkout(timeout=0.01)
+        pool.checkin(held)
+        assert len(fake_create_driver) == 1
+
+    def test_recycles_after_max_pages(self, fake_create_driver):
+        pool = DriverPool(size=1, max_pages=2)
+        for _ in range(2):
+            with pool.driver():
+                pass
+        assert fake_create_driver[0].quit.called
+        with pool.driver() as driver:
+            assert driver is fake_create_driver[1]
+
+    def test_error_inside_checkout_recycles(self, fake_create_driver):
+        pool = DriverPool(size=1, max_pages=0)
+        with pytest.raises(RuntimeError):
+            with pool.driver():
+                raise RuntimeError("tab crashed")
+        assert fake_create_driver[0].quit.called
+
+    def test_dead_driver_replaced_on_checkout(self, fake_create_driver):
+        pool = DriverPool(size=1, max_pages=0)
+        pool.warm_up()
+        fake_create_driver[0].execute_script.side_effect = Exception("disconnected")
+        with pool.driver() as driver:
+            assert driver is fake_create_driver[1]
+
+    def test_close_quits_idle_drivers(self, fake_create_driver):
+        pool = DriverPool(size=2, max_pages=0)
+        pool.warm_up()
+        pool.close()
+        assert all(d.quit.called for d in fake_create_driver)
+        with pytest.raises(RuntimeError):
+            pool.checkout()
+
+
+class TestLazyStartup:
+    def test_pool_construction_starts_no_browser(self, fake_create_driver):
+        DriverPool(size=4)
+        assert fake_create_driver == []
+
+    def test_driver_path_resolved_once(self):
+        with patch.object(driver_manager, "_driver_path", None), \
+                patch.object(driver_manager.Config, "CHROMEDRIVER_PATH", ""), \
+                patch.object(driver_manager, "ChromeDriverManager") as manager:
+            manager.return_value.install.return_value = "/tmp/chromedriver"
+            assert driver_manager.resolve_driver_path() == "/tmp/chromedriver"
+            assert driver_manager.resolve_driver_path() == "/tmp/chromedriver"
+            assert manager.return_value.install.call_count == 1
+
+    def test_configured_driver_path_skips_lookup(self):
+        with patch.object(driver_manager.Config, "CHROMEDRIVER_PATH", "/opt/chromedriver"), \
+                patch.object(driver_manager, "ChromeDriverManager") as manager:
+            assert driver_manager.resolve_driver_path() == "/opt/chromedriver"
+            manager.assert_not_called()
+
+
+class TestCrawlerRendering:
+    URL = "https://example.com/"
+
+    def test_render_error_keeps_pool(self, fake_create_driver):
+        crawler = Crawler(base_url=self.URL)
+        with patch.object(crawler.scraper, "scrape_dynamic", side_effect=RuntimeError("tab crashed")):
+            assert crawler._render(self.URL) == (None, [])
+        assert crawler.drivers is not None
+        assert fake_create_driver[0].quit.called
+        with patch.object(crawler.scraper, "scrape_dynamic", return_value=({"title": "T"}, [])) as scrape:
+            assert crawler._render(self.URL) == ({"title": "T"}, [])
+        assert scrape.call_args.args[1] is fake_create_driver[1]
+
+    def test_webdriver_error_in_render_replaces_driver(self, fake_create_driver):
+        crawler = Crawler(base_url=self.URL)
+        with patch("scraper.scraper.WebDriverWait"):
+            crawler._render(self.URL)
+            fake_create_driver[0].get.side_effect = WebDriverException("chrome not reachable")
+            assert crawler._render(self.URL) == (None, [])
+            assert fake_create_driver[0].quit.called
+            crawler._render(self.URL)
+        fake_create_driver[1].get.assert_called_with(self.URL)
+
+    def test_page_timeout_keeps_driver(self, fake_create_driver):
+        crawler = Crawler(base_url=self.URL)
+        with patch.object(crawler.scraper, "_extract_loaded_page", side_effect=TimeoutException("slow page")):
+            assert crawler._render(self.URL) == (None, [])
+            assert crawler._render(self.URL) == (None, [])
+        assert len(fake_create_driver) == 1
+        assert not fake_create_driver[0].quit.called
+
+    def test_browser_start_failure_disables_rendering(self):
+        crawler = Crawler(base_url=self.URL)
+        with patch.object(driver_manager, "create_driver", side_effect=RuntimeError("no chrome")):
+            assert crawler._render_many([self.URL, self.URL + "a"]) == [(None, []), (None, [])]
+        assert crawler.drivers is None
+
+
+class TestResourcePolicy:
+    def test_types_expand_to_url_patterns(self):
+        urls = ResourcePolicy(resource_types=("font",)).blocked_urls()
+        assert "*.woff2" in urls
+        assert "*.woff2?*" in urls
+        assert "*.css" not in urls
+
+    def test_trackers_and_custom_patterns(self):
+        urls = ResourcePolicy(url_patterns=("*ads.example.com*",), block_trackers=True).blocked_urls()
+        assert "*google-analytics.com*" in urls
+        assert "*ads.example.com*" in urls
+
+    def test_images_blocked_by_content_setting(self):
+        assert ResourcePolicy(resource_types=("image",)).chrome_prefs() == {
+            "profile.managed_default_content_settings.images": 2
+        }
+        assert ResourcePolicy().chrome_prefs() == {}
+
+    def test_request_override_keeps_unset_defaults(self):
+        with patch.object(driver_manager.Config, "BLOCK_RESOURCE_TYPES", ["image"]), \
+                patch.object(driver_manager.Config, "BLOCK_TRACKERS", True):
+            policy = ResourcePolicy.from_request(resource_types=[])
+        assert policy.resource_types == ()
+        assert policy.block_trackers is True
+
+    def test_applied_via_devtools(self):
+        driver = MagicMock()
+        _apply_resource_policy(driver, ResourcePolicy(resource_types=("media",)))
+        driver.execute_cdp_cmd.assert_any_call("Network.enable", {})
+        cmd, params = driver.execute_cdp_cmd.call_args.args
+        assert cmd == "Network.setBlockedURLs"
+        assert "*.mp4" in params["urls"]
+
+    def test_empty_policy_sends_nothing(self):
+        driver = MagicMock()
+        _apply_resource_policy(driver, ResourcePolicy())
+        driver.execute_cdp_cmd.assert_not_called()
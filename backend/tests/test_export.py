@@ -0,0 +1,83 @@
+"""
+Unit tests covering:
+- clean_data dropping empty values recursively
+- iter_records picking cleaned "Extracted content" records out of job log lines
+- stream_records: JSON array and NDJSON output, chunking, streamed gzip
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.export import FORMAT_JSON, FORMAT_NDJSON, clean_data, iter_records, stream_records
+
+
+def _log_line(message, **extra):
+    return json.dumps({"timestamp": "2026-01-01T00:00:00", "level": "INFO", "message": message,
+                       "module": "crawler", **extra}) + "\n"
+
+
+RECORDS = [{"url": f"https://example.com/{i}", "title": f"Päge {i}", "links": [f"/{i}"]} for i in range(50)]
+
+LOG = [
+    _log_line("Starting crawl"),
+    *[_log_line("Extracted content", url=r["url"], data={**r, "description": "", "images": []}) for r in RECORDS],
+    _log_line("Processing: page mentions Extracted content"),
+    '{"timestamp": "2026-01-01", "message": "Extracted content", "data": {"url": "trunc',  # crawl still writing
+]
+
+
+def _decode(chunks, compressed=False):
+    body = b"".join(chunks)
+    return (gzip.decompress(body) if compressed else body).decode("utf-8")
+
+
+class TestCleanData:
+    def test_drops_empty_values(self):
+        assert clean_data({"a": "", "b": [], "c": {"d": None}, "e": [1, "", {}], "f": 0}) == {"e": [1], "f": 0}
+
+
+class TestIterRecords:
+    def test_only_cleaned_extracted_records(self):
+        assert list(iter_records(LOG)) == RECORDS
+
+
+class TestStreamRecords:
+    def test_json_array(self):
+        assert json.loads(_decode(stream_records(iter(RECORDS)))) == RECORDS
+
+    def test_empty_json_array(self):
+        assert json.loads(_decode(stream_records(iter([])))) == []
+
+    def test_ndjson(self):
+        lines = _decode(stream_records(iter(RECORDS), FORMAT_NDJSON)).splitlines()
+        assert [json.loads(line) for line in lines] == RECORDS
+
+    def test_chunked(self):
+        chunks = list(stream_records(iter(RECORDS), FORMAT_JSON, chunk_bytes=256))
+        assert len(chunks) > 10
+        assert all(len(chunk) < 1024 for chunk in chunks)
+        assert json.loads(_decode(chunks)) == RECORDS
+
+    @pytest.mark.parametrize("fmt", [FORMAT_JSON, FORMAT_NDJSON])
+    def test_gzip(self, fmt):
+        plain = _decode(stream_records(iter(RECORDS), fmt))
+        assert _decode(stream_records(iter(RECORDS), fmt, gzip=True, chunk_bytes=256), compressed=True) == plain
+
+    def test_lazy(self):
+        def records():
+            yield RECORDS[0]
+            raise AssertionError("read past the first chunk")
+
+        assert next(stream_records(records(), chunk_bytes=1))
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            next(stream_records(iter(RECORDS), "csv"))
@@ -0,0 +1,139 @@
+"""
+Unit tests covering:
+- Embedded payload extraction (__NEXT_DATA__, JSON-LD, window state, JSON islands)
+- Link discovery inside JSON payloads (hydration state only, not JSON-LD)
+- Network-log JSON capture
+- Payload-bearing pages skipping the browser
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.hydration import (
+    capture_json_responses,
+    extract_structured_data,
+    has_hydration_payload,
+    links_from_payload,
+)
+from scraper.parser import parse_html
+from scraper.parser_backends import available_backends
+from scraper.stream_parser import StreamingExtractor
+
+
+NEXT_PAGE = """<html><body><div id="__next"></div>
+<script id="__NEXT_DATA__" type="application/json">
+{"props": {"pageProps": {"products": [
+  {"name": "Shoe", "href": "/products/shoe", "image": "/_next/static/shoe.png"},
+  {"name": "Hat", "url": "https://example.com/products/hat", "id": "/not-a-link"}
+]}}, "page": "/products", "buildId": "abc"}
+</script>
+<script src="/_next/static/chunks/main.js"></script>
+</body></html>"""
+
+
+class TestExtractStructuredData:
+    def test_next_data(self):
+        data = extract_structured_data(NEXT_PAGE)
+        assert data["next_data"]["buildId"] == "abc"
+
+    def test_json_ld_collected_as_list(self):
+        html = (
+            '<script type="application/ld+json">{"@type": "Product"}</script>'
+            '<script type="application/ld+json">{"@type": "Offer"}</script>'
+        )
+        assert [d["@type"] for d in extract_structured_data(html)["json_ld"]] == ["Product", "Offer"]
+
+    def test_window_state_assignment(self):
+        html = '<script>window.__APOLLO_STATE__ = {"Product:1": {"slug": "/p/1"}};</script>'
+        assert extract_structured_data(html)["app_state"]["__APOLLO_STATE__"]["Product:1"]["slug"] == "/p/1"
+
+    def test_non_json_state_ignored(self):
+        html = "<script>window.__INITIAL_STATE__ = {a: function() {}};</script>"
+        assert extract_structured_data(html) is None
+
+    def test_json_island_by_id(self):
+        html = '<script type="application/json" id="config">{"a": 1}</script>'
+        assert extract_structured_data(html)["json"]["config"] == {"a": 1}
+
+    def test_invalid_json_ignored(self):
+        assert extract_structured_data('<script id="__NEXT_DATA__">{broken</script>') is None
+
+
+class TestLinksFromPayload:
+    def test_link_keys_and_absolute_urls(self):
+        payload = extract_structured_data(NEXT_PAGE)
+        links = links_from_payload(payload, "https://example.com/")
+        assert "https://example.com/products/shoe" in links
+        assert "https://example.com/products/hat" in links
+
+    def test_assets_and_non_link_keys_skipped(self):
+        links = links_from_payload(extract_structured_data(NEXT_PAGE), "https://example.com/")
+        assert not any("/_next/" in l for l in links)
+        assert "https://example.com/not-a-link" not in links
+
+    def test_parse_html_merges_payload_links(self):
+        content = parse_html(NEXT_PAGE, "https://example.com/")
+        assert "https://example.com/products/shoe" in content.links
+        assert has_hydration_payload({"structured_data": content.structured_data})
+
+    def test_json_ld_and_json_islands_not_mined(self):
+        page = NEXT_PAGE.replace("</body>", """
+<script type="application/ld+json">
+{"@context": "https://schema.org", "@type": "Organization",
+ "logo": "https://cdn.example.net/brand/logo", "sameAs": ["https://twitter.com/example"],
+ "url": "/about"}
+</script>
+<script type="application/json" id="config">{"api": "https://api.example.com/v1"}</script>
+</body>""")
+        for backend in available_backends():
+            content = parse_html(page, "https://example.com/", backend=backend)
+            assert "https://example.com/products/shoe" in content.links
+            for url in ("https://schema.org", "https://cdn.example.net/brand/logo",
+                        "https://twitter.com/example", "https://example.com/about", "https://api.example.com/v1"):
+                assert url not in content.links, (backend, url)
+        streamed = StreamingExtractor("https://example.com/")
+        streamed.feed(page)
+        links = streamed.result().links
+        assert "https://example.com/products/shoe" in links
+        assert "https://schema.org" not in links
+
+    def test_json_ld_alone_is_not_hydration(self):
+        assert not has_hydration_payload({"structured_data": {"json_ld": [{}]}})
+        assert not has_hydration_payload(None)
+
+
+class TestCaptureJsonResponses:
+    def _entry(self, request_id, rtype="XHR", mime="application/json"):
+        return {"message": json.dumps({"message": {
+            "method": "Network.responseReceived",
+            "params": {"requestId": request_id, "type": rtype,
+                       "response": {"url": f"https://api.example.com/{request_id}", "mimeType": mime}},
+        }})}
+
+    def test_reads_json_xhr_bodies(self):
+        driver = MagicMock()
+        driver.get_log.return_value = [
+            self._entry("1"),
+            self._entry("2", rtype="Image", mime="image/png"),
+            self._entry("3", mime="text/html"),
+        ]
+        driver.execute_cdp_cmd.return_value = {"body": '{"items": [1]}', "base64Encoded": False}
+        captured = capture_json_responses(driver)
+        assert captured == [{"url": "https://api.example.com/1", "data": {"items": [1]}}]
+
+    def test_max_responses(self):
+        driver = MagicMock()
+        driver.get_log.return_value = [self._entry(str(i)) for i in range(5)]
+        driver.execute_cdp_cmd.return_value = {"body": "{}", "base64Encoded": False}
+        assert len(capture_json_responses(driver, max_responses=2)) == 2
+
+    def test_missing_log_returns_empty(self):
+        driver = MagicMock()
+        driver.get_log.side_effect = Exception("log type not found")
+        assert capture_json_responses(driver) == []
@@ -0,0 +1,311 @@
+"""
+Unit tests covering:
+- JobManager: concurrent-job limit, FIFO queue, queue bound, job states
+- Stopping queued and running jobs, including a stop before the worker exists
+- Per-job log files when concurrent jobs share the crawler loggers and thread pools
+- Bounded job history
+- Worker processes: log lines and outcome over IPC, stop signal, crash isolation,
+  termination of a worker that ignores stop, a job's own parse pool, shutdown,
+  workers leaving the shared rotating log files to the API process
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.jobs import (
+    KIND_AUDIT,
+    KIND_CRAWL,
+    STATE_FAILED,
+    STATE_FINISHED,
+    STATE_QUEUED,
+    STATE_RUNNING,
+    STATE_STOPPED,
+    JobManager,
+    QueueFullError,
+)
+from scraper.logger import bind_job, current_job
+from scraper.parse_pool import ParsePool
+from scraper.scraper import Scraper
+
+TIMEOUT = 5
+
+
+class Gate:
+    """Job target that runs until released or stopped."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def stop(self):
+        self.release.set()
+
+    def __call__(self, job):
+        job.attach(self)
+        self.started.set()
+        assert self.release.wait(TIMEOUT)
+
+
+# Worker-process targets: module level so they pickle
+
+class _Stoppable:
+    def __init__(self):
+        self.stopped = threading.Event()
+
+    def stop(self):
+        self.stopped.set()
+
+
+def _log_lines(job, count):
+    crawl_logger = logging.getLogger("crawler")
+    crawl_logger.setLevel(logging.INFO)
+    for i in range(count):
+        crawl_logger.info(f"page {i}", extra={"pid": os.getpid()})
+
+
+def _run_until_stopped(job):
+    worker = _Stoppable()
+    job.attach(worker)
+    assert worker.stopped.wait(TIMEOUT * 4)
+
+
+def _ignore_stop(job):
+    time.sleep(TIMEOUT * 4)
+
+
+def _crash(job):
+    os._exit(3)
+
+
+def _raise(job):
+    raise ValueError("bad sitemap")
+
+
+def _scrape_with_parse_pool(job):
+    response = MagicMock(status_code=200, encoding="utf-8", headers={})
+    response.iter_content = lambda chunk_size=1: iter([b"<html><head><title>Pooled</title></head></html>"])
+    session = MagicMock()
+    session.get.return_value = response
+    pool = ParsePool.from_config()
+    assert pool is not None
+    with pool:
+        content, _ = Scraper(session=session, render_cache=None, parse_pool=pool).scrape_url(job.url)
+    logging.getLogger("crawler").warning(f"title: {content.title}")
+
+
+def _report_file_handlers(job):
+    names = ("crawler", "scraper", "errors")
+    handlers = [type(h).__name__ for name in names for h in logging.getLogger(name).handlers]
+    logging.getLogger("crawler").warning(f"handlers: {handlers}")
+
+
+def _wait_for(job, state, timeout=TIMEOUT):
+    for _ in range(int(timeout * 100)):
+        if job.state == state:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError(f"job {job.id} is {job.state}, expected {state}")
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return JobManager(str(tmp_path), max_concurrent=2, max_queued=2, history=10, processes=False)
+
+
+class TestScheduling:
+    def test_runs_up_to_limit_then_queues(self, manager):
+        gates = [Gate() for _ in range(3)]
+        jobs = [manager.submit(KIND_CRAWL, f"https://example.com/{i}", gate) for i, gate in enumerate(gates)]
+        assert gates[0].started.wait(TIMEOUT) and gates[1].started.wait(TIMEOUT)
+        assert [job.state for job in jobs] == [STATE_RUNNING, STATE_RUNNING, STATE_QUEUED]
+
+        gates[0].release.set()
+        assert gates[2].started.wait(TIMEOUT)
+        _wait_for(jobs[0], STATE_FINISHED)
+        assert jobs[2].state == STATE_RUNNING
+        for gate in gates:
+            gate.release.set()
+
+    def test_queue_is_bounded(self, manager):
+        gates = [Gate() for _ in range(4)]
+        for gate in gates:
+            manager.submit(KIND_CRAWL, "https://example.com/", gate)
+        with pytest.raises(QueueFullError):
+            manager.submit(KIND_CRAWL, "https://example.com/", Gate())
+        for gate in gates:
+            gate.release.set()
+
+    def test_failed_job_frees_its_slot(self, tmp_path):
+        manager = JobManager(str(tmp_path), max_concurrent=1, processes=False)
+
+        def boom(job):
+            raise RuntimeError("no browser")
+
+        failed = manager.submit(KIND_CRAWL, "https://example.com/", boom)
+        gate = Gate()
+        manager.submit(KIND_CRAWL, "https://example.com/", gate)
+        assert gate.started.wait(TIMEOUT)
+        assert (failed.state, failed.error) == (STATE_FAILED, "no browser")
+        gate.release.set()
+
+    def test_latest_by_kind(self, manager):
+        crawl = manager.submit(KIND_CRAWL, "https://example.com/", lambda job: None)
+        audit = manager.submit(KIND_AUDIT, "https://example.com/", lambda job: None)
+        assert manager.latest(KIND_CRAWL) is crawl
+        assert manager.latest(KIND_AUDIT) is audit
+        assert audit.report_path.endswith(f"audit_{audit.id}_report.json")
+
+    def test_history_bounded(self, tmp_path):
+        manager = JobManager(str(tmp_path), max_concurrent=1, history=2, processes=False)
+        done = [manager.submit(KIND_CRAWL, "https://example.com/", lambda job: None) for _ in range(3)]
+        for job in done:
+            _wait_for(job, STATE_FINISHED)
+        assert manager.get(done[0].id) is None
+        assert [job.id for job in manager.jobs()] == [job.id for job in done[1:]]
+
+
+class TestStop:
+    def test_stop_running_job(self, manager):
+        gate = Gate()
+        job = manager.submit(KIND_CRAWL, "https://example.com/", gate)
+        assert gate.started.wait(TIMEOUT)
+        assert manager.stop(job.id)
+        _wait_for(job, STATE_STOPPED)
+        assert not manager.stop(job.id)
+
+    def test_stop_queued_job_never_runs(self, tmp_path):
+        manager = JobManager(str(tmp_path), max_concurrent=1, processes=False)
+        first, second = Gate(), Gate()
+        manager.submit(KIND_CRAWL, "https://example.com/", first)
+        queued = manager.submit(KIND_CRAWL, "https://example.com/", second)
+        assert manager.stop(queued.id)
+        assert queued.state == STATE_STOPPED
+        first.release.set()
+        assert not second.started.wait(0.2)
+
+    def test_stop_before_attach_reaches_worker(self, manager):
+        entered, gate = threading.Event(), Gate()
+
+        def target(job):
+            entered.set()
+            assert stopped.wait(TIMEOUT)
+            gate(job)  # attaches after the stop arrived
+
+        stopped = threading.Event()
+        job = manager.submit(KIND_CRAWL, "https://example.com/", target)
+        assert entered.wait(TIMEOUT)
+        manager.stop(job.id)
+        stopped.set()
+        _wait_for(job, STATE_STOPPED)
+
+
+class TestJobLogs:
+    def test_concurrent_jobs_log_to_their_own_files(self, manager):
+        crawl_logger = logging.getLogger("crawler")
+        crawl_logger.setLevel(logging.INFO)
+        barrier = threading.Barrier(2, timeout=TIMEOUT)
+
+        def target(job, name):
+            barrier.wait()  # both jobs log at the same time
+            with ThreadPoolExecutor(2, initializer=bind_job, initargs=(current_job(),)) as pool:
+                list(pool.map(lambda i: crawl_logger.info(f"{name} page {i}"), range(5)))
+
+        first = manager.submit(KIND_CRAWL, "https://a.example/", target, "a")
+        second = manager.submit(KIND_CRAWL, "https://b.example/", target, "b")
+        for job in (first, second):
+            _wait_for(job, STATE_FINISHED)
+
+        for job, name in ((first, "a"), (second, "b")):
+            with open(job.log_path, encoding="utf-8") as f:
+                messages = [json.loads(line)["message"] for line in f]
+            assert sorted(messages) == [f"{name} page {i}" for i in range(5)]
+
+
+class TestWorkerProcesses:
+    # Spawned workers import the interpreter afresh, so allow for slow starts
+    SPAWN_TIMEOUT = 30
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        return JobManager(str(tmp_path), max_concurrent=2, processes=True)
+
+    def test_logs_and_outcome_relayed(self, manager):
+        job = manager.submit(KIND_CRAWL, "https://example.com/", _log_lines, 3)
+        _wait_for(job, STATE_FINISHED, self.SPAWN_TIMEOUT)
+        with open(job.log_path, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f]
+        assert [e["message"] for e in entries] == ["page 0", "page 1", "page 2"]
+        assert entries[0]["pid"] == job.pid != os.getpid()
+
+    def test_stop_signal(self, manager):
+        job = manager.submit(KIND_CRAWL, "https://example.com/", _run_until_stopped)
+        assert manager.stop(job.id)  # before the worker is up: delivered once it attaches
+        _wait_for(job, STATE_STOPPED, self.SPAWN_TIMEOUT)
+
+    def test_unresponsive_worker_terminated(self, manager):
+        manager.stop_timeout = 0.5
+        job = manager.submit(KIND_CRAWL, "https://example.com/", _ignore_stop)
+        for _ in range(self.SPAWN_TIMEOUT * 10):
+            if job.pid:
+                break
+            time.sleep(0.1)
+        manager.stop(job.id)
+        _wait_for(job, STATE_STOPPED, self.SPAWN_TIMEOUT)
+
+    def test_crash_fails_only_that_job(self, manager):
+        crashed = manager.submit(KIND_CRAWL, "https://example.com/", _crash)
+        raised = manager.submit(KIND_AUDIT, "https://example.com/", _raise)
+        _wait_for(crashed, STATE_FAILED, self.SPAWN_TIMEOUT)
+        _wait_for(raised, STATE_FAILED, self.SPAWN_TIMEOUT)
+        assert crashed.error == "Worker process exited with code 3"
+        assert raised.error == "bad sitemap"
+
+        after = manager.submit(KIND_CRAWL, "https://example.com/", _log_lines, 1)
+        _wait_for(after, STATE_FINISHED, self.SPAWN_TIMEOUT)
+
+    def test_job_runs_its_own_parse_pool(self, manager, monkeypatch):
+        monkeypatch.setenv("PARSE_POOL", "true")  # read by the spawned worker's Config
+        job = manager.submit(KIND_CRAWL, "https://example.com/", _scrape_with_parse_pool)
+        _wait_for(job, STATE_FINISHED, self.SPAWN_TIMEOUT)
+        with open(job.log_path, encoding="utf-8") as f:
+            assert "title: Pooled" in [json.loads(line)["message"] for line in f]
+
+    def test_worker_skips_shared_log_files(self, manager, monkeypatch, tmp_path):
+        shared = tmp_path / "shared"
+        monkeypatch.setenv("LOG_DIR", str(shared))  # read by the spawned worker's Config
+        job = manager.submit(KIND_CRAWL, "https://example.com/", _report_file_handlers)
+        _wait_for(job, STATE_FINISHED, self.SPAWN_TIMEOUT)
+        with open(job.log_path, encoding="utf-8") as f:
+            message = json.loads(f.readline())["message"]
+        assert message.startswith("handlers:") and "FileHandler" not in message
+        for path in shared.glob("*.log"):
+            assert path.read_text() == ""
+
+    def test_shutdown_ends_workers(self, manager):
+        job = manager.submit(KIND_CRAWL, "https://example.com/", _ignore_stop)
+        for _ in range(self.SPAWN_TIMEOUT * 10):
+            if job.pid:
+                break
+            time.sleep(0.1)
+        manager.stop_timeout = 0.5
+        others = [manager.submit(KIND_CRAWL, "https://example.com/", _ignore_stop) for _ in range(2)]
+        assert others[1].state == STATE_QUEUED
+        manager.shutdown(timeout=0.5)
+        assert others[1].state == STATE_STOPPED
+        for stopped in (job, others[0]):
+            _wait_for(stopped, STATE_STOPPED, self.SPAWN_TIMEOUT)
+            assert not os.path.exists(f"/proc/{stopped.pid}")
+        with pytest.raises(RuntimeError):
+            manager.submit(KIND_CRAWL, "https://example.com/", _ignore_stop)
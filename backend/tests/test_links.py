@@ -0,0 +1,65 @@
+"""
+Unit tests covering:
+- LinkResolver matching resolve_url for relative, absolute and odd hrefs
+- LinkClassifier matching is_internal_url / normalize_url
+- Crawl-wide memoization
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.links import LinkClassifier, LinkResolver
+from scraper.utils import is_internal_url, normalize_url, resolve_url
+
+BASES = [
+    "https://example.com/shop/list?page=2#top",
+    "http://example.com",
+    "https://sub.example.com/a/b/",
+    "",
+]
+
+HREFS = [
+    "/p/1", "p/2", "../up", "./same", "?sort=asc", "#frag", "", " /spaced ",
+    "https://example.com/x", "http://example.com/y?q=1#f", "//cdn.example.com/i.png",
+    "https://other.org/a/../b", "HTTPS://Example.COM/Case", "mailto:a@example.com",
+    "javascript:void(0)", "https://example.com?", "http://[::1]:8080/v6",
+]
+
+URLS = [
+    "https://example.com/a#frag", "https://Shop.Example.com/A?x=1", "https://example.com.evil.org/",
+    "https://notexample.com/", "http://sub.example.com/p;params?q", "mailto:a@example.com", "/relative", "",
+]
+
+
+class TestLinkResolver:
+    @pytest.mark.parametrize("base", BASES)
+    def test_matches_resolve_url(self, base):
+        resolver = LinkResolver(base)
+        for href in HREFS * 2:  # the second pass is served from the memo
+            assert resolver.resolve(href) == resolve_url(base, href), href
+
+
+class TestLinkClassifier:
+    @pytest.mark.parametrize("root", ["https://example.com/", "https://sub.example.com"])
+    def test_matches_utils(self, root):
+        links = LinkClassifier(root)
+        for url in URLS:
+            assert links.is_internal(url) == is_internal_url(root, url), url
+            assert links.normalize(url) == normalize_url(url), url
+
+    def test_internal_yields_normalized_pairs(self):
+        links = LinkClassifier("https://example.com/")
+        found = list(links.internal(["https://example.com/a#x", "https://other.org/", "/relative"]))
+        assert found == [("https://example.com/a#x", "https://example.com/a")]
+
+    def test_memoized(self):
+        links = LinkClassifier("https://example.com/")
+        for _ in range(3):
+            links.normalize("https://example.com/a")
+        assert links.classify.cache_info().hits == 2
@@ -0,0 +1,113 @@
+"""
+Unit tests covering:
+- LogBroadcaster fan-out to every subscriber of a channel, from other threads
+- Batched frames (newline-joined, capped lines per frame)
+- Bounded per-client buffers: oldest lines dropped, lag notice sent
+- Following another channel; publishing with no subscribers
+- JobManager publishing job log lines to the job's channel
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.jobs import KIND_CRAWL, JobManager
+from scraper.log_stream import LogBroadcaster
+
+
+def _run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 5))
+
+
+def _from_thread(fn, *args):
+    thread = threading.Thread(target=fn, args=args)
+    thread.start()
+    thread.join()
+
+
+class TestBroadcaster:
+    def test_every_subscriber_gets_batched_lines(self):
+        async def scenario():
+            broadcaster = LogBroadcaster(batch_ms=0)
+            first, second = broadcaster.subscribe("job1"), broadcaster.subscribe("job1")
+            _from_thread(lambda: [broadcaster.publish("job1", f"line {i}") for i in range(3)])
+            return await first.next_frame(), await second.next_frame()
+
+        assert _run(scenario()) == ("line 0\nline 1\nline 2",) * 2
+
+    def test_frames_capped(self):
+        async def scenario():
+            broadcaster = LogBroadcaster(batch_lines=2, batch_ms=0)
+            subscription = broadcaster.subscribe("job1")
+            for i in range(3):
+                broadcaster.publish("job1", str(i))
+            return [await subscription.next_frame(), await subscription.next_frame()]
+
+        assert _run(scenario()) == ["0\n1", "2"]
+
+    def test_slow_client_drops_oldest_and_is_told(self):
+        async def scenario():
+            broadcaster = LogBroadcaster(client_buffer=3, batch_ms=0)
+            subscription = broadcaster.subscribe("job1")
+            for i in range(5):
+                broadcaster.publish("job1", str(i))
+            return await subscription.next_frame()
+
+        notice, *lines = _run(scenario()).split("\n")
+        assert lines == ["2", "3", "4"]
+        assert json.loads(notice)["dropped"] == 2
+
+    def test_other_channels_and_followed_channel(self):
+        async def scenario():
+            broadcaster = LogBroadcaster(batch_ms=0)
+            subscription = broadcaster.subscribe("job1")
+            broadcaster.publish("job2", "not mine")
+            assert await subscription.next_frame(timeout=0.05) is None
+            subscription.follow("job2")
+            broadcaster.publish("job1", "old job")
+            broadcaster.publish("job2", "new job")
+            return await subscription.next_frame()
+
+        assert _run(scenario()) == "new job"
+
+    def test_publish_without_subscribers_is_noop(self):
+        broadcaster = LogBroadcaster()
+        broadcaster.publish("job1", "nobody listens")
+        assert broadcaster._pending == {}
+
+    def test_closed_subscription_unregistered(self):
+        async def scenario():
+            broadcaster = LogBroadcaster()
+            broadcaster.subscribe("job1").close()
+            return broadcaster._subscribers
+
+        assert _run(scenario()) == {}
+
+
+class TestJobManagerPublishes:
+    def test_job_lines_reach_subscribers(self, tmp_path):
+        async def scenario():
+            broadcaster = LogBroadcaster(batch_ms=0)
+            manager = JobManager(str(tmp_path), processes=False, broadcaster=broadcaster)
+            subscription = broadcaster.subscribe()
+            started, release = threading.Event(), threading.Event()
+
+            def target(job):
+                started.set()
+                release.wait(5)
+                logging.getLogger("crawler").warning("page done")
+
+            job = manager.submit(KIND_CRAWL, "https://example.com/", target)
+            subscription.follow(job.id)
+            started.wait(5)
+            release.set()
+            return await subscription.next_frame()
+
+        assert json.loads(_run(scenario()))["message"] == "page done"
@@ -0,0 +1,109 @@
+"""
+Unit tests covering:
+- Framework signature matching and rule priority
+- Rendering-mode classification (static / hydrated / csr)
+- <noscript> link counting
+- Per-page classification surfaced through parse_html
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.page_analysis import (
+    RENDER_CSR,
+    RENDER_HYDRATED,
+    RENDER_STATIC,
+    FrameworkSignature,
+    PageAnalyzer,
+    analyze_page,
+)
+from scraper.parser import parse_html
+
+
+VITE_SHELL = """<html><head>
+<script type="module" src="/assets/index-a1b2c3.js"></script>
+</head><body><div id="root"></div>
+<noscript><a href="/about">About</a><a href="/contact">Contact</a></noscript>
+</body></html>"""
+
+NEXT_SSR = """<html><body><div id="__next"><h1>Products</h1>
+<p>""" + "Server rendered copy. " * 20 + """</p></div>
+<script id="__NEXT_DATA__" type="application/json">{"props":{}}</script>
+<script src="/_next/static/chunks/main.js"></script></body></html>"""
+
+
+class TestFrameworkDetection:
+    @pytest.mark.parametrize(
+        "html,expected",
+        [
+            (VITE_SHELL, "React (Vite)"),
+            (NEXT_SSR, "Next.js"),
+            ('<div id="__nuxt"></div>', "Nuxt.js"),
+            ('<div id="root"></div><script src="/static/js/main.1.js"></script>', "React (CRA)"),
+            ('<div id="root"></div>', "React"),
+            ('<div id="app"></div>', "Vue.js"),
+            ("<app-root></app-root>", "Angular"),
+            ('<div ng-version="17.0.0"></div>', "Angular"),
+            ('<script src="/_app/immutable/start.js"></script>', "SvelteKit"),
+            ("<p>plain page</p>", None),
+        ],
+    )
+    def test_signatures(self, html, expected):
+        assert analyze_page(html).framework == expected
+
+    def test_tag_qualified_id_requires_matching_tag(self):
+        # __NEXT_DATA__ only counts on a <script>
+        assert analyze_page('<div id="__NEXT_DATA__"></div>').framework is None
+
+    def test_custom_signature_table(self):
+        analyzer = PageAnalyzer(
+            signatures=(FrameworkSignature("Remix", (r"src:/build/entry\.client",)),)
+        )
+        html = '<script src="/build/entry.client-XYZ.js"></script>'
+        assert analyzer.analyze(html).framework == "Remix"
+
+
+class TestRenderingMode:
+    def test_empty_root_is_csr(self):
+        analysis = analyze_page(VITE_SHELL)
+        assert analysis.rendering_mode == RENDER_CSR
+        assert analysis.spa_detected is True
+
+    def test_noscript_text_not_counted_as_root_content(self):
+        html = '<div id="root"><noscript>' + "Enable JavaScript " * 50 + "</noscript></div>"
+        assert analyze_page(html).rendering_mode == RENDER_CSR
+
+    def test_server_rendered_root_is_hydrated(self):
+        html = '<div id="root"><p>' + "Real content here. " * 20 + "</p></div>"
+        assert analyze_page(html).rendering_mode == RENDER_HYDRATED
+
+    def test_framework_without_root_is_hydrated(self):
+        assert analyze_page(NEXT_SSR).rendering_mode == RENDER_HYDRATED
+
+    def test_no_framework_is_static(self):
+        assert analyze_page("<h1>Hello</h1>").rendering_mode == RENDER_STATIC
+
+
+class TestNoscriptLinks:
+    def test_counts_unique_noscript_hrefs(self):
+        analysis = analyze_page(VITE_SHELL)
+        assert analysis.has_noscript_fallback is True
+        assert analysis.noscript_link_count == 2
+
+    def test_no_noscript(self):
+        analysis = analyze_page("<a href='/x'>x</a>")
+        assert analysis.has_noscript_fallback is False
+        assert analysis.noscript_link_count == 0
+
+
+class TestParseHtmlClassification:
+    def test_parse_html_reports_rendering_mode(self):
+        content = parse_html(VITE_SHELL, "https://example.com/")
+        assert content.framework == "React (Vite)"
+        assert content.rendering_mode == RENDER_CSR
@@ -0,0 +1,131 @@
+"""
+Unit tests covering:
+- ParsePool results match parse_html, across a real process boundary
+- Backpressure: submit() blocks once max_pending pages are in flight
+- A dead worker: pool restarted and the page retried once in a fresh worker;
+  a page that kills two workers fails alone, never parsed in-process
+- Scraper handing static bodies to the pool
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.parse_pool import ParsePool
+from scraper.parser import parse_html
+from scraper.scraper import Scraper
+from tests.test_parser import PAGE
+
+BASE = "https://example.com/"
+
+
+class _ManualExecutor:
+    """Executor stand-in whose futures complete only when the test says so."""
+
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.futures.append((future, fn, args))
+        return future
+
+    def finish(self, index=0):
+        future, fn, args = self.futures[index]
+        future.set_result(fn(*args))
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def _broken_executor():
+    executor = MagicMock()
+    failed = Future()
+    failed.set_exception(BrokenProcessPool("worker died"))
+    executor.submit.return_value = failed
+    return executor
+
+
+class TestParsePool:
+    def test_matches_parse_html_in_worker_process(self):
+        with ParsePool(workers=1) as pool:
+            content = pool.parse(PAGE.encode("utf-8"), BASE, profile="crawl")
+        assert asdict(content) == asdict(parse_html(PAGE, BASE, profile="crawl"))
+
+    def test_defaults_to_one_worker_per_core(self):
+        pool = ParsePool(workers=0, max_pending=0)
+        assert pool.workers == (os.cpu_count() or 1)
+        assert pool.max_pending == 2 * pool.workers
+
+    def test_submit_blocks_when_full(self):
+        pool = ParsePool(workers=1, max_pending=1)
+        executor = _ManualExecutor()
+        pool._executor = executor
+        pool.submit(b"<p>one</p>", BASE)
+
+        second = threading.Event()
+        thread = threading.Thread(target=lambda: (pool.submit(b"<p>two</p>", BASE), second.set()))
+        thread.start()
+        assert not second.wait(0.2)  # the fetch thread is held back
+
+        executor.finish(0)
+        assert second.wait(2)
+        thread.join()
+        assert len(executor.futures) == 2
+
+    def test_dead_worker_retried_in_fresh_pool(self):
+        pool = ParsePool(workers=1, max_pending=1)
+        broken = _broken_executor()
+        pool._executor = broken
+
+        with pool:
+            content = pool.parse(b"<title>Still here</title>", BASE)
+            assert content.title == "Still here"
+            broken.shutdown.assert_called_once()
+            assert pool._executor is not broken
+        # The slot taken by the failed attempt was given back
+        assert pool._slots.acquire(blocking=False)
+
+    def test_page_killing_two_workers_fails_alone(self):
+        pool = ParsePool(workers=1, max_pending=1)
+        executors = [_broken_executor(), _broken_executor()]
+        with patch("scraper.parse_pool.ProcessPoolExecutor", side_effect=executors), \
+                patch("scraper.parse_pool.parse_html") as in_process:
+            with pytest.raises(BrokenProcessPool):
+                pool.parse(b"<title>Crasher</title>", BASE)
+        in_process.assert_not_called()
+        assert all(e.shutdown.called for e in executors)
+        assert pool._executor is None  # the next page gets a fresh pool
+
+    def test_closed_pool_rejects_work(self):
+        pool = ParsePool(workers=1)
+        pool.close()
+        with pytest.raises(RuntimeError):
+            pool.submit(b"", BASE)
+
+
+class TestScraperParsePool:
+    def test_static_body_parsed_by_pool(self):
+        body = b"<html><head><title>Pooled</title></head></html>"
+        response = MagicMock(status_code=200, encoding="utf-8", headers={})
+        response.iter_content = lambda chunk_size=1: iter([body])
+        session = MagicMock()
+        session.get.return_value = response
+        pool = MagicMock()
+        pool.parse.return_value = parse_html(body.decode(), BASE)
+
+        with patch("scraper.scraper.time.sleep"):
+            content, _ = Scraper(session=session, render_cache=None, parse_pool=pool).scrape_url(BASE, profile="crawl")
+
+        pool.parse.assert_called_once_with(body, BASE, None, "crawl", schema=None)  # undeclared: sniffed in the worker
+        assert content["title"] == "Pooled"
@@ -0,0 +1,184 @@
+"""
+Unit tests covering:
+- Single-pass extraction in parse_html: nested paragraphs, headings and forms,
+  text inside script/style/template, noscript links, document order
+- Title handling when <title> is empty or has child elements
+- Extraction profiles: full, crawl, links_only, seo_head
+- ExtractedContent: slots, shallow to_dict, to_json, from_dict, mapping reads
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+from dataclasses import asdict
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.logger import JSONFormatter
+from scraper.parser import PROFILE_CRAWL, ExtractedContent, parse_html
+
+BASE = "https://example.com/"
+
+
+def _parse(html):
+    return parse_html(html, BASE, backend="html.parser")
+
+
+class TestSinglePassWalk:
+    def test_nested_paragraphs_keep_start_order(self):
+        # html.parser does not auto-close <p>, so these nest
+        content = _parse("<p>outer <p>inner</p> tail</p><p>next</p>")
+        assert content.paragraphs == ["outerinnertail", "inner", "next"]
+
+    def test_heading_text_spans_inline_children(self):
+        content = _parse("<h2>One <a href='/x'>link</a> <em>two</em></h2><h2>Three</h2>")
+        assert content.headings["h2"] == ["Onelinktwo", "Three"]
+        assert content.links == ["https://example.com/x"]
+
+    def test_empty_paragraphs_dropped(self):
+        content = _parse("<p> </p><p><img src='a.png'></p><p>kept</p>")
+        assert content.paragraphs == ["kept"]
+        assert content.images == [{"src": "https://example.com/a.png", "alt": ""}]
+
+    def test_nested_form_inputs_reported_for_both_forms(self):
+        html = (
+            "<form action='/outer'><input name='a'>"
+            "<form action='/inner' method='post'><input name='b' type='text'></form></form>"
+        )
+        forms = _parse(html).forms
+        assert [f["action"] for f in forms] == ["/outer", "/inner"]
+        assert [i["name"] for i in forms[0]["inputs"]] == ["a", "b"]
+        assert forms[1]["method"] == "post"
+        assert forms[1]["inputs"] == [{"name": "b", "type": "text", "placeholder": None}]
+
+    def test_script_style_template_text_excluded(self):
+        html = (
+            "<p>visible<script>var hidden = 1</script></p><style>p{}</style>"
+            "<template><p>inert</p></template><!-- note -->"
+        )
+        content = _parse(html)
+        assert content.text_content == "visible"
+        assert content.paragraphs == ["visible"]
+
+    def test_noscript_links_counted_once_per_href(self):
+        html = (
+            "<div id='root'></div><script src='/static/js/main.js'></script>"
+            "<noscript><a href='/a'>a</a><a href='/a'>again</a><a href='/b'>b</a></noscript>"
+        )
+        content = _parse(html)
+        assert content.framework == "React (CRA)"
+        assert content.links == ["https://example.com/a", "https://example.com/b"]
+
+    def test_first_meta_description_wins(self):
+        html = "<meta name='description' content=' first '><meta name='description' content='second'>"
+        assert _parse(html).meta_description == "first"
+
+
+class TestTitle:
+    def test_missing_title(self):
+        assert _parse("<p>no title</p>").title == ""
+
+    def test_empty_title(self):
+        assert _parse("<title></title>").title == ""
+
+    def test_title_with_child_elements_does_not_raise(self):
+        assert _parse("<title>Shop <b>now</b></title>").title == ""
+
+
+PAGE = """<html><head>
+<title>Catalogue</title>
+<meta name="description" content="All products">
+<meta name="ROBOTS" content="noindex, follow">
+<link rel="alternate stylesheet" href="/alt.css"><link rel="Canonical" href=" /catalogue ">
+<script id="__NEXT_DATA__" type="application/json">{"props": {"page": {"href": "/from-payload"}}}</script>
+</head><body>
+<h1>Products</h1><p>Intro <a href="/p/1">one</a></p>
+<img src="/i.png"><form action="/s"><input name="q"></form>
+<a href="/p/2">two</a>
+</body></html>"""
+
+
+class TestProfiles:
+    def test_full_reports_head_signals(self):
+        content = parse_html(PAGE, BASE)
+        assert content.canonical == "/catalogue"
+        assert content.meta_robots == "noindex, follow"
+        assert content.forms and content.images
+
+    def test_links_only_matches_full_links(self):
+        full = parse_html(PAGE, BASE)
+        links_only = parse_html(PAGE, BASE, profile="links_only")
+        assert links_only.links == full.links
+        assert "https://example.com/from-payload" in links_only.links
+        assert links_only.title == "" and links_only.paragraphs == [] and links_only.text_content == ""
+        assert links_only.structured_data is None
+
+    def test_seo_head_reads_head_only(self):
+        content = parse_html(PAGE, BASE, profile="seo_head")
+        assert content.title == "Catalogue"
+        assert content.meta_description == "All products"
+        assert content.canonical == "/catalogue"
+        assert content.meta_robots == "noindex, follow"
+        assert content.links == [] and content.headings == {}
+
+    def test_seo_head_without_closing_head(self):
+        html = "<title>Open</title><meta name='robots' content='noindex'><body><title>Body</title>"
+        content = parse_html(html, BASE, profile="seo_head")
+        assert content.title == "Open"
+        assert content.meta_robots == "noindex"
+
+    def test_crawl_profile_keeps_spa_heuristic_fields(self):
+        full = parse_html(PAGE, BASE)
+        crawl = parse_html(PAGE, BASE, profile=PROFILE_CRAWL)
+        for field in ("links", "headings", "paragraphs", "text_content", "rendering_mode", "structured_data"):
+            assert getattr(crawl, field) == getattr(full, field)
+        assert crawl.images == [] and crawl.forms == []
+
+    def test_unknown_profile_rejected(self):
+        with pytest.raises(ValueError):
+            parse_html(PAGE, BASE, profile="everything")
+
+
+class TestExtractedContent:
+    def _content(self):
+        return _parse('<title>T</title><h1>H</h1><p>P</p><a href="/a">a</a>')
+
+    def test_slotted(self):
+        content = self._content()
+        assert not hasattr(content, "__dict__")
+        with pytest.raises(AttributeError):
+            content.not_a_field = 1
+
+    def test_to_dict_is_shallow(self):
+        content = self._content()
+        data = content.to_dict()
+        assert data == asdict(content)
+        assert data["links"] is content.links
+
+    def test_to_json_bytes(self):
+        content = self._content()
+        assert json.loads(content.to_json()) == asdict(content)
+
+    def test_from_dict_roundtrip(self):
+        content = self._content()
+        assert ExtractedContent.from_dict(json.loads(content.to_json())) == content
+        assert ExtractedContent.from_dict({"title": "x", "url": "ignored"}).title == "x"
+
+    def test_mapping_reads(self):
+        content = self._content()
+        assert content["title"] == "T"
+        assert content.get("links") == ["https://example.com/a"]
+        assert content.get("missing", "default") == "default"
+        with pytest.raises(KeyError):
+            content["missing"]
+
+    def test_log_formatter_encodes_content(self):
+        content = self._content()
+        record = logging.LogRecord("scraper", logging.INFO, __file__, 1, "Extracted content", None, None)
+        record.data = content
+        assert json.loads(JSONFormatter().format(record))["data"] == asdict(content)
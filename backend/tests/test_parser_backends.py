@@ -0,0 +1,208 @@
+"""
+Unit tests covering:
+- Conformance: every installed parser backend yields the same ExtractedContent
+  as html.parser across a corpus of representative pages
+- Malformed markup: each known divergence between html.parser and the
+  HTML5-repairing lxml / Lexbor trees, asserted field by field
+- Backend resolution and fallback when a library is missing
+- Deterministic (document-order) link deduplication
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from dataclasses import asdict
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper import parser_backends
+from scraper.parser import parse_html
+from scraper.parser_backends import available_backends, resolve_backend
+
+BASE = "https://example.com/shop/"
+
+ARTICLE = """<!DOCTYPE html>
+<html lang="en"><head>
+<meta charset="utf-8">
+<title>  Field notes &amp; essays </title>
+<meta name="description" content=" Long-form writing about crawling. ">
+<meta name="robots" content="index,follow">
+<link rel="canonical" href="https://example.com/notes/">
+<style>body { color: #333 }</style>
+<script type="application/ld+json">{"@type": "Article", "headline": "Notes"}</script>
+</head><body>
+<header><nav>
+  <a href="/">Home</a> <a href="/notes/">Notes</a> <a href="https://other.org/x">Elsewhere</a>
+  <a href="#top">Top</a> <a href="mailto:me@example.com">Mail</a>
+</nav></header>
+<main><article>
+  <h1>Crawling <em>politely</em></h1>
+  <p>First paragraph with <a href="rel/page">a relative link</a> and <b>bold</b> text.</p>
+  <p>   </p>
+  <h2>Section one</h2>
+  <p>Caf&eacute; &mdash; entities &lt;decoded&gt;.</p>
+  <!-- a comment that is not text -->
+  <h2>Section two</h2><h3>Sub</h3>
+  <p>Repeated <a href="/notes/">Notes</a> link.</p>
+  <img src="/img/a.png" alt="A"><img src="b.jpg"><img alt="no src">
+</article></main>
+<footer><p>&copy; 2024</p><script>console.log("<p>not a paragraph</p>")</script></footer>
+</body></html>
+"""
+
+STORE = """<html><head><title>Store</title></head><body>
+<div class="grid">
+  <div class="card"><h4>Item 1</h4><a href="/p/1"><img src="/i/1.jpg" alt="one"></a><p>$10</p></div>
+  <div class="card"><h4>Item 2</h4><a href="/p/2"><img src="/i/2.jpg" alt="two"></a><p>$20</p></div>
+  <div class="card"><h4>Item 3</h4><a href="/p/3?ref=grid"><img src="/i/3.jpg" alt=""></a><p>$30</p></div>
+</div>
+<form action="/search" method="post">
+  <input name="q" type="search" placeholder="Search">
+  <input type="submit">
+</form>
+<form><input name="email"></form>
+<h5>Small</h5><h6>Smaller</h6>
+</body></html>
+"""
+
+NEXT_SSR = """<html><head><title>Next page</title></head><body>
+<div id="__next"><h1>Server rendered</h1><p>""" + "Plenty of server-rendered text. " * 10 + """</p>
+<a href="/docs/intro">Intro</a></div>
+<script id="__NEXT_DATA__" type="application/json">{"props": {"pageProps": {"items": [{"href": "/docs/advanced"}]}}}</script>
+<script src="/_next/static/chunks/main.js"></script>
+</body></html>
+"""
+
+SPA_SHELL = """<!doctype html><html><head><title>App</title>
+<script type="module" src="/assets/index-abc123.js"></script></head>
+<body><div id="root"></div>
+<noscript><p>You need to enable JavaScript to run this app.</p><a href="/sitemap">Sitemap</a></noscript>
+</body></html>
+"""
+
+# Broken markup as CMSs and hand-written pages ship it
+MALFORMED = {
+    "unclosed_p": "<html><body><p>One<p>Two<div>Block</div>tail</body></html>",
+    "p_in_p": "<html><body><p>Outer <p>inner</p> after</p></body></html>",
+    "unclosed_h1": "<html><body><h1>Title<p>Body text</p><h2>Next</h2></body></html>",
+    "h_in_h": "<html><body><h1>A<h2>B</h2>C</h1></body></html>",
+    "nested_form": ("<html><body><form action='/a'><input name='x'>"
+                    "<form action='/b'><input name='y'></form></form></body></html>"),
+    "textarea": "<html><body><form><textarea name='t'><p>not markup</p></textarea></form><p>real</p></body></html>",
+    "template": "<html><body><template><p>hidden</p><a href='/t'>t</a></template><p>shown</p></body></html>",
+    "stray_close": "<html><body></div><p>x</p></span><table><p>in table</p></table></body></html>",
+}
+
+CORPUS = {"article": ARTICLE, "store": STORE, "next_ssr": NEXT_SSR, "spa_shell": SPA_SHELL, **MALFORMED}
+
+
+def _headings(**levels):
+    return {f"h{i}": levels.get(f"h{i}", []) for i in range(1, 7)}
+
+
+def _form(action, *names):
+    return {"action": action, "method": "get", "inputs": [{"name": n, "type": None, "placeholder": None} for n in names]}
+
+
+# html.parser keeps the nesting the markup spells out: an unclosed <p> or <h1>
+# swallows everything after it, a <form> inside a <form> is kept, and <textarea>
+# content is parsed as tags. lxml and Lexbor repair the tree the way a browser
+# does, and Lexbor also keeps <template> contents out of the document.
+# (page, backend) -> {field: (html.parser value, backend value)}
+DIVERGENCES = {
+    ("unclosed_p", "lxml"): {"paragraphs": (["OneTwoBlocktail", "TwoBlocktail"], ["One", "Two"])},
+    ("unclosed_p", "selectolax"): {"paragraphs": (["OneTwoBlocktail", "TwoBlocktail"], ["One", "Two"])},
+    ("p_in_p", "lxml"): {"paragraphs": (["Outerinnerafter", "inner"], ["Outer", "inner"])},
+    ("p_in_p", "selectolax"): {"paragraphs": (["Outerinnerafter", "inner"], ["Outer", "inner"])},
+    ("unclosed_h1", "lxml"): {"headings": (_headings(h1=["TitleBody textNext"], h2=["Next"]),
+                                           _headings(h1=["Title"], h2=["Next"]))},
+    ("unclosed_h1", "selectolax"): {"headings": (_headings(h1=["TitleBody textNext"], h2=["Next"]),
+                                                 _headings(h1=["TitleBody text"], h2=["Next"]))},
+    ("h_in_h", "selectolax"): {"headings": (_headings(h1=["ABC"], h2=["B"]), _headings(h1=["A"], h2=["B"]))},
+    ("nested_form", "lxml"): {"forms": ([_form("/a", "x", "y"), _form("/b", "y")],
+                                        [_form("/a", "x"), _form("/b", "y")])},
+    ("nested_form", "selectolax"): {"forms": ([_form("/a", "x", "y"), _form("/b", "y")], [_form("/a", "x", "y")])},
+    ("textarea", "lxml"): {"paragraphs": (["not markup", "real"], ["real"]),
+                           "text_content": ("not markup\nreal", "<p>not markup</p>\nreal")},
+    ("textarea", "selectolax"): {"paragraphs": (["not markup", "real"], ["real"]),
+                                 "text_content": ("not markup\nreal", "<p>not markup</p>\nreal")},
+    ("template", "selectolax"): {"links": (["https://example.com/t"], [])},
+}
+
+ALTERNATIVES = ("lxml", "selectolax")
+
+
+def _content(html, backend):
+    return asdict(parse_html(html, BASE, backend=backend))
+
+
+class TestConformance:
+    @pytest.mark.parametrize("backend", ALTERNATIVES)
+    @pytest.mark.parametrize("page", sorted(CORPUS))
+    def test_matches_html_parser(self, backend, page):
+        pytest.importorskip(backend)
+        expected = _content(CORPUS[page], "html.parser")
+        actual = _content(CORPUS[page], backend)
+        for field, (reference, divergent) in DIVERGENCES.get((page, backend), {}).items():
+            assert expected[field] == reference
+            expected[field] = divergent
+        assert actual == expected
+
+    @pytest.mark.parametrize("backend", ALTERNATIVES)
+    @pytest.mark.parametrize("profile", ["crawl", "links_only", "seo_head"])
+    def test_profiles_match_html_parser(self, backend, profile):
+        pytest.importorskip(backend)
+        for page, html in CORPUS.items():
+            expected = asdict(parse_html(html, BASE, backend="html.parser", profile=profile))
+            actual = asdict(parse_html(html, BASE, backend=backend, profile=profile))
+            for field in DIVERGENCES.get((page, backend), {}):
+                del expected[field], actual[field]
+            assert actual == expected
+
+    def test_reference_output(self):
+        content = parse_html(ARTICLE, BASE, backend="html.parser")
+        assert content.title == "Field notes & essays"
+        assert content.meta_description == "Long-form writing about crawling."
+        assert content.headings["h1"] == ["Crawlingpolitely"]
+        assert content.headings["h2"] == ["Section one", "Section two"]
+        assert content.paragraphs[1] == "Café — entities <decoded>."
+        assert "not a paragraph" not in content.text_content
+        assert "a comment" not in content.text_content
+        assert content.images[1] == {"src": "https://example.com/shop/b.jpg", "alt": ""}
+        assert len(content.images) == 2
+
+
+class TestLinkOrder:
+    def test_links_deduped_in_document_order(self):
+        links = parse_html(ARTICLE, BASE).links
+        assert links[:3] == [
+            "https://example.com/",
+            "https://example.com/notes/",
+            "https://other.org/x",
+        ]
+        assert links.count("https://example.com/notes/") == 1
+
+    def test_payload_links_follow_markup_links(self):
+        links = parse_html(NEXT_SSR, BASE).links
+        assert links == ["https://example.com/docs/intro", "https://example.com/docs/advanced"]
+
+
+class TestBackendResolution:
+    def test_html_parser_always_available(self):
+        assert "html.parser" in available_backends()
+        assert resolve_backend("html.parser") == "html.parser"
+
+    def test_unknown_backend_falls_back(self):
+        assert resolve_backend("html5lib-turbo") == "html.parser"
+
+    def test_missing_library_falls_back(self, monkeypatch):
+        monkeypatch.setattr(parser_backends, "LexborHTMLParser", None)
+        assert resolve_backend("selectolax") == "html.parser"
+        assert parse_html(STORE, BASE, backend="selectolax").title == "Store"
+
+    def test_configured_backend_used_by_default(self, monkeypatch):
+        monkeypatch.setattr(parser_backends.Config, "PARSER_BACKEND", "html.parser")
+        assert resolve_backend() == "html.parser"
@@ -0,0 +1,162 @@
+"""
+Unit tests covering:
+- Render-cache keys: URL + static fingerprint (ETag or body hash), or HEAD
+  validators (ETag / Last-Modified + Content-Length) when nothing was fetched
+- LRU eviction by entry count and size, max-age expiry, on-disk persistence
+- Scraper reusing a cached render instead of driving the browser; bounded
+  memory of static-fetch fingerprints awaiting a render
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.parser import ExtractedContent
+from scraper.render_cache import RenderCache, fingerprint_headers, fingerprint_response
+from scraper.scraper import Scraper
+
+URL = "https://example.com/app"
+CONTENT = {"url": URL, "title": "App", "links": ["https://example.com/a"]}
+RENDERED = ExtractedContent.from_dict(CONTENT)
+
+
+def _response(body: bytes = b"<html></html>", etag: str = None, headers: dict = None) -> MagicMock:
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.content = body
+    resp.text = body.decode()
+    resp.headers = {"ETag": etag} if etag else dict(headers or {})
+    resp.encoding = "utf-8"
+    resp.iter_content = lambda chunk_size=1: iter([body])
+    return resp
+
+
+class TestFingerprint:
+    def test_etag_preferred(self):
+        assert fingerprint_response(_response(etag='"v1"')) == 'etag:"v1"'
+
+    def test_body_hash_without_etag(self):
+        a = fingerprint_response(_response(b"<p>one</p>"))
+        b = fingerprint_response(_response(b"<p>two</p>"))
+        assert a.startswith("sha256:") and a != b
+
+    def test_head_validators(self):
+        assert fingerprint_headers({"ETag": '"v1"', "Last-Modified": "x"}) == 'etag:"v1"'
+        modified = {"Last-Modified": "Mon, 05 Oct 2026 10:00:00 GMT", "Content-Length": "512"}
+        assert fingerprint_headers(modified) != fingerprint_headers({**modified, "Content-Length": "513"})
+        assert fingerprint_headers({"Content-Length": "512"}) is None
+
+
+class TestRenderCache:
+    def test_roundtrip(self, tmp_path):
+        cache = RenderCache(str(tmp_path))
+        cache.put(URL, "etag:1", CONTENT, CONTENT["links"])
+        assert cache.get(URL, "etag:1") == (CONTENT, CONTENT["links"])
+
+    def test_changed_fingerprint_misses(self, tmp_path):
+        cache = RenderCache(str(tmp_path))
+        cache.put(URL, "etag:1", CONTENT, [])
+        assert cache.get(URL, "etag:2") is None
+
+    def test_missing_fingerprint_never_cached(self, tmp_path):
+        cache = RenderCache(str(tmp_path))
+        cache.put(URL, None, CONTENT, [])
+        assert cache.get(URL, None) is None
+        assert len(cache) == 0
+
+    def test_persists_across_instances(self, tmp_path):
+        RenderCache(str(tmp_path)).put(URL, "etag:1", CONTENT, [])
+        assert RenderCache(str(tmp_path)).get(URL, "etag:1") is not None
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = RenderCache(str(tmp_path), max_entries=2)
+        cache.put("https://example.com/1", "f", CONTENT, [])
+        time.sleep(0.01)
+        cache.put("https://example.com/2", "f", CONTENT, [])
+        time.sleep(0.01)
+        cache.get("https://example.com/1", "f")  # refresh 1
+        time.sleep(0.01)
+        cache.put("https://example.com/3", "f", CONTENT, [])
+        assert len(cache) == 2
+        assert cache.get("https://example.com/2", "f") is None
+        assert cache.get("https://example.com/1", "f") is not None
+
+    def test_size_bound(self, tmp_path):
+        cache = RenderCache(str(tmp_path), max_mb=0)
+        cache.put(URL, "f", CONTENT, [])
+        # The entry just written is kept even when it alone exceeds the bound
+        assert len(cache) == 1
+        cache.put(URL + "/2", "f", CONTENT, [])
+        assert len(cache) == 1
+
+    def test_expired_entry_ignored(self, tmp_path):
+        cache = RenderCache(str(tmp_path), max_age_hours=1)
+        cache.put(URL, "f", CONTENT, [])
+        with patch("scraper.render_cache.time.time", return_value=time.time() + 7200):
+            assert cache.get(URL, "f") is None
+
+
+class TestScraperRenderCache:
+    def _scraper(self, tmp_path, body=b"<html><div id='root'></div></html>"):
+        session = MagicMock()
+        session.get.return_value = _response(body)
+        session.head.return_value = _response(b"", etag='"v1"')
+        return Scraper(session=session, render_cache=RenderCache(str(tmp_path)))
+
+    def test_second_render_served_from_cache(self, tmp_path):
+        scraper = self._scraper(tmp_path)
+        driver = MagicMock()
+        with patch.object(scraper, "_render_page", return_value=(RENDERED, RENDERED.links)) as render:
+            first = scraper.scrape_dynamic(URL, driver)
+            second = scraper.scrape_dynamic(URL, driver)
+        assert render.call_count == 1
+        assert first == second
+
+    def test_static_fetch_fingerprint_reused(self, tmp_path):
+        scraper = self._scraper(tmp_path)
+        with patch("scraper.scraper.time.sleep"):
+            content, _ = scraper.scrape_url(URL)
+        assert content is not None
+        scraper.session.get.reset_mock()
+        with patch.object(scraper, "_render_page", return_value=(RENDERED, [])):
+            scraper.scrape_dynamic(URL, MagicMock())
+        # The render used the static fetch's fingerprint — no extra request
+        scraper.session.get.assert_not_called()
+        scraper.session.head.assert_not_called()
+
+    def test_unrendered_fingerprints_bounded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("scraper.scraper._MAX_PENDING_FINGERPRINTS", 3)
+        scraper = self._scraper(tmp_path)
+        with patch("scraper.scraper.time.sleep"):
+            for i in range(5):
+                scraper.scrape_url(f"{URL}/{i}")
+        assert list(scraper._fingerprints) == [f"{URL}/{i}" for i in (2, 3, 4)]
+
+    def test_changed_shell_renders_again(self, tmp_path):
+        scraper = self._scraper(tmp_path)
+        with patch.object(scraper, "_render_page", return_value=(RENDERED, [])) as render:
+            scraper.scrape_dynamic(URL, MagicMock())
+            scraper.session.head.return_value = _response(b"", etag='"v2"')
+            scraper.scrape_dynamic(URL, MagicMock())
+        assert render.call_count == 2
+
+    def test_no_validators_skips_cache_without_get(self, tmp_path):
+        scraper = self._scraper(tmp_path)
+        scraper.session.head.return_value = _response(b"", headers={"Content-Length": "512"})
+        with patch.object(scraper, "_render_page", return_value=(RENDERED, [])) as render:
+            scraper.scrape_dynamic(URL, MagicMock())
+            scraper.scrape_dynamic(URL, MagicMock())
+        assert render.call_count == 2
+        assert len(scraper.render_cache) == 0
+        scraper.session.get.assert_not_called()
+
+    def test_failed_render_not_cached(self, tmp_path):
+        scraper = self._scraper(tmp_path)
+        with patch.object(scraper, "_render_page", return_value=(None, [])):
+            scraper.scrape_dynamic(URL, MagicMock())
+        assert len(scraper.render_cache) == 0
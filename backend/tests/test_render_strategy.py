@@ -0,0 +1,69 @@
+"""
+Unit tests covering:
+- URL path templating
+- Learning per-template fetch strategy from static outcomes
+- Host default seeding and periodic static re-checks
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.render_strategy import (
+    FETCH_RENDER,
+    FETCH_STATIC,
+    RenderStrategyCache,
+    path_template,
+)
+
+
+class TestPathTemplate:
+    def test_numeric_ids_collapse(self):
+        assert path_template("https://Example.com/products/123") == ("example.com", "/products/{n}")
+        assert path_template("https://example.com/products/456")[1] == "/products/{n}"
+
+    def test_uuid_and_mixed_segments(self):
+        assert path_template("https://example.com/o/3f2b9c1e-aaaa-4bbb-8ccc-123456789abc")[1] == "/o/{h}"
+        assert path_template("https://example.com/page2/x")[1] == "/{v}/x"
+
+    def test_slug_tail_collapses_below_first_level(self):
+        assert path_template("https://example.com/blog/my-first-post")[1] == "/blog/{slug}"
+        assert path_template("https://example.com/about-us")[1] == "/about-us"
+
+    def test_query_ignored(self):
+        assert path_template("https://example.com/?page=2")[1] == "/"
+
+
+class TestRenderStrategyCache:
+    def test_unknown_defaults_to_static(self):
+        assert RenderStrategyCache().decide("https://example.com/x") == FETCH_STATIC
+
+    def test_learns_render_after_min_samples(self):
+        cache = RenderStrategyCache(min_samples=2)
+        cache.record("https://example.com/app/1", True)
+        assert cache.decide("https://example.com/app/2") == FETCH_STATIC
+        cache.record("https://example.com/app/2", True)
+        assert cache.decide("https://example.com/app/3") == FETCH_RENDER
+        assert cache.decide("https://example.com/other") == FETCH_STATIC
+
+    def test_host_seed_applies_to_unlearned_templates(self):
+        cache = RenderStrategyCache()
+        cache.seed("https://spa.example.com/", True)
+        assert cache.decide("https://spa.example.com/dashboard") == FETCH_RENDER
+        assert cache.decide("https://other.example.com/dashboard") == FETCH_STATIC
+
+    def test_learned_static_overrides_seed(self):
+        cache = RenderStrategyCache(min_samples=2)
+        cache.seed("https://example.com/", True)
+        cache.record("https://example.com/blog/a-post", False)
+        cache.record("https://example.com/blog/b-post", False)
+        assert cache.decide("https://example.com/blog/c-post") == FETCH_STATIC
+
+    def test_render_templates_are_periodically_rechecked(self):
+        cache = RenderStrategyCache(recheck_every=3)
+        cache.seed("https://example.com/", True)
+        decisions = [cache.decide(f"https://example.com/p/{i}") for i in range(6)]
+        assert decisions.count(FETCH_STATIC) == 2
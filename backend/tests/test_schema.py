@@ -0,0 +1,152 @@
+"""
+Unit tests covering:
+- compile_schema validation (bad selectors, unknown keys, css/xpath exclusivity)
+- CSS and XPath fields: text, attributes (resolved URLs), many, regex, types,
+  scalar XPath results (string(), count(), boolean())
+- parse_html(schema=...) on both tree backends, and schema pickling for the parse pool
+- Scraper adding schema_fields to static pages
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.parser import parse_html
+from scraper.parser_backends import available_backends
+from scraper.schema import compile_schema, etree
+from scraper.scraper import Scraper
+
+BASE = "https://shop.example.com/p/42"
+
+PRODUCT = """
+<html><head><title>Kettle</title></head><body>
+  <h1 class="product-title">Steel <em>Kettle</em></h1>
+  <span class="price">$1,299.50</span>
+  <span itemprop="sku">KT-0042</span>
+  <p class="availability">Only 7 in stock</p>
+  <img class="gallery" src="/img/1.jpg"><img class="gallery" src="/img/2.jpg">
+  <a class="brand" href="/brand/acme">Acme</a>
+</body></html>
+"""
+
+SPEC = {
+    "name": "h1.product-title",
+    "price": {"css": ".price", "type": "number"},
+    "stock": {"css": ".availability", "regex": r"(\d+) in stock", "type": "int"},
+    "gallery": {"css": "img.gallery", "attr": "src", "many": True},
+    "brand_url": {"css": "a.brand", "attr": "href"},
+    "missing": {"css": ".nope"},
+}
+
+EXPECTED = {
+    "name": "Steel Kettle",
+    "price": 1299.5,
+    "stock": 7,
+    "gallery": ["https://shop.example.com/img/1.jpg", "https://shop.example.com/img/2.jpg"],
+    "brand_url": "https://shop.example.com/brand/acme",
+    "missing": None,
+}
+
+needs_lxml = pytest.mark.skipif(etree is None, reason="lxml not installed")
+
+
+class TestCompile:
+    def test_empty_schema_is_none(self):
+        assert compile_schema(None) is None
+        assert compile_schema({}) is None
+
+    @pytest.mark.parametrize("spec", [
+        {"price": {"css": "div[", "type": "number"}},
+        {"price": {"css": ".p", "xpath": "//p"}},
+        {"price": {}},
+        {"price": {"css": ".p", "colour": "red"}},
+        {"price": {"css": ".p", "type": "money"}},
+        {"price": {"css": ".p", "regex": "("}},
+        {"price": 42},
+    ])
+    def test_invalid_specs_rejected(self, spec):
+        with pytest.raises(ValueError):
+            compile_schema(spec)
+
+    @needs_lxml
+    def test_invalid_xpath_rejected(self):
+        with pytest.raises(ValueError):
+            compile_schema({"sku": {"xpath": "//span[@"}})
+
+
+class TestExtract:
+    def test_css_fields(self):
+        assert compile_schema(SPEC).extract(PRODUCT, BASE) == EXPECTED
+
+    @needs_lxml
+    def test_xpath_fields(self):
+        schema = compile_schema({
+            "sku": {"xpath": "//span[@itemprop='sku']/text()"},
+            "title": {"xpath": "//h1"},
+            "images": {"xpath": "//img[@class='gallery']", "attr": "src", "many": True},
+        })
+        assert schema.extract(PRODUCT, BASE) == {
+            "sku": "KT-0042",
+            "title": "Steel Kettle",
+            "images": ["https://shop.example.com/img/1.jpg", "https://shop.example.com/img/2.jpg"],
+        }
+
+    @needs_lxml
+    def test_xpath_scalar_results(self):
+        schema = compile_schema({
+            "sku": {"xpath": "string(//span[@itemprop='sku'])"},
+            "images": {"xpath": "count(//img)", "type": "int"},
+            "has_brand": {"xpath": "boolean(//a[@class='brand'])"},
+            "has_video": {"xpath": "boolean(//video)"},
+            "many_sku": {"xpath": "string(//span[@itemprop='sku'])", "many": True},
+        })
+        assert schema.extract(PRODUCT, BASE) == {
+            "sku": "KT-0042",
+            "images": 2,
+            "has_brand": "true",
+            "has_video": "false",
+            "many_sku": ["KT-0042"],
+        }
+
+    @needs_lxml
+    def test_xpath_on_empty_page(self):
+        assert compile_schema({"sku": {"xpath": "//span"}}).extract("", BASE) == {"sku": None}
+
+    def test_pickles_for_parse_workers(self):
+        schema = pickle.loads(pickle.dumps(compile_schema(SPEC)))
+        assert schema.extract(PRODUCT, BASE) == EXPECTED
+
+
+class TestParseHtml:
+    @pytest.mark.parametrize("backend", available_backends())
+    def test_schema_fields_on_every_backend(self, backend):
+        content = parse_html(PRODUCT, BASE, backend=backend, schema=compile_schema(SPEC))
+        assert content.schema_fields == EXPECTED
+        assert content.title == "Kettle"
+
+    def test_no_schema_no_fields(self):
+        assert parse_html(PRODUCT, BASE).schema_fields is None
+
+    def test_head_only_profile_still_sees_body(self):
+        content = parse_html(PRODUCT, BASE, profile="seo_head", schema=compile_schema({"sku": "[itemprop=sku]"}))
+        assert content.schema_fields == {"sku": "KT-0042"}
+
+
+class TestScraperSchema:
+    def test_static_page_gets_schema_fields(self):
+        body = PRODUCT.encode()
+        response = MagicMock(status_code=200, encoding="utf-8", headers={})
+        response.iter_content = lambda chunk_size=1: iter([body])
+        session = MagicMock()
+        session.get.return_value = response
+        scraper = Scraper(session=session, render_cache=None, schema=compile_schema(SPEC))
+        with patch("scraper.scraper.time.sleep"):
+            content, _ = scraper.scrape_url(BASE)
+        assert content["schema_fields"] == EXPECTED
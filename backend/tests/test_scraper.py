@@ -0,0 +1,201 @@
+"""
+Unit tests covering:
+- Event-driven auto-scroll termination (page stops growing, step and time caps)
+- In-browser extraction vs. page_source transfer in scrape_dynamic
+- Multi-tab rendering: result order, tab limit, cleanup after failures,
+  resource blocking in every tab, waiting for each tab's load event
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from unittest.mock import MagicMock, PropertyMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.driver_manager import ResourcePolicy
+from scraper.scraper import Scraper, _document_complete
+
+
+def _scroll_driver(grow_steps: int) -> MagicMock:
+    """Driver whose page grows for grow_steps scrolls, then stops."""
+    driver = MagicMock()
+    calls = {"n": 0}
+
+    def _step(script, idle_ms, timeout_ms):
+        calls["n"] += 1
+        return {"height": 1000 * calls["n"], "grew": calls["n"] <= grow_steps}
+
+    driver.execute_async_script.side_effect = _step
+    return driver
+
+
+class TestAutoScroll:
+    def test_static_page_takes_one_step(self):
+        driver = _scroll_driver(grow_steps=0)
+        assert Scraper().auto_scroll(driver) == 1
+
+    def test_stops_when_page_stops_growing(self):
+        driver = _scroll_driver(grow_steps=3)
+        assert Scraper().auto_scroll(driver) == 4
+
+    def test_infinite_feed_capped_by_steps(self):
+        driver = _scroll_driver(grow_steps=10_000)
+        assert Scraper().auto_scroll(driver, max_steps=5) == 5
+
+    def test_infinite_feed_capped_by_time(self):
+        driver = _scroll_driver(grow_steps=10_000)
+        assert Scraper().auto_scroll(driver, max_seconds=0) == 0
+        driver.execute_async_script.assert_not_called()
+
+    def test_step_timeout_never_exceeds_remaining_time(self):
+        driver = _scroll_driver(grow_steps=0)
+        Scraper().auto_scroll(driver, max_seconds=0.5)
+        _, _, timeout_ms = driver.execute_async_script.call_args.args
+        assert timeout_ms <= 500
+
+    def test_script_error_ends_scroll(self):
+        driver = MagicMock()
+        driver.execute_async_script.side_effect = Exception("script timeout")
+        assert Scraper().auto_scroll(driver) == 0
+
+
+BROWSER_PAYLOAD = {
+    "title": "Shop",
+    "meta_description": "Things",
+    "headings": {"h1": ["Shop"], "h2": [], "h3": [], "h4": [], "h5": [], "h6": []},
+    "paragraphs": ["Hello"],
+    "links": ["https://example.com/a", "https://example.com/b"],
+    "images": [{"src": "https://example.com/i.png", "alt": ""}],
+    "forms": [],
+    "text_content": "Shop\nHello",
+}
+
+
+def _render_driver() -> MagicMock:
+    driver = MagicMock()
+    driver.execute_script.return_value = BROWSER_PAYLOAD
+    driver.execute_async_script.return_value = {"height": 100, "grew": False}
+    driver.page_source_mock = PropertyMock(return_value="<html><title>From HTML</title></html>")
+    type(driver).page_source = driver.page_source_mock
+    return driver
+
+
+class TestDynamicExtraction:
+    def test_browser_mode_skips_page_source(self):
+        driver = _render_driver()
+        with patch("scraper.scraper.WebDriverWait"):
+            content, links = Scraper().scrape_dynamic("https://example.com/", driver, extraction="browser")
+        assert content["title"] == "Shop"
+        assert links == ["https://example.com/a", "https://example.com/b"]
+        assert driver.page_source_mock.call_count == 0
+
+    def test_html_mode_parses_page_source(self):
+        driver = _render_driver()
+        with patch("scraper.scraper.WebDriverWait"):
+            content, _ = Scraper().scrape_dynamic("https://example.com/", driver, extraction="html")
+        assert content["title"] == "From HTML"
+        assert driver.page_source_mock.call_count == 1
+
+    def test_missing_fields_default_empty(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = {"title": "Only title"}
+        content = Scraper().extract_in_browser(driver)
+        assert content.title == "Only title"
+        assert content.links == []
+        assert content.headings == {}
+
+
+class _TabbedDriver:
+    """Minimal WebDriver double with window handles; each tab "renders" its URL."""
+
+    def __init__(self, fail_urls=(), resource_policy=None):
+        self.window_handles = ["main"]
+        self.current_window_handle = "main"
+        self.tab_urls = {"main": "about:blank"}
+        self.fail_urls = set(fail_urls)
+        self.max_open = 1
+        self.resource_policy = resource_policy
+        self.blocked = {}  # handle -> URL patterns blocked before the tab navigated
+        self.switch_to = MagicMock()
+        self.switch_to.window.side_effect = self._switch
+
+    def _switch(self, handle):
+        self.current_window_handle = handle
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == "Network.setBlockedURLs" and self.tab_urls[self.current_window_handle] == "about:blank":
+            self.blocked[self.current_window_handle] = params["urls"]
+
+    def execute_script(self, script, *args):
+        if "window.open" in script:
+            handle = f"tab{len(self.tab_urls)}"
+            self.window_handles.append(handle)
+            self.tab_urls[handle] = "about:blank"
+            self.max_open = max(self.max_open, len(self.window_handles) - 1)
+            return None
+        if "location.href" in script:
+            self.tab_urls[self.current_window_handle] = args[0]
+            return None
+        if "readyState" in script:
+            return "complete"
+        url = self.tab_urls[self.current_window_handle]
+        if url in self.fail_urls:
+            raise RuntimeError("renderer crashed")
+        return {"title": url, "links": [url + "/next"]}
+
+    def execute_async_script(self, *args):
+        return {"height": 100, "grew": False}
+
+    def close(self):
+        self.window_handles.remove(self.current_window_handle)
+
+
+class TestMultiTab:
+    URLS = [f"https://example.com/p{i}" for i in range(5)]
+
+    def test_results_align_with_urls(self):
+        driver = _TabbedDriver()
+        with patch("scraper.scraper.WebDriverWait"):
+            results = Scraper().scrape_dynamic_many(self.URLS, driver, tabs=3)
+        assert [content["title"] for content, _ in results] == self.URLS
+        assert results[2][1] == ["https://example.com/p2/next"]
+
+    def test_open_tabs_capped(self):
+        driver = _TabbedDriver()
+        with patch("scraper.scraper.WebDriverWait"):
+            Scraper().scrape_dynamic_many(self.URLS, driver, tabs=2)
+        assert driver.max_open == 2
+
+    def test_failed_tab_isolated_and_closed(self):
+        driver = _TabbedDriver(fail_urls={"https://example.com/p1"})
+        with patch("scraper.scraper.WebDriverWait"):
+            results = Scraper().scrape_dynamic_many(self.URLS, driver, tabs=3)
+        assert results[1] == (None, [])
+        assert results[0][0]["title"] == self.URLS[0]
+        assert results[4][0]["title"] == self.URLS[4]
+        assert driver.window_handles == ["main"]
+        assert driver.current_window_handle == "main"
+
+    def test_every_tab_blocks_resources_before_loading(self):
+        policy = ResourcePolicy(resource_types=("font",), block_trackers=True)
+        driver = _TabbedDriver(resource_policy=policy)
+        with patch("scraper.scraper.WebDriverWait"):
+            Scraper().scrape_dynamic_many(self.URLS, driver, tabs=3)
+        assert len(driver.blocked) == len(self.URLS)
+        assert all(urls == policy.blocked_urls() for urls in driver.blocked.values())
+
+    def test_tab_waits_for_load_event(self):
+        driver = _TabbedDriver()
+        with patch("scraper.scraper.WebDriverWait") as wait:
+            Scraper().scrape_dynamic_many(self.URLS[:2], driver, tabs=2)
+        conditions = [c.args[0] for c in wait.return_value.until.call_args_list]
+        assert conditions.count(_document_complete) == 2
+
+    def test_single_tab_uses_main_window(self):
+        driver = _render_driver()
+        with patch("scraper.scraper.WebDriverWait"):
+            results = Scraper().scrape_dynamic_many(self.URLS[:2], driver, tabs=1)
+        assert driver.get.call_count == 2
+        assert all(content["title"] == "Shop" for content, _ in results)
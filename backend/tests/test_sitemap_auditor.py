@@ -4,7 +4,8 @@ Unit tests covering:
 - Sitemap index recursion (and cycle guard)
 - URL normalisation edge cases
 - Orphan / missing detection logic
-- Canonical + noindex SEO checks (via mocked HTTP)
+- Canonical + noindex SEO checks (via mocked HTTP), including tags emitted in <body>
+- HEAD-first status probing with ranged-GET fallback
 """
 
 from __future__ import annotations
@@ -333,3 +334,112 @@ class TestHygieneChecks:
         auditor = SitemapAuditor(AuditConfig(root_url="https://example.com"))
         hygiene = auditor._check_hygiene(entries)
         assert hygiene.missing_lastmod == 2
+
+
+# ── HEAD-first probing ────────────────────────────────────────────────────────
+
+def _fake_response(url, status=200, body=b"", headers=None, history=()):
+    resp = MagicMock()
+    resp.url = url
+    resp.status_code = status
+    resp.headers = {"Content-Type": "text/html; charset=utf-8", **(headers or {})}
+    resp.history = list(history)
+    resp.encoding = "utf-8"
+    resp.content = body
+    resp.text = body.decode("utf-8")
+    resp.iter_content = lambda chunk_size=1: (
+        body[i:i + chunk_size] for i in range(0, len(body), chunk_size)
+    )
+    return resp
+
+
+HEAD_WITH_META = (
+    b"<html><head><title>x</title>"
+    b'<meta name="robots" content="noindex">'
+    b'<link rel="canonical" href="https://example.com/canonical">'
+    b"</head><body>" + b"<p>filler</p>" * 5000 + b"</body></html>"
+)
+
+
+class TestHeadProbing:
+    def _auditor(self, session, **cfg):
+        auditor = SitemapAuditor(AuditConfig(root_url="https://example.com", delay=0, **cfg))
+        auditor._session = session
+        return auditor
+
+    def test_non_200_answered_by_head_alone(self):
+        session = MagicMock()
+        redirect = _fake_response("https://example.com/new", status=301)
+        session.head.return_value = _fake_response(
+            "https://example.com/new", status=200, history=[redirect],
+            headers={"Content-Type": "application/pdf"},
+        )
+        info = self._auditor(session)._fetch_page_info("https://example.com/old")
+        assert info.is_redirect is True
+        assert info.final_url == "https://example.com/new"
+        session.get.assert_not_called()
+
+    def test_html_page_reads_head_from_ranged_prefix(self):
+        session = MagicMock()
+        session.head.return_value = _fake_response("https://example.com/p")
+        session.get.return_value = _fake_response(
+            "https://example.com/p", status=206, body=HEAD_WITH_META[:16384],
+            headers={"Content-Range": f"bytes 0-16383/{len(HEAD_WITH_META)}"},
+        )
+        info = self._auditor(session)._fetch_page_info("https://example.com/p")
+        assert info.status_code == 200
+        assert info.noindex is True
+        assert info.canonical == "https://example.com/canonical"
+        assert session.get.call_count == 1
+        assert session.get.call_args.kwargs["headers"]["Range"] == "bytes=0-16383"
+
+    def test_head_rejected_falls_back_to_get(self):
+        session = MagicMock()
+        session.head.return_value = _fake_response("https://example.com/p", status=405)
+        session.get.return_value = _fake_response("https://example.com/p", body=HEAD_WITH_META)
+        info = self._auditor(session)._fetch_page_info("https://example.com/p")
+        assert info.status_code == 200
+        assert info.noindex is True
+
+    def test_head_404_confirmed_with_get(self):
+        session = MagicMock()
+        session.head.return_value = _fake_response("https://example.com/gone", status=404)
+        session.get.return_value = _fake_response("https://example.com/gone", status=404)
+        info = self._auditor(session)._fetch_page_info("https://example.com/gone")
+        assert info.status_code == 404
+        assert session.get.call_count == 1
+
+    def test_escalates_to_full_get_when_head_section_truncated(self):
+        long_head = b"<html><head>" + b"<meta name=x>" * 4000 + b"</head><body></body></html>"
+        session = MagicMock()
+        session.head.return_value = _fake_response("https://example.com/p")
+        session.get.side_effect = [
+            _fake_response(
+                "https://example.com/p", status=206, body=long_head[:16384],
+                headers={"Content-Range": f"bytes 0-16383/{len(long_head)}"},
+            ),
+            _fake_response("https://example.com/p", body=long_head),
+        ]
+        info = self._auditor(session)._fetch_page_info("https://example.com/p")
+        assert info.status_code == 200
+        assert session.get.call_count == 2
+
+    def test_full_get_finds_signals_emitted_in_body(self):
+        body_meta = (
+            b"<html><head><title>x</title></head><body><p>text</p>"
+            b'<meta name="robots" content="noindex">'
+            b'<link rel="canonical" href="https://example.com/canonical">'
+            b"</body></html>"
+        )
+        session = MagicMock()
+        session.get.return_value = _fake_response("https://example.com/p", body=body_meta)
+        info = self._auditor(session, head_probe=False)._fetch_page_info("https://example.com/p")
+        assert info.noindex is True
+        assert info.canonical == "https://example.com/canonical"
+
+    def test_probe_disabled_uses_full_get(self):
+        session = MagicMock()
+        session.get.return_value = _fake_response("https://example.com/p", body=HEAD_WITH_META)
+        info = self._auditor(session, head_probe=False)._fetch_page_info("https://example.com/p")
+        assert info.canonical == "https://example.com/canonical"
+        session.head.assert_not_called()
@@ -0,0 +1,127 @@
+"""
+Unit tests covering:
+- Streaming extraction matches parse_html on ordinary pages, whatever the chunking
+- Output caps: page text, links, images, headings/paragraphs
+- Early stop for head-only profiles; multi-byte characters split across chunks
+- Scraper switching to streaming above STREAM_THRESHOLD_BYTES
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from dataclasses import asdict
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.config import Config
+from scraper.parser import TEXT_CONTENT_LIMIT, parse_html
+from scraper.scraper import Scraper
+from scraper.stream_parser import StreamingExtractor, stream_extract
+from tests.test_parser import PAGE
+from tests.test_parser_backends import BASE, CORPUS
+
+
+def _chunks(html: str, size: int):
+    data = html.encode("utf-8")
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def _listing(items: int) -> str:
+    cards = "".join(
+        f'<div><h3>Item {i}</h3><a href="/p/{i}"><img src="/i/{i}.jpg"></a><p>About item {i}</p></div>'
+        for i in range(items)
+    )
+    return f"<html><head><title>Big</title></head><body>{cards}</body></html>"
+
+
+class TestConformance:
+    @pytest.mark.parametrize("chunk_size", [7, 4096])
+    @pytest.mark.parametrize("page", sorted(CORPUS) + ["profiles_page"])
+    def test_matches_parse_html(self, page, chunk_size):
+        html = PAGE if page == "profiles_page" else CORPUS[page]
+        expected = asdict(parse_html(html, BASE))
+        assert asdict(stream_extract(_chunks(html, chunk_size), BASE)) == expected
+
+    @pytest.mark.parametrize("profile", ["crawl", "links_only", "seo_head"])
+    def test_profiles_match_parse_html(self, profile):
+        expected = asdict(parse_html(PAGE, BASE, profile=profile))
+        assert asdict(stream_extract(_chunks(PAGE, 11), BASE, profile=profile)) == expected
+
+    def test_multibyte_characters_split_across_chunks(self):
+        html = "<p>Café — naïve façade</p>"
+        assert stream_extract(_chunks(html, 1), BASE).paragraphs == ["Café — naïve façade"]
+
+
+class TestCaps:
+    def test_text_stops_at_limit(self):
+        content = stream_extract(_chunks(_listing(5000), 65536), BASE)
+        assert len(content.text_content) == TEXT_CONTENT_LIMIT
+
+    def test_links_and_images_capped(self):
+        extractor = StreamingExtractor(BASE, max_links=10, max_images=3)
+        extractor.feed(_listing(100))
+        content = extractor.result()
+        assert len(content.links) == 10
+        assert len(content.images) == 3
+
+    def test_headings_and_paragraphs_capped(self):
+        extractor = StreamingExtractor(BASE, max_items=5)
+        extractor.feed(_listing(100))
+        content = extractor.result()
+        assert sum(len(v) for v in content.headings.values()) + len(content.paragraphs) == 5
+
+    def test_unclosed_paragraph_text_capped(self):
+        extractor = StreamingExtractor(BASE)
+        for _ in range(1000):
+            extractor.feed("<b>word</b> " * 100)
+        extractor.feed("<p>" + "x" * (TEXT_CONTENT_LIMIT * 3))
+        content = extractor.result()
+        assert content.paragraphs == ["x" * TEXT_CONTENT_LIMIT]
+
+
+class TestEarlyStop:
+    def test_seo_head_stops_reading_at_head_end(self):
+        read = []
+
+        def source():
+            for chunk in _chunks(_listing(2000), 256):
+                read.append(chunk)
+                yield chunk
+
+        content = stream_extract(source(), BASE, profile="seo_head")
+        assert content.title == "Big"
+        assert len(read) <= 2
+
+
+class TestScraperStreaming:
+    def _response(self, html: str):
+        resp = MagicMock()
+        resp.status_code = 200
+        resp.encoding = "utf-8"
+        resp.headers = {}
+        resp.iter_content = lambda chunk_size=1: iter(_chunks(html, 1024))
+        return resp
+
+    def test_large_body_streamed(self, monkeypatch):
+        monkeypatch.setattr(Config, "STREAM_THRESHOLD_BYTES", 4096)
+        html = _listing(500)
+        session = MagicMock()
+        session.get.return_value = self._response(html)
+        with patch("scraper.scraper.time.sleep"), patch("scraper.scraper.parse_html") as full_parse:
+            content, links = Scraper(session=session).scrape_url(BASE)
+        full_parse.assert_not_called()
+        assert content["title"] == "Big"
+        assert len(links) == 500
+
+    def test_small_body_parsed_normally(self, monkeypatch):
+        monkeypatch.setattr(Config, "STREAM_THRESHOLD_BYTES", 1_000_000)
+        session = MagicMock()
+        session.get.return_value = self._response(_listing(5))
+        with patch("scraper.scraper.time.sleep"), patch("scraper.scraper.stream_extract") as streamed:
+            content, _ = Scraper(session=session).scrape_url(BASE)
+        streamed.assert_not_called()
+        assert content["title"] == "Big"
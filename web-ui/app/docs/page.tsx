@@ -136,7 +136,7 @@ export default function DocsPage() {
                                 <code className="font-mono text-sm">/download</code>
                             </div>
                             <p className="text-sm text-muted-foreground">Downloads scraped data as JSON file</p>
-                            <p className="text-xs text-muted-foreground">Returns: <code>application/json</code> file</p>
+                            <p className="text-xs text-muted-foreground">Returns: <code>application/json</code> file, streamed as it is built. <code>?format=ndjson</code> gives one record per line; <code>?gzip=true</code> compresses it.</p>
                         </div>
 
                         {/* WebSocket /logs */}
@@ -145,11 +145,12 @@ export default function DocsPage() {
                                 <span className="px-2 py-1 text-xs font-bold bg-purple-500/20 text-purple-400 rounded">WS</span>
                                 <code className="font-mono text-sm">/logs</code>
                             </div>
-                            <p className="text-sm text-muted-foreground">Real-time log streaming via WebSocket</p>
+                            <p className="text-sm text-muted-foreground">Real-time log streaming via WebSocket. Each message holds one or more JSON log lines separated by newlines.</p>
                             <div className="bg-zinc-900 rounded p-3 font-mono text-xs overflow-x-auto">
                                 <p className="text-zinc-500">{`// Connect`}</p>
                                 <pre className="text-zinc-300">{`const ws = new WebSocket("wss://your-api.com/logs")
-ws.onmessage = (event) => console.log(event.data)`}</pre>
+ws.onmessage = (event) =>
+  event.data.split("\\n").forEach((line) => console.log(JSON.parse(line)))`}</pre>
                             </div>
                         </div>
                     </CardContent>
@@ -327,7 +327,11 @@ export default function AuditPanel() {
                     message: "Connected to audit log stream",
                 })])
             }
-            ws.onmessage = (e) => setLogs(prev => [...prev, e.data])
+            ws.onmessage = (e) => {
+                // A frame carries one or more newline-separated JSON log lines
+                const lines = String(e.data).split("\n").filter(Boolean)
+                setLogs(prev => [...prev, ...lines])
+            }
             ws.onerror = () => setWsConnected(false)
             ws.onclose = () => {
                 setWsConnected(false)
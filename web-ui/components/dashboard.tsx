@@ -422,7 +422,9 @@ export default function Dashboard() {
         }
 
         ws.onmessage = (event) => {
-            setLogs((prev) => [...prev, event.data])
+            // A frame carries one or more newline-separated JSON log lines
+            const lines = String(event.data).split("\n").filter(Boolean)
+            setLogs((prev) => [...prev, ...lines])
         }
 
         ws.onclose = () => {